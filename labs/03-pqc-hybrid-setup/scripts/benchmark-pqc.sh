@@ -1,6 +1,12 @@
 #!/bin/bash
 # Quick Performance Benchmark Script
 # สคริปต์ทดสอบประสิทธิภาพอย่างรวดเร็ว
+#
+# Each sample forks openssl s_client and is timed in whole milliseconds.
+# For precise, concurrent measurements (TCP connect and TLS handshake
+# timed separately) use scripts/benchmark-handshake.py, e.g.:
+#   python3 ../../scripts/benchmark-handshake.py localhost -k -n 1000 -c 50 \
+#       --groups X25519,X25519MLKEM768 --output results/handshake.jsonl
 
 set -e
 
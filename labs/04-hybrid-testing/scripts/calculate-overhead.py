@@ -7,6 +7,7 @@ Compares baseline vs treatment to calculate overhead
 
 import json
 import argparse
+import struct
 import sys
 from typing import Dict, Any
 
@@ -57,10 +58,30 @@ def calculate_overhead(baseline: float, treatment: float) -> Dict[str, float]:
     }
 
 
+COLUMNAR_MAGIC = b"PQCCOL01"
+
+
 def load_summary_file(filepath: str) -> Dict[str, Any]:
     """
-    Load aggregated summary JSON (output from aggregate-data.py)
+    Load aggregated summary (output from aggregate-data.py)
+    
+    Columnar files (--format columnar) are read from their index header
+    only; the per-series statistics live there, so the value arrays are
+    never loaded.
     """
+    with open(filepath, 'rb') as f:
+        if f.read(len(COLUMNAR_MAGIC)) == COLUMNAR_MAGIC:
+            (header_length,) = struct.unpack('<Q', f.read(8))
+            header = json.loads(f.read(header_length).decode('utf-8'))
+            
+            summary = {"metadata": header.get("metadata", {}), "metrics": {}}
+            for entry in header["series"]:
+                metric_data = summary["metrics"].setdefault(entry["test_name"], {}).setdefault(
+                    entry["metric"], {"baseline": [], "hybrid": []})
+                metric_data[entry["side"]] = {k: v for k, v in entry.items()
+                                              if k not in ("test_name", "metric", "side", "offset")}
+            return summary
+    
     with open(filepath, 'r') as f:
         return json.load(f)
 
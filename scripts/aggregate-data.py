@@ -1,91 +1,265 @@
 #!/usr/bin/env python3
 """
 Aggregate Performance Data from Multiple Tests
-Combines JSON files from baseline and hybrid tests
+Combines JSON / JSON Lines files from baseline and hybrid tests
 รวบรวมข้อมูล performance จากการทดสอบหลายครั้ง
 """
 
+import gzip
 import json
+import lzma
+import math
 import os
+import struct
+from array import array
 import glob
 import argparse
-from typing import Dict, List, Any
+import fnmatch
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Any, Optional, Tuple, Union
 from datetime import datetime
 import sys
 
-def load_json_files(pattern: str) -> List[Dict]:
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Result files picked up from each results directory: one JSON object per
+# .json file, or one object per line in (optionally compressed) JSON Lines
+RESULT_PATTERNS = ["*.json", "*.jsonl", "*.jsonl.gz", "*.jsonl.xz"]
+
+
+def result_patterns(directory: str) -> List[str]:
+    """Glob patterns for all result files in a directory"""
+    return [os.path.join(directory, pattern) for pattern in RESULT_PATTERNS]
+
+
+def _glob_files(pattern: Union[str, List[str]]) -> List[str]:
+    """Sorted, de-duplicated paths matching one or more glob patterns"""
+    patterns = [pattern] if isinstance(pattern, str) else pattern
+    return sorted({path for p in patterns for path in glob.glob(p)})
+
+
+def _describe_pattern(pattern: Union[str, List[str]]) -> str:
+    return pattern if isinstance(pattern, str) else ", ".join(pattern)
+
+
+def _load_json_file(filepath: str) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    Load a single result file
+    
+    Returns:
+        (object, None) on success, (None, error message) on failure
+    """
+    try:
+        with open(filepath, 'r') as f:
+            obj = json.load(f)
+            obj['_source_file'] = os.path.basename(filepath)
+            return obj, None
+    except Exception as e:
+        return None, str(e)
+
+
+def _open_text(filepath: str):
+    """Open a result file for reading text, decompressing .gz/.xz transparently"""
+    if filepath.endswith('.gz'):
+        return gzip.open(filepath, 'rt', encoding='utf-8')
+    if filepath.endswith('.xz'):
+        return lzma.open(filepath, 'rt', encoding='utf-8')
+    return open(filepath, 'r', encoding='utf-8')
+
+
+def iter_result_records(filepath: str) -> Iterator[Tuple[Optional[Dict], Optional[Tuple[str, str]]]]:
+    """
+    Yield the records of one result file
+    
+    .json files hold a single object. JSON Lines files (.jsonl, .jsonl.gz,
+    .jsonl.xz) hold one object per line and are read lazily line by line,
+    so a file can carry millions of samples without being loaded whole.
+    
+    Yields:
+        (record, None) for each record, or (None, (location, error message))
+        for each record or file that cannot be read; location is the path,
+        with ":<line>" for JSON Lines records
+    """
+    if filepath.endswith('.json'):
+        obj, error = _load_json_file(filepath)
+        yield (obj, None) if error is None else (None, (filepath, error))
+        return
+    
+    source = os.path.basename(filepath)
+    try:
+        with _open_text(filepath) as f:
+            for lineno, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    obj = json.loads(line)
+                    obj['_source_file'] = source
+                except Exception as e:
+                    yield None, (f"{filepath}:{lineno}", str(e))
+                    continue
+                yield obj, None
+    except Exception as e:
+        # I/O or decompression failure: keep the records read so far
+        yield None, (filepath, str(e))
+
+
+def _load_result_file(filepath: str) -> Tuple[List[Dict], List[Tuple[str, str]]]:
+    """Load all records of one result file, collecting errors"""
+    records, errors = [], []
+    for obj, error in iter_result_records(filepath):
+        if error is not None:
+            errors.append(error)
+        else:
+            records.append(obj)
+    return records, errors
+
+
+def _load_json_chunk(paths: List[str]) -> List[Tuple[List[Dict], List[Tuple[str, str]]]]:
+    """Worker entry point: load a chunk of files in order"""
+    return [_load_result_file(path) for path in paths]
+
+
+def _chunked(items: List[Any], size: int) -> List[List[Any]]:
+    """Split a list into consecutive chunks of at most `size` items"""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _chunk_size(n_items: int, workers: int) -> int:
     """
-    Load all JSON files matching glob pattern
+    Pick a chunk size giving each worker several chunks (for load balancing)
+    while keeping per-task overhead small
+    """
+    return max(1, min(512, -(-n_items // (workers * 4))))
+
+
+def load_json_files(pattern: Union[str, List[str]], workers: int = 1) -> List[Dict]:
+    """
+    Load all result files matching glob pattern(s)
+    
+    Files are always read in sorted path order, so the result is identical
+    whether parsing runs serially or in a process pool.
     
     Args:
-        pattern: Glob pattern (e.g., "results/*.json")
+        pattern: Glob pattern (e.g., "results/*.json") or list of patterns;
+            .jsonl/.jsonl.gz/.jsonl.xz files contribute one record per line
+        workers: Number of worker processes (1 = parse in this process)
     
     Returns:
         List of loaded JSON objects
     """
-    files = glob.glob(pattern)
+    files = _glob_files(pattern)
     
     if not files:
-        print(f"WARNING: No files found matching pattern: {pattern}", file=sys.stderr)
+        print(f"WARNING: No files found matching pattern: {_describe_pattern(pattern)}", file=sys.stderr)
         return []
     
+    if workers > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = _chunked(files, _chunk_size(len(files), workers))
+            results = [r for chunk in executor.map(_load_json_chunk, chunks) for r in chunk]
+    else:
+        results = (_load_result_file(filepath) for filepath in files)
+    
     data = []
-    for filepath in files:
-        try:
-            with open(filepath, 'r') as f:
-                obj = json.load(f)
-                obj['_source_file'] = os.path.basename(filepath)
-                data.append(obj)
-        except Exception as e:
-            print(f"ERROR loading {filepath}: {e}", file=sys.stderr)
+    for records, errors in results:
+        for location, error in errors:
+            print(f"ERROR loading {location}: {error}", file=sys.stderr)
+        data.extend(records)
     
-    print(f"✓ Loaded {len(data)} files from pattern: {pattern}", file=sys.stderr)
+    print(f"✓ Loaded {len(data)} records from {len(files)} files matching: "
+          f"{_describe_pattern(pattern)}", file=sys.stderr)
     return data
 
 
-def aggregate_by_metric(data: List[Dict], metric_key: str) -> Dict[str, List[float]]:
+def _group_value(value: Any) -> Any:
+    """Hashable form of a group-by field: lists/objects become their canonical JSON"""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, sort_keys=True)
+    return value
+
+
+def group_series(data: List[Dict], metrics: List[str], group_by: List[str],
+                 numeric_only: bool = False) -> Dict[Tuple, Dict[str, List]]:
     """
-    Group data by test name and extract specific metric
+    Extract several metrics grouped by a composite key in a single pass
     
     Args:
         data: List of test results
-        metric_key: Key to extract (e.g., "handshake_time_ms")
+        metrics: Metric keys to extract (e.g., ["handshake_time_ms", "cpu_percent"])
+        group_by: Record fields forming the group key (e.g., ["test_name",
+            "concurrency"]); a missing field counts as 'unknown', and list or
+            object values are keyed by their JSON text
+        numeric_only: Keep only int/float values, converted to float
     
     Returns:
-        Dictionary mapping test name to list of values
+        {(group values...): {metric: [values]}} in order of first appearance;
+        a group only lists metrics that occurred in it
     """
-    aggregated = {}
+    index: Dict[Tuple, Dict[str, List]] = {}
     
     for entry in data:
-        test_name = entry.get('test_name', 'unknown')
+        present = [metric for metric in metrics if metric in entry]
+        if not present:
+            continue
         
-        if metric_key in entry:
-            if test_name not in aggregated:
-                aggregated[test_name] = []
+        key = tuple(_group_value(entry.get(field, 'unknown')) for field in group_by)
+        series = index.get(key)
+        if series is None:
+            series = index[key] = {}
+        
+        for metric in present:
+            values = series.get(metric)
+            if values is None:
+                values = series[metric] = []
             
-            value = entry[metric_key]
-            if isinstance(value, (int, float)):
-                aggregated[test_name].append(float(value))
+            value = entry[metric]
+            if not numeric_only:
+                values.append(value)
+            elif isinstance(value, (int, float)):
+                values.append(float(value))
     
-    return aggregated
+    return index
 
 
-def merge_baseline_and_hybrid(baseline_dir: str, hybrid_dir: str) -> Dict[str, Any]:
+def aggregate_by_metric(data: List[Dict], metric_key: str) -> Dict[str, List[float]]:
+    """
+    Group data by test name and extract specific metric
+    
+    Args:
+        data: List of test results
+        metric_key: Key to extract (e.g., "handshake_time_ms")
+    
+    Returns:
+        Dictionary mapping test name to list of values
+    """
+    grouped = group_series(data, [metric_key], ['test_name'], numeric_only=True)
+    return {test_name: series[metric_key] for (test_name,), series in grouped.items()}
+
+
+def merge_baseline_and_hybrid(baseline_dir: str, hybrid_dir: str,
+                              workers: int = 1) -> Dict[str, Any]:
     """
     Merge baseline and hybrid test results
     
     Args:
         baseline_dir: Directory with baseline (classical TLS) results
         hybrid_dir: Directory with hybrid (PQC) results
+        workers: Number of worker processes used to parse files
     
     Returns:
         Merged data structure with both datasets
     """
-    baseline_files = os.path.join(baseline_dir, "*.json")
-    hybrid_files = os.path.join(hybrid_dir, "*.json")
+    baseline_files = result_patterns(baseline_dir)
+    hybrid_files = result_patterns(hybrid_dir)
     
-    baseline_data = load_json_files(baseline_files)
-    hybrid_data = load_json_files(hybrid_files)
+    baseline_data = load_json_files(baseline_files, workers=workers)
+    hybrid_data = load_json_files(hybrid_files, workers=workers)
     
     return {
         "metadata": {
@@ -114,31 +288,159 @@ def extract_metrics(data: Dict[str, Any], metrics: List[str]) -> Dict[str, Dict[
         "hybrid": {},
     }
     
-    for metric in metrics:
-        # Baseline
-        baseline_values = []
-        for entry in data.get("baseline", []):
-            if metric in entry:
-                baseline_values.append(entry[metric])
-        
-        if baseline_values:
-            result["baseline"][metric] = baseline_values
-        
-        # Hybrid
-        hybrid_values = []
-        for entry in data.get("hybrid", []):
-            if metric in entry:
-                hybrid_values.append(entry[metric])
-        
-        if hybrid_values:
-            result["hybrid"][metric] = hybrid_values
+    # One scan per dataset for all metrics
+    for test_type in ["baseline", "hybrid"]:
+        series = group_series(data.get(test_type, []), metrics, []).get((), {})
+        for metric in metrics:
+            if series.get(metric):
+                result[test_type][metric] = series[metric]
     
     return result
 
 
-def create_summary(data: Dict[str, Any]) -> Dict[str, Any]:
+def extract_grouped_metrics(data: Dict[str, Any], metrics: List[str],
+                            group_by: List[str]) -> Dict[str, Any]:
+    """
+    Extract multiple metrics split by arbitrary grouping keys
+    
+    Args:
+        data: Merged baseline + hybrid data
+        metrics: List of metric keys to extract
+        group_by: Record fields to group by (e.g., ["test_name", "concurrency", "group"])
+    
+    Returns:
+        {"group_by": [...], "metrics": [...], "series": [{"side": ..., "group":
+        {field: value}, "metrics": {metric: [values]}}, ...]}
+    """
+    result = {
+        "metadata": data.get("metadata", {}),
+        "group_by": group_by,
+        "metrics": metrics,
+        "series": [],
+    }
+    
+    for test_type in ["baseline", "hybrid"]:
+        grouped = group_series(data.get(test_type, []), metrics, group_by, numeric_only=True)
+        for key, series in grouped.items():
+            result["series"].append({
+                "side": test_type,
+                "group": dict(zip(group_by, key)),
+                "metrics": series,
+            })
+    
+    return result
+
+
+def create_summary(data: Dict[str, Any], sketch_accuracy: Optional[float] = None) -> Dict[str, Any]:
     """
     Create summary statistics for aggregated data
+    
+    Records are columnised in a single pass into an integer group code
+    (test_name, metric, side) and a value per sample; the statistics for
+    all groups are then computed with sorted grouped reductions in NumPy.
+    
+    Args:
+        data: Merged baseline + hybrid data
+        sketch_accuracy: If set, store a QuantileSketch with this relative
+            accuracy per series instead of the full raw_values list
+    """
+    if not NUMPY_AVAILABLE:
+        return _create_summary_python(data, sketch_accuracy)
+    
+    summary = {
+        "metadata": data.get("metadata", {}),
+        "metrics": {}
+    }
+    
+    group_codes: Dict[Tuple[str, str, str], int] = {}
+    codes = array('q')
+    values = []
+    
+    for test_type in ["baseline", "hybrid"]:
+        if test_type not in data:
+            continue
+        
+        for test in data[test_type]:
+            test_name = test.get("test_name", "unknown")
+            
+            if test_name not in summary["metrics"]:
+                summary["metrics"][test_name] = {}
+            test_metrics = summary["metrics"][test_name]
+            
+            # Extract numeric metrics
+            for key, value in test.items():
+                if isinstance(value, (int, float)) and not key.startswith("_"):
+                    if key not in test_metrics:
+                        test_metrics[key] = {
+                            "baseline": [],
+                            "hybrid": []
+                        }
+                    
+                    group = (test_name, key, test_type)
+                    code = group_codes.get(group)
+                    if code is None:
+                        code = group_codes[group] = len(group_codes)
+                    codes.append(code)
+                    values.append(value)
+    
+    if not values:
+        return summary
+    
+    code_arr = np.frombuffer(codes, dtype=np.int64)
+    value_arr = np.array(values, dtype=np.float64)
+    
+    # Stable sort by group keeps each group's raw values in input order;
+    # sorting by (group, value) gives the order statistics
+    by_group = np.argsort(code_arr, kind='stable')
+    by_value = np.lexsort((value_arr, code_arr))
+    
+    sorted_codes = code_arr[by_group]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    counts = np.diff(np.r_[starts, len(sorted_codes)])
+    group_ids = sorted_codes[starts]
+    
+    grouped = value_arr[by_group]
+    means = np.add.reduceat(grouped, starts) / counts
+    deviations = grouped - np.repeat(means, counts)
+    m2 = np.add.reduceat(deviations * deviations, starts)
+    stdevs = np.sqrt(m2 / np.maximum(counts - 1, 1))
+    
+    ends = starts + counts - 1
+    lower_mid = by_value[starts + (counts - 1) // 2]
+    upper_mid = by_value[starts + counts // 2]
+    min_idx = by_value[starts]
+    max_idx = by_value[ends]
+    
+    groups = {code: group for group, code in group_codes.items()}
+    raw_order = by_group.tolist()
+    
+    for i, code in enumerate(group_ids.tolist()):
+        test_name, metric, test_type = groups[code]
+        count = int(counts[i])
+        start = int(starts[i])
+        lower, upper = int(lower_mid[i]), int(upper_mid[i])
+        
+        stats = {
+            "count": count,
+            "mean": float(means[i]),
+            "median": values[lower] if lower == upper else (values[lower] + values[upper]) / 2,
+            "min": values[int(min_idx[i])],
+            "max": values[int(max_idx[i])],
+            "stdev": float(stdevs[i]) if count > 1 else 0,
+        }
+        if sketch_accuracy:
+            stats["sketch"] = QuantileSketch.from_values(
+                grouped[start:start + count], sketch_accuracy).to_dict()
+        else:
+            stats["raw_values"] = [values[j] for j in raw_order[start:start + count]]
+        summary["metrics"][test_name][metric][test_type] = stats
+    
+    return summary
+
+
+def _create_summary_python(data: Dict[str, Any], sketch_accuracy: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Pure-Python create_summary() (used when NumPy is not installed)
     """
     import statistics
     
@@ -184,13 +486,1018 @@ def create_summary(data: Dict[str, Any]) -> Dict[str, Any]:
                         "stdev": statistics.stdev(values) if len(values) > 1 else 0,
                         "raw_values": values
                     }
+                    if sketch_accuracy:
+                        stats = summary["metrics"][test_name][metric][test_type]
+                        stats["sketch"] = QuantileSketch.from_values(
+                            stats.pop("raw_values"), sketch_accuracy).to_dict()
+    
+    return summary
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with logarithmically spaced buckets
+    
+    A positive value v is counted in bucket ceil(log_gamma(v)) with
+    gamma = (1 + a) / (1 - a). Negative values use a mirrored set of buckets
+    and exact zeros are counted separately.
+    
+    Accuracy: quantile(q) returns a value x' with |x' - x| <= a * |x|, where
+    x is the q-quantile linearly interpolated between the samples of rank
+    floor(q * (n - 1)) and ceil(q * (n - 1)) (as statistics.median and
+    numpy.percentile) -- i.e. the error is relative to the value, not to
+    the rank (a = 0.01 gives 1% of the true latency at every percentile,
+    including p99.9). Merging is exact: sketching two
+    datasets and merging gives the same sketch as sketching their union.
+    
+    Memory depends on the dynamic range of the data, not on the number of
+    samples: about ln(max/min) / (2a) buckets (~700 for 1 us .. 1 s at
+    a = 1%).
+    """
+    
+    def __init__(self, relative_accuracy: float = 0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+    
+    def _index(self, magnitude: float) -> int:
+        return math.ceil(math.log(magnitude) / self._log_gamma)
+    
+    def _value(self, index: int) -> float:
+        # Point of bucket (gamma^(i-1), gamma^i] with equal relative error to both ends
+        return 2 * self.gamma ** index / (self.gamma + 1)
+    
+    def add(self, value: float, count: int = 1):
+        """Record `count` occurrences of value"""
+        if value > 0:
+            index = self._index(value)
+            self.positive[index] = self.positive.get(index, 0) + count
+        elif value < 0:
+            index = self._index(-value)
+            self.negative[index] = self.negative.get(index, 0) + count
+        else:
+            self.zero_count += count
+        self.count += count
+    
+    @classmethod
+    def from_values(cls, values, relative_accuracy: float = 0.01) -> 'QuantileSketch':
+        """Build a sketch from a sequence of values (vectorised when NumPy is available)"""
+        sketch = cls(relative_accuracy)
+        if not NUMPY_AVAILABLE:
+            for value in values:
+                sketch.add(value)
+            return sketch
+        
+        values = np.asarray(values, dtype=np.float64)
+        for side, magnitudes in [(sketch.positive, values[values > 0]),
+                                 (sketch.negative, -values[values < 0])]:
+            indexes = np.ceil(np.log(magnitudes) / sketch._log_gamma).astype(np.int64)
+            unique, counts = np.unique(indexes, return_counts=True)
+            side.update(zip(unique.tolist(), counts.tolist()))
+        sketch.zero_count = int(np.count_nonzero(values == 0))
+        sketch.count = len(values)
+        return sketch
+    
+    def merge(self, other: 'QuantileSketch'):
+        """Fold another sketch (with the same accuracy) into this one"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for index, count in other.positive.items():
+            self.positive[index] = self.positive.get(index, 0) + count
+        for index, count in other.negative.items():
+            self.negative[index] = self.negative.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+    
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the q-quantile (0 <= q <= 1), interpolating between ranks
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1")
+        if self.count == 0:
+            raise ValueError("Empty sketch")
+        
+        rank = q * (self.count - 1)
+        lower = self._value_at_rank(math.floor(rank))
+        upper = self._value_at_rank(math.ceil(rank))
+        return lower + (upper - lower) * (rank - math.floor(rank))
+    
+    def _value_at_rank(self, rank: int) -> float:
+        """Estimate of the sample of (0-based) rank"""
+        seen = 0
+        for index in sorted(self.negative, reverse=True):
+            seen += self.negative[index]
+            if seen > rank:
+                return -self._value(index)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self.positive):
+            seen += self.positive[index]
+            if seen > rank:
+                return self._value(index)
+        return self._value(max(self.positive))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to a JSON-compatible dict"""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "count": self.count,
+            "zero_count": self.zero_count,
+            "positive": {str(k): v for k, v in sorted(self.positive.items())},
+            "negative": {str(k): v for k, v in sorted(self.negative.items())},
+        }
+    
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> 'QuantileSketch':
+        sketch = cls(d["relative_accuracy"])
+        sketch.positive = {int(k): v for k, v in d.get("positive", {}).items()}
+        sketch.negative = {int(k): v for k, v in d.get("negative", {}).items()}
+        sketch.zero_count = d.get("zero_count", 0)
+        sketch.count = d["count"]
+        return sketch
+
+
+class RunningStats:
+    """
+    Running statistics for one series: count, mean/variance (Welford),
+    min/max and a quantile sketch for the median
+    """
+    
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.sketch = QuantileSketch(relative_accuracy)
+    
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.sketch.add(value)
+    
+    def merge(self, other: 'RunningStats'):
+        """Combine with another accumulator (Chan et al. parallel variance)"""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            self.sketch.merge(other.sketch)
+            return
+        
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the accumulator state to a JSON-compatible dict"""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "min": self.min,
+            "max": self.max,
+            "sketch": self.sketch.to_dict(),
+        }
+    
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> 'RunningStats':
+        stats = cls()
+        stats.count, stats.mean, stats.m2 = d["count"], d["mean"], d["m2"]
+        stats.min, stats.max = d["min"], d["max"]
+        stats.sketch = QuantileSketch.from_dict(d["sketch"])
+        return stats
+    
+    def stdev(self) -> float:
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0
+    
+    def to_summary(self) -> Dict[str, Any]:
+        """Statistics in the create_summary() schema, with the sketch in place of raw_values"""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "median": min(max(self.sketch.quantile(0.5), self.min), self.max),
+            "min": self.min,
+            "max": self.max,
+            "stdev": self.stdev(),
+            "sketch": self.sketch.to_dict(),
+        }
+
+
+class StreamingSummary:
+    """
+    Per-(test_name, metric, side) running accumulators
+    
+    Records are folded in one at a time and discarded, so memory is
+    proportional to the number of series rather than the number of samples.
+    Two summaries built from disjoint sets of files can be merged.
+    """
+    
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.series: Dict[str, Dict[str, Dict[str, RunningStats]]] = {}
+        self.counts = {"baseline": 0, "hybrid": 0}
+    
+    def _get(self, test_name: str, metric: str, test_type: str) -> RunningStats:
+        metrics = self.series.setdefault(test_name, {})
+        sides = metrics.setdefault(metric, {})
+        if test_type not in sides:
+            sides[test_type] = RunningStats(self.relative_accuracy)
+        return sides[test_type]
+    
+    def add_record(self, test_type: str, test: Dict[str, Any]):
+        """Fold one test result (same field rules as create_summary)"""
+        test_name = test.get("test_name", "unknown")
+        self.series.setdefault(test_name, {})
+        
+        for key, value in test.items():
+            if isinstance(value, (int, float)) and not key.startswith("_"):
+                self._get(test_name, key, test_type).add(value)
+        
+        self.counts[test_type] += 1
+    
+    def merge(self, other: 'StreamingSummary'):
+        for test_name, metrics in other.series.items():
+            self.series.setdefault(test_name, {})
+            for metric, sides in metrics.items():
+                for test_type, stats in sides.items():
+                    self._get(test_name, metric, test_type).merge(stats)
+        for test_type, count in other.counts.items():
+            self.counts[test_type] += count
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize all accumulators to a JSON-compatible dict"""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "counts": dict(self.counts),
+            "series": {
+                test_name: {
+                    metric: {test_type: stats.to_dict() for test_type, stats in sides.items()}
+                    for metric, sides in metrics.items()
+                }
+                for test_name, metrics in self.series.items()
+            },
+        }
+    
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> 'StreamingSummary':
+        summary = cls(d["relative_accuracy"])
+        summary.counts.update(d["counts"])
+        summary.series = {
+            test_name: {
+                metric: {test_type: RunningStats.from_dict(stats) for test_type, stats in sides.items()}
+                for metric, sides in metrics.items()
+            }
+            for test_name, metrics in d["series"].items()
+        }
+        return summary
+    
+    def to_summary(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a summary in the create_summary() schema"""
+        summary = {
+            "metadata": metadata,
+            "metrics": {}
+        }
+        
+        for test_name, metrics in self.series.items():
+            summary["metrics"][test_name] = {}
+            for metric, sides in metrics.items():
+                summary["metrics"][test_name][metric] = {
+                    test_type: sides[test_type].to_summary() if test_type in sides else []
+                    for test_type in ["baseline", "hybrid"]
+                }
+        
+        return summary
+
+
+def _fold_json_chunk(task: Tuple[str, List[str], float]) -> Tuple[StreamingSummary, List[Tuple[str, str]]]:
+    """
+    Worker entry point: fold a chunk of files into a partial summary
+    
+    Returns:
+        (partial summary, [(location, error message), ...])
+    """
+    test_type, paths, relative_accuracy = task
+    partial = StreamingSummary(relative_accuracy)
+    errors = []
+    for path in paths:
+        for obj, error in iter_result_records(path):
+            if error is not None:
+                errors.append(error)
+            else:
+                partial.add_record(test_type, obj)
+    return partial, errors
+
+
+def fold_json_files(pattern: Union[str, List[str]], test_type: str, summary: StreamingSummary,
+                    workers: int = 1) -> int:
+    """
+    Fold all result files matching glob pattern(s) into a streaming summary
+    
+    Args:
+        pattern: Glob pattern (e.g., "results/*.json") or list of patterns
+        test_type: "baseline" or "hybrid"
+        summary: Accumulators to fold into
+        workers: Number of worker processes (1 = fold in this process)
+    
+    Returns:
+        Number of records folded
+    """
+    files = _glob_files(pattern)
+    
+    if not files:
+        print(f"WARNING: No files found matching pattern: {_describe_pattern(pattern)}", file=sys.stderr)
+        return 0
+    
+    tasks = [(test_type, chunk, summary.relative_accuracy)
+             for chunk in _chunked(files, _chunk_size(len(files), workers))]
+    
+    if workers > 1 and len(tasks) > 1:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(_fold_json_chunk, tasks)
+    else:
+        executor = None
+        results = map(_fold_json_chunk, tasks)
+    
+    loaded = 0
+    try:
+        for partial, errors in results:
+            for location, error in errors:
+                print(f"ERROR loading {location}: {error}", file=sys.stderr)
+            loaded += partial.counts[test_type]
+            summary.merge(partial)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    print(f"✓ Loaded {loaded} records from {len(files)} files matching: "
+          f"{_describe_pattern(pattern)}", file=sys.stderr)
+    return loaded
+
+
+def stream_summary(baseline_dir: str, hybrid_dir: str, workers: int = 1,
+                   relative_accuracy: float = 0.01) -> Dict[str, Any]:
+    """
+    Create summary statistics without holding the raw records in memory
+    
+    Count, mean, stdev, min and max are exact; the median comes from a
+    quantile sketch and is within `relative_accuracy` of the true value.
+    """
+    summary = StreamingSummary(relative_accuracy)
+    baseline_tests = fold_json_files(result_patterns(baseline_dir), "baseline",
+                                     summary, workers=workers)
+    hybrid_tests = fold_json_files(result_patterns(hybrid_dir), "hybrid",
+                                   summary, workers=workers)
+    
+    return summary.to_summary({
+        "aggregation_time": datetime.now().isoformat(),
+        "baseline_tests": baseline_tests,
+        "hybrid_tests": hybrid_tests,
+    })
+
+
+MANIFEST_VERSION = 2
+
+
+def _load_manifest(path: str, relative_accuracy: float) -> Dict[str, Dict[str, Any]]:
+    """
+    Load the per-file manifest, returning {filepath: entry}
+    
+    A missing, unreadable or incompatible manifest yields an empty cache
+    (every file is parsed again) rather than an error.
+    """
+    if not os.path.exists(path):
+        return {}
+    
+    try:
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+    except Exception as e:
+        print(f"WARNING: Ignoring unreadable cache manifest {path}: {e}", file=sys.stderr)
+        return {}
+    
+    if (manifest.get("version") != MANIFEST_VERSION
+            or manifest.get("relative_accuracy") != relative_accuracy):
+        print(f"WARNING: Cache manifest {path} is incompatible, rebuilding", file=sys.stderr)
+        return {}
+    
+    return manifest.get("files", {})
+
+
+def _write_json_atomic(path: str, data: Any, **dump_kwargs):
+    """Write JSON via a temporary file + rename, so readers never see a partial file"""
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, **dump_kwargs)
+    os.replace(tmp_path, path)
+
+
+def _save_manifest(path: str, relative_accuracy: float, files: Dict[str, Dict[str, Any]]):
+    """Write the manifest atomically"""
+    _write_json_atomic(path, {
+        "version": MANIFEST_VERSION,
+        "relative_accuracy": relative_accuracy,
+        "files": files,
+    }, separators=(',', ':'))
+
+
+def _fold_each_json_file(task: Tuple[str, List[str], float]) -> List[Tuple[Optional[Dict], Optional[str]]]:
+    """
+    Worker entry point: fold each file of a chunk into its own partial summary
     
+    Returns:
+        [(serialized partial, [(location, error message), ...]), ...] in path order
+    """
+    test_type, paths, relative_accuracy = task
+    results = []
+    for path in paths:
+        partial, errors = _fold_json_chunk((test_type, [path], relative_accuracy))
+        results.append((partial.to_dict(), errors))
+    return results
+
+
+def cached_summary(baseline_dir: str, hybrid_dir: str, cache_path: str,
+                   workers: int = 1, relative_accuracy: float = 0.01) -> Dict[str, Any]:
+    """
+    Create streaming summary statistics, re-parsing only files that changed
+    
+    The manifest at `cache_path` stores each file's partial aggregate keyed
+    by path, size and mtime. New or modified files are parsed, deleted files
+    are dropped, and all partials are merged in sorted path order, so the
+    result does not depend on which files came from the cache (and matches
+    an uncached --stream run up to floating-point rounding).
+    """
+    cached = _load_manifest(cache_path, relative_accuracy)
+    manifest: Dict[str, Dict[str, Any]] = {}
+    summary = StreamingSummary(relative_accuracy)
+    totals = {}
+    parsed = reused = 0
+    
+    for test_type, directory in [("baseline", baseline_dir), ("hybrid", hybrid_dir)]:
+        pattern = result_patterns(directory)
+        files = _glob_files(pattern)
+        
+        if not files:
+            print(f"WARNING: No files found matching pattern: {_describe_pattern(pattern)}", file=sys.stderr)
+        
+        # Split into cache hits and files that need parsing
+        stale = []
+        present = []
+        for filepath in files:
+            try:
+                st = os.stat(filepath)
+            except FileNotFoundError:
+                # Deleted since the glob: drop it like any other removed file
+                print(f"WARNING: {filepath} disappeared, skipping", file=sys.stderr)
+                continue
+            present.append(filepath)
+            key = os.path.abspath(filepath)
+            entry = cached.get(key)
+            if (entry is not None and entry["side"] == test_type
+                    and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns):
+                manifest[key] = entry
+            else:
+                manifest[key] = {"side": test_type, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+                stale.append(filepath)
+        files = present
+        
+        tasks = [(test_type, chunk, relative_accuracy)
+                 for chunk in _chunked(stale, _chunk_size(len(stale), workers))]
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = [r for chunk in executor.map(_fold_each_json_file, tasks) for r in chunk]
+        else:
+            results = [r for task in tasks for r in _fold_each_json_file(task)]
+        
+        for filepath, (partial, errors) in zip(stale, results):
+            entry = manifest[os.path.abspath(filepath)]
+            entry["partial"] = partial
+            entry["errors"] = errors
+        
+        parsed += len(stale)
+        reused += len(files) - len(stale)
+        
+        # Merge every partial in path order
+        before = summary.counts[test_type]
+        for filepath in files:
+            entry = manifest[os.path.abspath(filepath)]
+            for location, error in entry["errors"]:
+                print(f"ERROR loading {location}: {error}", file=sys.stderr)
+            summary.merge(StreamingSummary.from_dict(entry["partial"]))
+        totals[test_type] = summary.counts[test_type] - before
+        
+        if files:
+            print(f"✓ Loaded {totals[test_type]} records from {len(files)} files matching: "
+                  f"{_describe_pattern(pattern)}", file=sys.stderr)
+    
+    _save_manifest(cache_path, relative_accuracy, manifest)
+    print(f"✓ Cache: {parsed} files parsed, {reused} reused, "
+          f"{len(set(cached) - set(manifest))} dropped", file=sys.stderr)
+    
+    return summary.to_summary({
+        "aggregation_time": datetime.now().isoformat(),
+        "baseline_tests": totals["baseline"],
+        "hybrid_tests": totals["hybrid"],
+    })
+
+
+# Bytes at the start and end of a followed file's consumed prefix that must
+# be unchanged for new data to count as appended
+FOLLOW_CHECK_BYTES = 4096
+
+
+class ResultFollower:
+    """
+    Incrementally fold result files while a test is still writing them
+    
+    Each poll scans the baseline/hybrid directories with os.scandir and
+    only touches files whose size or mtime changed:
+    - new files are parsed and merged into the running total
+    - plain .jsonl files that grew are read from the last complete line
+      onwards, so appending samples costs only the new bytes; a file only
+      counts as appended if it is the same inode and the first and last
+      FOLLOW_CHECK_BYTES of what was already read are unchanged
+    - rewritten, truncated, replaced or deleted files trigger a rebuild of
+      the total from the per-file partials (no re-parsing of other files)
+    A file that fails to parse is assumed to be mid-write and retried when
+    it changes; its error is reported once it has been stable for a poll.
+    """
+    
+    def __init__(self, directories: Dict[str, str], relative_accuracy: float = 0.01):
+        self.directories = directories
+        self.relative_accuracy = relative_accuracy
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.total = StreamingSummary(relative_accuracy)
+        self.dirty = True
+        self._rebuild = False
+    
+    def _scan(self) -> Dict[str, Tuple[str, int, int, Tuple[int, int]]]:
+        """Current result files: {path: (side, size, mtime_ns, (device, inode))}"""
+        found = {}
+        for test_type, directory in self.directories.items():
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if (entry.is_file()
+                            and any(fnmatch.fnmatch(entry.name, p) for p in RESULT_PATTERNS)):
+                        st = entry.stat()
+                        found[entry.path] = (test_type, st.st_size, st.st_mtime_ns,
+                                             (st.st_dev, st.st_ino))
+        return found
+    
+    @staticmethod
+    def _prefix_check(f, offset: int) -> Tuple[bytes, bytes]:
+        """First and last FOLLOW_CHECK_BYTES of the first `offset` bytes of f"""
+        f.seek(0)
+        head = f.read(min(offset, FOLLOW_CHECK_BYTES))
+        f.seek(max(0, offset - FOLLOW_CHECK_BYTES))
+        tail = f.read(offset - f.tell())
+        return head, tail
+    
+    def _appended(self, path: str, state: Dict[str, Any], size: int) -> bool:
+        """Whether a followed .jsonl file only had data added after what was read"""
+        if size < state["offset"]:
+            return False
+        try:
+            with open(path, 'rb') as f:
+                return self._prefix_check(f, state["offset"]) == state["prefix"]
+        except OSError:
+            return False
+    
+    def _read_tail(self, path: str, state: Dict[str, Any]) -> Tuple[StreamingSummary, List[Tuple[str, str]]]:
+        """
+        Fold complete lines appended to a plain .jsonl file since the last poll
+        
+        Returns:
+            (summary of the new records only, [(location, error message), ...])
+        """
+        delta = StreamingSummary(self.relative_accuracy)
+        errors = []
+        source = os.path.basename(path)
+        with open(path, 'rb') as f:
+            f.seek(state["offset"])
+            chunk = f.read()
+            end = chunk.rfind(b"\n") + 1
+            state["prefix"] = self._prefix_check(f, state["offset"] + end)
+        for line in chunk[:end].splitlines():
+            state["lines"] += 1
+            if not line.strip():
+                continue
+            try:
+                obj = json.loads(line)
+                obj['_source_file'] = source
+            except Exception as e:
+                errors.append((f"{path}:{state['lines']}", str(e)))
+                continue
+            delta.add_record(state["side"], obj)
+        state["offset"] += end
+        return delta, errors
+    
+    def poll(self) -> int:
+        """Fold in new and changed files; returns how many files changed"""
+        found = self._scan()
+        changed = 0
+        
+        for path in set(self.files) - set(found):
+            del self.files[path]
+            self._rebuild = True
+            changed += 1
+        
+        for path in sorted(found):
+            test_type, size, mtime_ns, inode = found[path]
+            state = self.files.get(path)
+            if state is not None and (state["size"], state["mtime_ns"]) == (size, mtime_ns):
+                # Unchanged; report a parse failure once it has stopped changing
+                if state.get("failed") and not state.get("reported"):
+                    for location, error in state["failed"]:
+                        print(f"ERROR loading {location}: {error}", file=sys.stderr)
+                    state["reported"] = True
+                continue
+            
+            changed += 1
+            appended = (state is not None and path.endswith('.jsonl')
+                        and state["side"] == test_type and state["inode"] == inode
+                        and not state.get("failed") and self._appended(path, state, size))
+            if appended:
+                delta, errors = self._read_tail(path, state)
+                state["partial"].merge(delta)
+                if not self._rebuild:
+                    self.total.merge(delta)
+                for location, error in errors:
+                    print(f"ERROR loading {location}: {error}", file=sys.stderr)
+            else:
+                if state is not None and not state.get("failed"):
+                    self._rebuild = True
+                state = {"side": test_type, "offset": 0, "lines": 0}
+                if path.endswith('.jsonl'):
+                    # Stops at the last complete line; the rest is read on a later poll
+                    state["partial"], errors = self._read_tail(path, state)
+                else:
+                    state["partial"], errors = _fold_json_chunk(
+                        (test_type, [path], self.relative_accuracy))
+                
+                if path.endswith('.json') and errors:
+                    # Probably still being written: retry when it changes
+                    state["failed"] = errors
+                    state["partial"] = StreamingSummary(self.relative_accuracy)
+                else:
+                    for location, error in errors:
+                        print(f"ERROR loading {location}: {error}", file=sys.stderr)
+                if not self._rebuild:
+                    self.total.merge(state["partial"])
+            
+            state["size"], state["mtime_ns"], state["inode"] = size, mtime_ns, inode
+            self.files[path] = state
+        
+        if changed:
+            self.dirty = True
+        return changed
+    
+    def summary(self) -> Dict[str, Any]:
+        """Current summary in the create_summary() schema"""
+        if self._rebuild:
+            self.total = StreamingSummary(self.relative_accuracy)
+            for path in sorted(self.files):
+                self.total.merge(self.files[path]["partial"])
+            self._rebuild = False
+        
+        self.dirty = False
+        return self.total.to_summary({
+            "aggregation_time": datetime.now().isoformat(),
+            "baseline_tests": self.total.counts["baseline"],
+            "hybrid_tests": self.total.counts["hybrid"],
+            "files": len(self.files),
+            "live": True,
+        })
+
+
+def follow_summary(baseline_dir: str, hybrid_dir: str, output: str,
+                   interval: float = 2.0, refresh: float = 10.0,
+                   relative_accuracy: float = 0.01) -> Dict[str, Any]:
+    """
+    Keep the summary at `output` up to date until interrupted (Ctrl+C or SIGTERM)
+    
+    Directories are polled every `interval` seconds; when something changed,
+    the summary is atomically rewritten at most once every `refresh`
+    seconds, so dashboards always read a complete file.
+    
+    Returns:
+        The final summary
+    """
+    follower = ResultFollower({"baseline": baseline_dir, "hybrid": hybrid_dir},
+                              relative_accuracy)
+    next_write = 0.0
+    summary = None
+    
+    def _stop(signum, frame):
+        raise KeyboardInterrupt
+    
+    # Background jobs ignore SIGINT, so also stop cleanly on SIGTERM
+    signal.signal(signal.SIGTERM, _stop)
+    
+    print(f"Following {baseline_dir} and {hybrid_dir} (poll every {interval}s, "
+          f"write every {refresh}s, Ctrl+C to stop)...", file=sys.stderr)
+    try:
+        while True:
+            follower.poll()
+            now = time.monotonic()
+            if follower.dirty and now >= next_write:
+                summary = follower.summary()
+                _write_json_atomic(output, summary, indent=2)
+                print(f"✓ [{datetime.now():%H:%M:%S}] Updated {output}: "
+                      f"{summary['metadata']['baseline_tests']} baseline, "
+                      f"{summary['metadata']['hybrid_tests']} hybrid records", file=sys.stderr)
+                next_write = now + refresh
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("", file=sys.stderr)
+    
+    # Pick up anything that landed since the last scan
+    follower.poll()
+    if summary is None or follower.dirty:
+        summary = follower.summary()
     return summary
 
 
+COLUMNAR_MAGIC = b"PQCCOL01"
+COLUMNAR_ALIGNMENT = 64
+
+
+def _columnar_data_offset(header_length: int) -> int:
+    """Start of the data section: after magic + length + header, 64-byte aligned"""
+    end = len(COLUMNAR_MAGIC) + 8 + header_length
+    return -(-end // COLUMNAR_ALIGNMENT) * COLUMNAR_ALIGNMENT
+
+
+def write_columnar(summary: Dict[str, Any], path: str):
+    """
+    Write a summary (with raw_values) as a columnar binary file
+    
+    Layout:
+        8 bytes    magic "PQCCOL01"
+        8 bytes    header length (uint64, little-endian)
+        N bytes    JSON header: metadata + one index entry per series
+        padding    zeros up to a 64-byte boundary
+        data       float64 little-endian values, one contiguous run per series
+    
+    Each index entry holds test_name, metric, side, the offset (in values,
+    from the start of the data section) and count of its run, plus the
+    summary statistics, so readers that only need the statistics never
+    touch the data section.
+    """
+    index = []
+    columns = []
+    offset = 0
+    
+    for test_name, metrics in summary["metrics"].items():
+        for metric, sides in metrics.items():
+            for test_type in ["baseline", "hybrid"]:
+                stats = sides.get(test_type)
+                if not stats:
+                    continue
+                values = stats.get("raw_values")
+                if values is None:
+                    raise ValueError("Columnar output needs raw values "
+                                     "(not available in streaming summaries)")
+                
+                column = array('d', values)
+                if sys.byteorder != 'little':
+                    column.byteswap()
+                
+                entry = {k: v for k, v in stats.items() if k != "raw_values"}
+                entry.update({
+                    "test_name": test_name,
+                    "metric": metric,
+                    "side": test_type,
+                    "offset": offset,
+                    "count": len(column),
+                })
+                index.append(entry)
+                columns.append(column)
+                offset += len(column)
+    
+    header = json.dumps({
+        "version": 1,
+        "dtype": "<f8",
+        "metadata": summary.get("metadata", {}),
+        "series": index,
+    }).encode('utf-8')
+    data_offset = _columnar_data_offset(len(header))
+    
+    with open(path, 'wb') as f:
+        f.write(COLUMNAR_MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        f.write(b"\0" * (data_offset - f.tell()))
+        for column in columns:
+            column.tofile(f)
+
+
+def read_columnar_header(path: str) -> Dict[str, Any]:
+    """
+    Read only the JSON index of a columnar file
+    
+    Returns:
+        Header dict with "metadata", "series" and "data_offset"
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+            raise ValueError(f"Not a columnar results file: {path}")
+        (header_length,) = struct.unpack('<Q', f.read(8))
+        header = json.loads(f.read(header_length).decode('utf-8'))
+    
+    header["data_offset"] = _columnar_data_offset(header_length)
+    return header
+
+
+def open_columnar(path: str):
+    """
+    Open a columnar file for zero-copy access
+    
+    Returns:
+        (header, series) where series maps (test_name, metric, side) to a
+        read-only numpy.memmap view; pages are only read when accessed
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("numpy is required to read columnar files")
+    
+    header = read_columnar_header(path)
+    total = sum(entry["count"] for entry in header["series"])
+    data = (np.memmap(path, dtype='<f8', mode='r', offset=header["data_offset"], shape=(total,))
+            if total else np.empty(0, dtype='<f8'))
+    
+    series = {
+        (entry["test_name"], entry["metric"], entry["side"]):
+            data[entry["offset"]:entry["offset"] + entry["count"]]
+        for entry in header["series"]
+    }
+    return header, series
+
+
+PARTIAL_FORMAT = "pqc-partial-aggregate"
+PARTIAL_VERSION = 1
+
+
+def map_partial(baseline_dir: Optional[str], hybrid_dir: Optional[str], node: str,
+                workers: int = 1, relative_accuracy: float = 0.01) -> Dict[str, Any]:
+    """
+    Map step: fold one node's local results into a partial aggregate
+    
+    The partial holds only the running accumulators (count, mean, M2,
+    min/max and quantile sketch per series), so it is a few KB no matter
+    how many samples the node produced.
+    """
+    summary = StreamingSummary(relative_accuracy)
+    for test_type, directory in [("baseline", baseline_dir), ("hybrid", hybrid_dir)]:
+        if directory:
+            fold_json_files(result_patterns(directory), test_type, summary, workers=workers)
+    
+    return {
+        "format": PARTIAL_FORMAT,
+        "version": PARTIAL_VERSION,
+        "node": node,
+        "created": datetime.now().isoformat(),
+        "aggregate": summary.to_dict(),
+    }
+
+
+def reduce_partials(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Reduce step: merge partial aggregates into a summary
+    
+    The result has the create_summary() schema. Counts, means, variances,
+    min and max are exact; medians come from the merged quantile sketches.
+    """
+    if not partials:
+        raise ValueError("No partial aggregates to reduce")
+    
+    merged = None
+    for partial in partials:
+        if partial.get("format") != PARTIAL_FORMAT or partial.get("version") != PARTIAL_VERSION:
+            raise ValueError(f"Not a partial aggregate (version {PARTIAL_VERSION}): "
+                             f"node {partial.get('node', '?')}")
+        
+        summary = StreamingSummary.from_dict(partial["aggregate"])
+        if merged is None:
+            merged = summary
+        elif summary.relative_accuracy != merged.relative_accuracy:
+            raise ValueError(f"Partial from node {partial['node']} uses sketch accuracy "
+                             f"{summary.relative_accuracy}, expected {merged.relative_accuracy}")
+        else:
+            merged.merge(summary)
+    
+    return merged.to_summary({
+        "aggregation_time": datetime.now().isoformat(),
+        "baseline_tests": merged.counts["baseline"],
+        "hybrid_tests": merged.counts["hybrid"],
+        "nodes": [partial["node"] for partial in partials],
+    })
+
+
+def main_map(argv: List[str]):
+    """CLI for `aggregate-data.py map`"""
+    import socket
+    
+    parser = argparse.ArgumentParser(
+        prog='aggregate-data.py map',
+        description='Fold this node\'s results into a compact partial aggregate'
+    )
+    parser.add_argument('--baseline', '-b',
+                        help='Directory containing baseline (classical TLS) test results')
+    parser.add_argument('--hybrid', '-y',
+                        help='Directory containing hybrid (PQC) test results')
+    parser.add_argument('--output', '-o', required=True,
+                        help='Output file for the partial aggregate (JSON)')
+    parser.add_argument('--node', '-n', default=socket.gethostname(),
+                        help='Node name recorded in the partial (default: hostname)')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help='Worker processes for parsing result files (default: 1 = serial)')
+    parser.add_argument('--sketch-accuracy', type=float, default=0.01,
+                        help='Relative accuracy of quantile sketches (default: 0.01 = 1%%)')
+    args = parser.parse_args(argv)
+    
+    if not args.baseline and not args.hybrid:
+        parser.error("at least one of --baseline/--hybrid is required")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if not 0 < args.sketch_accuracy < 1:
+        parser.error("--sketch-accuracy must be between 0 and 1")
+    
+    for label, directory in [("Baseline", args.baseline), ("Hybrid", args.hybrid)]:
+        if directory and not os.path.isdir(directory):
+            print(f"ERROR: {label} directory not found: {directory}", file=sys.stderr)
+            sys.exit(1)
+    
+    partial = map_partial(args.baseline, args.hybrid, args.node,
+                          workers=args.workers, relative_accuracy=args.sketch_accuracy)
+    with open(args.output, 'w') as f:
+        json.dump(partial, f, separators=(',', ':'))
+    
+    counts = partial["aggregate"]["counts"]
+    print(f"✓ Partial aggregate for node {args.node} written to: {args.output} "
+          f"({counts['baseline']} baseline, {counts['hybrid']} hybrid records, "
+          f"{os.path.getsize(args.output)} bytes)", file=sys.stderr)
+
+
+def main_reduce(argv: List[str]):
+    """CLI for `aggregate-data.py reduce`"""
+    parser = argparse.ArgumentParser(
+        prog='aggregate-data.py reduce',
+        description='Merge partial aggregates from several nodes into a summary'
+    )
+    parser.add_argument('partials', nargs='+',
+                        help='Partial aggregate files produced by `map`')
+    parser.add_argument('--output', '-o', required=True,
+                        help='Output file for the summary (JSON)')
+    args = parser.parse_args(argv)
+    
+    partials = []
+    for path in args.partials:
+        with open(path, 'r') as f:
+            partials.append(json.load(f))
+    
+    summary = reduce_partials(partials)
+    with open(args.output, 'w') as f:
+        json.dump(summary, f, indent=2)
+    
+    metadata = summary["metadata"]
+    print(f"✓ Reduced {len(partials)} partials ({metadata['baseline_tests']} baseline, "
+          f"{metadata['hybrid_tests']} hybrid records) into: {args.output}", file=sys.stderr)
+
+
 def main():
+    # Distributed mode: `map` on each load-generator node, `reduce` on one host
+    if len(sys.argv) > 1 and sys.argv[1] in ('map', 'reduce'):
+        command = main_map if sys.argv[1] == 'map' else main_reduce
+        try:
+            command(sys.argv[2:])
+        except Exception as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+    
     parser = argparse.ArgumentParser(
-        description='Aggregate performance data from multiple test runs'
+        description='Aggregate performance data from multiple test runs '
+                    '(see also the `map` and `reduce` subcommands)'
     )
     
     parser.add_argument(
@@ -225,8 +1532,102 @@ def main():
         help='Create summary statistics instead of raw aggregation'
     )
     
+    parser.add_argument(
+        '--group-by', '-g',
+        nargs='+',
+        metavar='KEY',
+        help='Output the --metrics series split by these record fields '
+             '(e.g. test_name concurrency group host), extracted in one pass'
+    )
+    
+    parser.add_argument(
+        '--format', '-f',
+        choices=['json', 'columnar'],
+        default='json',
+        help='Output format: json, or columnar (summary with float64 series '
+             'readable via numpy.memmap; implies --summary)'
+    )
+    
+    parser.add_argument(
+        '--sketch',
+        action='store_true',
+        help='Store a mergeable quantile sketch per series instead of raw_values '
+             '(much smaller summaries; see --sketch-accuracy)'
+    )
+    
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Fold files into running accumulators as they are read (implies --summary); '
+             'memory stays constant, medians come from a quantile sketch'
+    )
+    
+    parser.add_argument(
+        '--cache',
+        metavar='MANIFEST',
+        help='Manifest file caching per-file partial aggregates; re-runs only parse '
+             'new or changed files (implies --stream)'
+    )
+    
+    parser.add_argument(
+        '--follow',
+        action='store_true',
+        help='Keep running and rewrite the summary as new result files appear '
+             '(implies --stream; stop with Ctrl+C)'
+    )
+    
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=2.0,
+        help='--follow: seconds between directory scans (default: 2)'
+    )
+    
+    parser.add_argument(
+        '--refresh',
+        type=float,
+        default=10.0,
+        help='--follow: minimum seconds between summary rewrites (default: 10)'
+    )
+    
+    parser.add_argument(
+        '--sketch-accuracy',
+        type=float,
+        default=0.01,
+        help='Relative accuracy of quantile sketches: every percentile is within '
+             'this fraction of the true value (default: 0.01 = 1%%)'
+    )
+    
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=1,
+        help='Worker processes for parsing result files (default: 1 = serial)'
+    )
+    
     args = parser.parse_args()
     
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    
+    if not 0 < args.sketch_accuracy < 1:
+        parser.error("--sketch-accuracy must be between 0 and 1")
+    
+    if args.format == 'columnar' and (args.stream or args.cache or args.sketch):
+        parser.error("--format columnar needs raw series and cannot be combined with "
+                     "--stream/--cache/--sketch")
+    
+    if args.group_by and (args.summary or args.sketch or args.stream or args.cache
+                          or args.follow or args.format == 'columnar'):
+        parser.error("--group-by produces grouped raw series and cannot be combined with "
+                     "summary, streaming or columnar options")
+    
+    if args.follow and (args.cache or args.format == 'columnar'):
+        parser.error("--follow cannot be combined with --cache or --format columnar")
+    
+    if args.interval <= 0 or args.refresh < 0:
+        parser.error("--interval must be positive and --refresh non-negative")
+    
     try:
         # Validate directories
         if not os.path.isdir(args.baseline):
@@ -237,28 +1638,60 @@ def main():
             print(f"ERROR: Hybrid directory not found: {args.hybrid}", file=sys.stderr)
             sys.exit(1)
         
-        # Merge data
         print("Aggregating data...", file=sys.stderr)
-        merged = merge_baseline_and_hybrid(args.baseline, args.hybrid)
         
-        # Create output
-        if args.summary:
-            output_data = create_summary(merged)
-            print("✓ Created summary statistics", file=sys.stderr)
+        if args.follow:
+            # Live: poll the directories and rewrite the output as results arrive
+            output_data = follow_summary(args.baseline, args.hybrid, args.output,
+                                         interval=args.interval, refresh=args.refresh,
+                                         relative_accuracy=args.sketch_accuracy)
+            print("✓ Created summary statistics (follow)", file=sys.stderr)
+            baseline_count = output_data["metadata"]["baseline_tests"]
+            hybrid_count = output_data["metadata"]["hybrid_tests"]
+        elif args.cache:
+            # Incremental: merge cached partials, parse only new/changed files
+            output_data = cached_summary(args.baseline, args.hybrid, args.cache,
+                                         workers=args.workers,
+                                         relative_accuracy=args.sketch_accuracy)
+            print("✓ Created summary statistics (incremental)", file=sys.stderr)
+            baseline_count = output_data["metadata"]["baseline_tests"]
+            hybrid_count = output_data["metadata"]["hybrid_tests"]
+        elif args.stream:
+            # Fold files as they are read; raw records are never materialised
+            output_data = stream_summary(args.baseline, args.hybrid, workers=args.workers,
+                                         relative_accuracy=args.sketch_accuracy)
+            print("✓ Created summary statistics (streaming)", file=sys.stderr)
+            baseline_count = output_data["metadata"]["baseline_tests"]
+            hybrid_count = output_data["metadata"]["hybrid_tests"]
         else:
-            output_data = merged
-            print("✓ Merged raw data", file=sys.stderr)
+            # Merge data
+            merged = merge_baseline_and_hybrid(args.baseline, args.hybrid, workers=args.workers)
+            
+            # Create output
+            if args.summary or args.sketch or args.format == 'columnar':
+                output_data = create_summary(
+                    merged, sketch_accuracy=args.sketch_accuracy if args.sketch else None)
+                print("✓ Created summary statistics", file=sys.stderr)
+            elif args.group_by:
+                output_data = extract_grouped_metrics(merged, args.metrics, args.group_by)
+                print(f"✓ Extracted {len(output_data['series'])} series grouped by "
+                      f"{', '.join(args.group_by)}", file=sys.stderr)
+            else:
+                output_data = merged
+                print("✓ Merged raw data", file=sys.stderr)
+            
+            baseline_count = len(merged.get("baseline", []))
+            hybrid_count = len(merged.get("hybrid", []))
         
         # Write output
-        with open(args.output, 'w') as f:
-            json.dump(output_data, f, indent=2)
+        if args.format == 'columnar':
+            write_columnar(output_data, args.output)
+        else:
+            _write_json_atomic(args.output, output_data, indent=2)
         
         print(f"✓ Aggregated data written to: {args.output}", file=sys.stderr)
         
         # Print summary
-        baseline_count = len(merged.get("baseline", []))
-        hybrid_count = len(merged.get("hybrid", []))
-        
         print("", file=sys.stderr)
         print("=" * 50, file=sys.stderr)
         print("AGGREGATION SUMMARY", file=sys.stderr)
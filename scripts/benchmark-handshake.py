@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+TLS Handshake Benchmark (asyncio)
+Opens many concurrent TLS connections and times TCP connect and TLS
+handshake separately, without forking a process per sample
+วัดเวลา TCP connect และ TLS handshake แยกกัน ด้วย asyncio
+"""
+
+import os
+import ssl
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+import importlib.util
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+
+def load_calculate_stats():
+    """Import calculate-stats.py from this directory (hyphenated file name)"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'calculate-stats.py')
+    spec = importlib.util.spec_from_file_location('calculate_stats', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_openssl_config(path: str, groups: Optional[str] = None,
+                         ciphersuites: Optional[str] = None,
+                         providers: Optional[List[str]] = None):
+    """
+    Write an OpenSSL config selecting TLS groups / TLS 1.3 ciphersuites
+    
+    Python's ssl module cannot select key-exchange groups beyond the
+    classical curves (and not TLS 1.3 ciphersuites at all), so a worker
+    process is started with OPENSSL_CONF pointing at this file. Providers
+    (e.g. oqsprovider for ML-KEM hybrids on OpenSSL < 3.5) are activated
+    next to the default provider.
+    
+    OpenSSL skips config lines it cannot apply (e.g. a group unknown to
+    the linked library) without failing, so check `negotiated_group` in
+    the results (recorded when the ssl module exposes it) or the server
+    log when benchmarking new groups.
+    """
+    lines = [
+        "openssl_conf = openssl_init",
+        "",
+        "[openssl_init]",
+        "ssl_conf = ssl_sect",
+    ]
+    if providers:
+        lines.append("providers = provider_sect")
+    lines += [
+        "",
+        "[ssl_sect]",
+        "system_default = system_default_sect",
+        "",
+        "[system_default_sect]",
+    ]
+    if groups:
+        lines.append(f"Groups = {groups}")
+    if ciphersuites:
+        lines.append(f"Ciphersuites = {ciphersuites}")
+    
+    if providers:
+        lines += ["", "[provider_sect]", "default = default_sect"]
+        lines += [f"{name} = {name}_sect" for name in providers]
+        lines += ["", "[default_sect]", "activate = 1"]
+        for name in providers:
+            lines += ["", f"[{name}_sect]", "activate = 1"]
+    
+    with open(path, 'w') as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def create_ssl_context(args) -> ssl.SSLContext:
+    """Client context from the CLI options (groups come from OPENSSL_CONF)"""
+    context = ssl.create_default_context(cafile=args.cafile)
+    if args.insecure:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    if args.tls_version:
+        version = ssl.TLSVersion.TLSv1_3 if args.tls_version == '1.3' else ssl.TLSVersion.TLSv1_2
+        context.minimum_version = version
+        context.maximum_version = version
+    if args.ciphers:
+        context.set_ciphers(args.ciphers)
+    return context
+
+
+async def measure_handshake(loop, address, server_hostname: str,
+                            context: ssl.SSLContext, timeout: float) -> Dict[str, Any]:
+    """
+    One connection: TCP connect, then TLS handshake on the same socket
+    
+    The address is resolved beforehand, so DNS is not part of either
+    phase. Times are taken with perf_counter_ns around each await and
+    therefore include event-loop scheduling under high concurrency.
+    """
+    family, address = address
+    transport = tls_transport = None
+    try:
+        start = time.perf_counter_ns()
+        transport, protocol = await asyncio.wait_for(
+            loop.create_connection(asyncio.Protocol, *address[:2], family=family), timeout)
+        connected = time.perf_counter_ns()
+        
+        tls_transport = await asyncio.wait_for(
+            loop.start_tls(transport, protocol, context, server_hostname=server_hostname), timeout)
+        done = time.perf_counter_ns()
+        
+        ssl_object = tls_transport.get_extra_info('ssl_object')
+        result = {
+            "tcp_connect_ms": (connected - start) / 1e6,
+            "tls_handshake_ms": (done - connected) / 1e6,
+            "total_ms": (done - start) / 1e6,
+            "tls_version": ssl_object.version(),
+            "cipher": ssl_object.cipher()[0],
+        }
+        # Negotiated key exchange, where the ssl module can report it
+        if hasattr(ssl_object, 'group'):
+            result["negotiated_group"] = ssl_object.group()
+        return result
+    finally:
+        # The TLS transport wraps (and closes) the TCP one
+        if tls_transport is not None or transport is not None:
+            (tls_transport or transport).abort()
+
+
+async def run_benchmark(args, context: ssl.SSLContext, test_name: str, out) -> Dict[str, int]:
+    """
+    Run warmup + measured handshakes with `concurrency` connections in flight
+    
+    Each measured connection is written to `out` as one JSON line.
+    
+    Returns:
+        {"ok": successful handshakes, "failed": failed handshakes}
+    """
+    loop = asyncio.get_running_loop()
+    info = (await loop.getaddrinfo(args.host, args.port, type=socket.SOCK_STREAM))[0]
+    address = (info[0], info[4])
+    server_hostname = args.sni or args.host
+    
+    total = args.warmup + args.connections
+    next_index = 0
+    counts = {"ok": 0, "failed": 0}
+    
+    async def worker():
+        nonlocal next_index
+        while next_index < total:
+            index = next_index
+            next_index += 1
+            timestamp = datetime.now().isoformat()
+            try:
+                result = await measure_handshake(loop, address, server_hostname,
+                                                 context, args.timeout)
+                error = None
+            except (OSError, ssl.SSLError, asyncio.TimeoutError) as e:
+                result, error = None, f"{type(e).__name__}: {e}"
+            
+            if index < args.warmup:
+                continue
+            
+            record = {"test_name": test_name, "group": args.group or "default",
+                      "_seq": index - args.warmup, "timestamp": timestamp}
+            if error is None:
+                record.update(result)
+                counts["ok"] += 1
+            else:
+                record["error"] = error
+                counts["failed"] += 1
+            out.write(json.dumps(record) + "\n")
+    
+    await asyncio.gather(*(worker() for _ in range(min(args.concurrency, total))))
+    return counts
+
+
+def run_group(args) -> Dict[str, int]:
+    """Benchmark one group in this process, appending records to args.output"""
+    context = create_ssl_context(args)
+    test_name = f"{args.test_name}_{args.group}" if args.group else args.test_name
+    with open(args.output, 'a') as out:
+        return asyncio.run(run_benchmark(args, context, test_name, out))
+
+
+def spawn_group(args, group: Optional[str], argv: List[str]) -> int:
+    """
+    Re-run this script for one group under a generated OPENSSL_CONF
+    
+    group None keeps OpenSSL's default groups (for --ciphersuites or
+    --provider alone).
+    """
+    with tempfile.NamedTemporaryFile('w', suffix='.cnf', delete=False) as f:
+        config_path = f.name
+    try:
+        write_openssl_config(config_path, group, args.ciphersuites, args.provider)
+        env = dict(os.environ, OPENSSL_CONF=config_path)
+        command = [sys.executable, os.path.abspath(__file__), *argv, '--_group', group or '']
+        return subprocess.run(command, env=env).returncode
+    finally:
+        os.unlink(config_path)
+
+
+def summarize(path: str, calculate_stats) -> List[Dict[str, Any]]:
+    """Per-test statistics of the records in a results file"""
+    series: Dict[str, Dict[str, Any]] = {}
+    with open(path, 'r') as f:
+        for line in f:
+            record = json.loads(line)
+            entry = series.setdefault(record["test_name"], {
+                "tcp_connect_ms": [], "tls_handshake_ms": [], "failed": 0})
+            if "error" in record:
+                entry["failed"] += 1
+            else:
+                entry["tcp_connect_ms"].append(record["tcp_connect_ms"])
+                entry["tls_handshake_ms"].append(record["tls_handshake_ms"])
+    
+    rows = []
+    for test_name, entry in series.items():
+        row = {"test_name": test_name, "failed": entry["failed"]}
+        for metric in ("tcp_connect_ms", "tls_handshake_ms"):
+            if entry[metric]:
+                row[metric] = calculate_stats.calculate_stats(entry[metric], [50, 90, 99])
+        rows.append(row)
+    return rows
+
+
+def format_summary(rows: List[Dict[str, Any]]) -> str:
+    header = (f"{'Test':<36}{'OK':>8}{'Failed':>8}{'TCP p50':>10}"
+              f"{'TLS p50':>10}{'TLS p90':>10}{'TLS p99':>10}")
+    lines = ["=" * len(header), "TLS HANDSHAKE BENCHMARK (ms)".center(len(header)),
+             "=" * len(header), header, "-" * len(header)]
+    for row in rows:
+        tls = row.get("tls_handshake_ms")
+        if tls is None:
+            lines.append(f"{row['test_name'][:36]:<36}{0:>8}{row['failed']:>8}")
+            continue
+        lines.append(f"{row['test_name'][:36]:<36}{tls['count']:>8}{row['failed']:>8}"
+                     f"{row['tcp_connect_ms']['p50']:>10.3f}{tls['p50']:>10.3f}"
+                     f"{tls['p90']:>10.3f}{tls['p99']:>10.3f}")
+    lines.append("=" * len(header))
+    return "\n".join(lines)
+
+
+def main():
+    """
+    CLI interface for the handshake benchmark
+    
+    Usage examples:
+        # 1000 handshakes, 50 in flight, against the lab 03 server
+        python3 benchmark-handshake.py localhost --port 8443 -n 1000 -c 50 -k
+        
+        # Classical vs hybrid key exchange, one run per group
+        python3 benchmark-handshake.py localhost --port 8443 -k \\
+            --groups X25519,X25519MLKEM768 --output results/handshake.jsonl
+        
+        # OpenSSL < 3.5: load oqsprovider for the ML-KEM / Kyber groups
+        python3 benchmark-handshake.py localhost -k --groups x25519_kyber768 --provider oqsprovider
+    
+    Results are JSON Lines (one record per connection with tcp_connect_ms,
+    tls_handshake_ms and total_ms), which aggregate-data.py reads directly.
+    """
+    parser = argparse.ArgumentParser(
+        description='Benchmark TLS handshakes with concurrent asyncio connections'
+    )
+    parser.add_argument('host', nargs='?', default='localhost', help='Server host (default: localhost)')
+    parser.add_argument('--port', '-p', type=int, default=8443, help='Server port (default: 8443)')
+    parser.add_argument('--connections', '-n', type=int, default=100,
+                        help='Measured handshakes per group (default: 100)')
+    parser.add_argument('--concurrency', '-c', type=int, default=10,
+                        help='Connections in flight (default: 10)')
+    parser.add_argument('--warmup', type=int, default=10,
+                        help='Handshakes discarded before measuring (default: 10)')
+    parser.add_argument('--groups', '-g', default=None,
+                        help='Comma-separated TLS groups, benchmarked one after another '
+                             '(e.g. X25519,X25519MLKEM768; default: OpenSSL defaults)')
+    parser.add_argument('--ciphers', default=None,
+                        help='TLS 1.2 cipher list (OpenSSL format)')
+    parser.add_argument('--ciphersuites', default=None,
+                        help='TLS 1.3 ciphersuites (e.g. TLS_AES_128_GCM_SHA256)')
+    parser.add_argument('--tls-version', choices=['1.2', '1.3'], default=None,
+                        help='Pin the TLS version')
+    parser.add_argument('--provider', action='append', default=None,
+                        help='OpenSSL provider to activate (repeatable)')
+    parser.add_argument('--sni', default=None, help='Server name for SNI/verification (default: host)')
+    parser.add_argument('--insecure', '-k', action='store_true',
+                        help='Do not verify the server certificate (self-signed lab certs)')
+    parser.add_argument('--cafile', default=None, help='CA bundle for verification')
+    parser.add_argument('--timeout', type=float, default=10.0,
+                        help='Per-phase timeout in seconds (default: 10)')
+    parser.add_argument('--test-name', default='tls_handshake',
+                        help='test_name recorded in results (group is appended)')
+    parser.add_argument('--output', '-o', default='results/handshake.jsonl',
+                        help='Output JSON Lines file (default: results/handshake.jsonl)')
+    parser.add_argument('--format', choices=['text', 'json'], default='text',
+                        help='Summary format')
+    parser.add_argument('--_group', dest='group', default=None, help=argparse.SUPPRESS)
+    
+    argv = sys.argv[1:]
+    args = parser.parse_args(argv)
+    
+    if args.connections < 1 or args.concurrency < 1 or args.warmup < 0:
+        parser.error("--connections/--concurrency must be positive, --warmup non-negative")
+    
+    try:
+        if args.group is not None:
+            # Worker for one group: OPENSSL_CONF was set by the parent
+            counts = run_group(args)
+            print(f"✓ {args.group or 'default'}: {counts['ok']} handshakes, {counts['failed']} failed",
+                  file=sys.stderr)
+            return
+        
+        output_dir = os.path.dirname(args.output)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        open(args.output, 'w').close()
+        
+        if args.groups:
+            for group in [g.strip() for g in args.groups.split(',') if g.strip()]:
+                if spawn_group(args, group, argv) != 0:
+                    print(f"ERROR: benchmark for group {group} failed", file=sys.stderr)
+        elif args.ciphersuites or args.provider:
+            # Default groups, but the config still has to select ciphersuites/providers
+            if spawn_group(args, None, argv) != 0:
+                print("ERROR: benchmark failed", file=sys.stderr)
+        else:
+            counts = run_group(args)
+            print(f"✓ {counts['ok']} handshakes, {counts['failed']} failed", file=sys.stderr)
+        
+        print(f"✓ Results written to {args.output}", file=sys.stderr)
+        
+        rows = summarize(args.output, load_calculate_stats())
+        if args.format == 'json':
+            print(json.dumps(rows, indent=2))
+        else:
+            print(format_summary(rows))
+    
+    except Exception as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,49 +7,540 @@ Calculates mean, median, std dev, min/max, percentiles
 
 import sys
 import json
-import statistics
-from typing import List, Dict, Any
+import math
+import time
+import re
+import zlib
+import base64
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Union
 
-def calculate_stats(data: List[float]) -> Dict[str, float]:
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from scipy import stats as scipy_stats
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# Percentiles reported by default (compare_datasets() always needs p95/p99)
+DEFAULT_PERCENTILES = [50, 90, 95, 99]
+
+
+def percentile_key(p: float) -> str:
+    """Result key for a percentile: 50 -> "p50", 99.9 -> "p99.9" """
+    return f"p{p:g}"
+
+
+def _moments(data) -> Dict[str, float]:
+    """
+    count/min/max/mean/variance without sorting
+    
+    Uses vectorised NumPy reductions when available, otherwise a single
+    Welford pass over the data.
+    """
+    if NUMPY_AVAILABLE:
+        n = len(data)
+        mean = float(np.mean(data))
+        deviations = data - mean
+        variance = float(np.dot(deviations, deviations) / (n - 1)) if n > 1 else 0.0
+        return {"count": n, "min": float(data.min()), "max": float(data.max()),
+                "mean": mean, "variance": variance}
+    
+    n = 0
+    mean = m2 = 0.0
+    lo = hi = None
+    for x in data:
+        n += 1
+        delta = x - mean
+        mean += delta / n
+        m2 += delta * (x - mean)
+        if lo is None or x < lo:
+            lo = x
+        if hi is None or x > hi:
+            hi = x
+    return {"count": n, "min": lo, "max": hi, "mean": mean,
+            "variance": m2 / (n - 1) if n > 1 else 0.0}
+
+
+def select_percentiles(data, percentiles: Sequence[float]) -> Dict[float, float]:
+    """
+    Percentiles by selection instead of a full sort
+    
+    Only the order statistics that percentile()'s linear interpolation
+    needs are placed with numpy.partition (O(n) on average), and the
+    interpolation is then done exactly as in percentile(), so the results
+    are identical to percentile(sorted(data), p).
+    """
+    for p in percentiles:
+        if not 0 <= p <= 100:
+            raise ValueError("Percentile must be between 0 and 100")
+    
+    n = len(data)
+    if n == 0:
+        raise ValueError("Empty dataset")
+    
+    if not NUMPY_AVAILABLE:
+        sorted_data = sorted(data)
+        return {p: percentile(sorted_data, p) for p in percentiles}
+    
+    ranks = {}
+    kth = set()
+    for p in percentiles:
+        rank = (p / 100) * (n - 1)
+        lower = int(rank)
+        ranks[p] = (rank, lower)
+        kth.add(lower)
+        if lower + 1 < n:
+            kth.add(lower + 1)
+    
+    partitioned = np.partition(data, sorted(kth))
+    
+    result = {}
+    for p, (rank, lower) in ranks.items():
+        upper = lower + 1
+        if n == 1 or upper >= n:
+            result[p] = float(partitioned[min(lower, n - 1)])
+            continue
+        weight = rank - lower
+        result[p] = float(partitioned[lower]) * (1 - weight) + float(partitioned[upper]) * weight
+    return result
+
+
+# Refuse coordinated-omission back-fills larger than this many samples
+CO_MAX_BACKFILL = 50_000_000
+
+
+def backfill_coordinated_omission(values, expected_interval: float):
+    """
+    Samples a closed-loop recorder missed while a request stalled
+    
+    HdrHistogram-style correction: a value v of at least twice the expected
+    inter-request interval i means the requests that would have been sent
+    during the stall were never issued; they would have seen v - i,
+    v - 2i, ... down to i. Generated for all values at once with
+    repeat/arange index arithmetic.
+    
+    Args:
+        values: Recorded latencies (array-like)
+        expected_interval: Expected time between requests (same unit)
+    
+    Returns:
+        (extra values, index of the recorded value each one belongs to)
+    """
+    if expected_interval <= 0:
+        raise ValueError("expected_interval must be positive")
+    
+    values = np.asarray(values, dtype=np.float64)
+    owners = np.flatnonzero(values >= 2 * expected_interval)
+    stalled = values[owners]
+    missing = np.floor(stalled / expected_interval).astype(np.int64) - 1
+    total = int(missing.sum())
+    if total > CO_MAX_BACKFILL:
+        raise ValueError(f"Coordinated-omission correction would add {total} samples; "
+                         f"is the expected interval ({expected_interval}) too small?")
+    
+    # k-th missing sample (1-based) of each stalled value
+    offsets = np.repeat(np.cumsum(missing) - missing, missing)
+    k = np.arange(total) - offsets + 1
+    return np.repeat(stalled, missing) - k * expected_interval, np.repeat(owners, missing)
+
+
+HISTOGRAM_FORMAT = "hdr-histogram"
+HISTOGRAM_VERSION = 1
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-bucketed histogram of latency values
+    
+    Values are quantised to integer multiples of `lowest` (the smallest
+    distinguishable value, e.g. 0.001 ms = 1 us) and counted in a fixed
+    int64 array. Each power-of-two range is split into 2^ceil(log2(2*10^d))/2
+    linear sub-buckets, so every bucket is narrower than 1/10^d of the
+    values it holds.
+    
+    Error bound: a reported percentile is within a relative error of
+    10^-d (d = significant_digits, 0.1% by default) of the exact order
+    statistic, or within `lowest` for values below lowest * 10^d; mean
+    and stdev are computed from bucket midpoints with the same bound.
+    min/max are exact. Values above `highest` are clamped and counted in
+    `clamped`.
+    
+    Memory is fixed by (d, highest/lowest): ~24K counters (~190 KB) for
+    3 digits over 1 us .. 1 h, independent of the sample count. The
+    serialized form (to_dict) zlib-compresses the counts, which are mostly
+    zero, to a few KB (~10 KB for latencies spread over three decades). Histograms with the same configuration merge by
+    adding counts, so per-run or per-worker histograms combine exactly.
+    
+    Accepted by calculate_stats() and compare_datasets() in place of a
+    list of values.
+    """
+    
+    def __init__(self, significant_digits: int = 3, lowest: float = 0.001,
+                 highest: float = 3_600_000.0):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("numpy is required for LatencyHistogram")
+        if not 1 <= significant_digits <= 5:
+            raise ValueError("significant_digits must be between 1 and 5")
+        if not 0 < lowest < highest:
+            raise ValueError("Need 0 < lowest < highest")
+        
+        self.significant_digits = significant_digits
+        self.lowest = lowest
+        self.highest = highest
+        
+        self._sub_bucket_count_magnitude = math.ceil(math.log2(2 * 10 ** significant_digits))
+        self._sub_bucket_half_count_magnitude = self._sub_bucket_count_magnitude - 1
+        self._sub_bucket_count = 1 << self._sub_bucket_count_magnitude
+        self._sub_bucket_half_count = self._sub_bucket_count >> 1
+        self._sub_bucket_mask = self._sub_bucket_count - 1
+        self._highest_unit = math.ceil(highest / lowest)
+        
+        bucket_count = 1
+        smallest_untrackable = self._sub_bucket_count
+        while smallest_untrackable <= self._highest_unit:
+            smallest_untrackable <<= 1
+            bucket_count += 1
+        
+        self.counts = np.zeros((bucket_count + 1) * self._sub_bucket_half_count, dtype=np.int64)
+        self.total = 0
+        self.clamped = 0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def __len__(self):
+        return self.total
+    
+    def _indexes(self, units):
+        """Counts-array index for integer unit values (vectorised)"""
+        # Bit length of (v | mask) via the float exponent (exact below 2^53)
+        pow2ceiling = np.frexp((units | self._sub_bucket_mask).astype(np.float64))[1]
+        bucket = pow2ceiling - (self._sub_bucket_half_count_magnitude + 1)
+        sub_bucket = units >> bucket
+        return ((bucket + 1) << self._sub_bucket_half_count_magnitude) + (
+            sub_bucket - self._sub_bucket_half_count)
+    
+    def _bucket_bounds(self, indexes):
+        """(lowest equivalent unit value, bucket width in units) per counts index"""
+        indexes = np.asarray(indexes, dtype=np.int64)
+        bucket = (indexes >> self._sub_bucket_half_count_magnitude) - 1
+        sub_bucket = (indexes & (self._sub_bucket_half_count - 1)) + self._sub_bucket_half_count
+        first = bucket < 0
+        sub_bucket = np.where(first, sub_bucket - self._sub_bucket_half_count, sub_bucket)
+        bucket = np.where(first, 0, bucket)
+        return sub_bucket << bucket, np.left_shift(1, bucket)
+    
+    def _same_layout(self, other: "LatencyHistogram") -> bool:
+        return (self.significant_digits, self.lowest, self.highest) == (
+            other.significant_digits, other.lowest, other.highest)
+    
+    def record_values(self, values):
+        """Record a batch of values (array-like, in the same unit as lowest/highest)"""
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        if np.any(values < 0):
+            raise ValueError("LatencyHistogram values must be non-negative")
+        
+        units = np.rint(values / self.lowest).astype(np.int64)
+        over = units > self._highest_unit
+        if over.any():
+            self.clamped += int(np.count_nonzero(over))
+            units = np.minimum(units, self._highest_unit)
+        
+        self.counts += np.bincount(self._indexes(units), minlength=len(self.counts))
+        self.total += int(values.size)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+    
+    def record(self, value: float, count: int = 1):
+        """Record one value (optionally several times)"""
+        self.record_values(np.full(count, value, dtype=np.float64))
+    
+    def record_counts(self, values, counts):
+        """Record each of `values` counts[i] times (vectorised)"""
+        values = np.asarray(values, dtype=np.float64)
+        counts = np.asarray(counts, dtype=np.int64)
+        if values.size == 0:
+            return
+        if np.any(values < 0):
+            raise ValueError("LatencyHistogram values must be non-negative")
+        
+        units = np.rint(values / self.lowest).astype(np.int64)
+        over = units > self._highest_unit
+        if over.any():
+            self.clamped += int(counts[over].sum())
+            units = np.minimum(units, self._highest_unit)
+        
+        self.counts += np.bincount(self._indexes(units), weights=counts,
+                                   minlength=len(self.counts)).astype(np.int64)
+        self.total += int(counts.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+    
+    def copy(self) -> "LatencyHistogram":
+        histogram = LatencyHistogram(self.significant_digits, self.lowest, self.highest)
+        histogram.counts = self.counts.copy()
+        histogram.total = self.total
+        histogram.clamped = self.clamped
+        histogram.min = self.min
+        histogram.max = self.max
+        return histogram
+    
+    def corrected(self, expected_interval: float) -> "LatencyHistogram":
+        """
+        Copy with coordinated-omission back-fill (see backfill_coordinated_omission)
+        
+        Each bucket is corrected as if all its samples had the bucket's
+        midpoint value, so the back-fill is computed once per bucket.
+        """
+        histogram = self.copy()
+        values, counts = self.buckets()
+        extra, owners = backfill_coordinated_omission(values, expected_interval)
+        histogram.record_counts(extra, counts[owners])
+        return histogram
+    
+    @classmethod
+    def from_values(cls, values, **options) -> "LatencyHistogram":
+        """Build a histogram from a list/array of values"""
+        histogram = cls(**options)
+        histogram.record_values(values)
+        return histogram
+    
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Add another histogram's counts (same configuration required); returns self"""
+        if not self._same_layout(other):
+            raise ValueError("Cannot merge histograms with different significant_digits/lowest/highest")
+        self.counts += other.counts
+        self.total += other.total
+        self.clamped += other.clamped
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+    
+    def buckets(self):
+        """
+        Non-empty buckets as (values, counts) arrays
+        
+        Values are bucket midpoints clamped to the exact min/max, in
+        ascending order.
+        """
+        indexes = np.flatnonzero(self.counts)
+        low, width = self._bucket_bounds(indexes)
+        values = (low + (width - 1) / 2) * self.lowest
+        return np.clip(values, self.min, self.max), self.counts[indexes]
+    
+    def mean(self) -> float:
+        if self.total == 0:
+            raise ValueError("Empty dataset")
+        values, counts = self.buckets()
+        return float(np.dot(values, counts) / self.total)
+    
+    def variance(self) -> float:
+        """Sample variance (n - 1 denominator, like calculate_stats)"""
+        if self.total == 0:
+            raise ValueError("Empty dataset")
+        if self.total == 1:
+            return 0.0
+        values, counts = self.buckets()
+        deviations = values - np.dot(values, counts) / self.total
+        return float(np.dot(deviations * deviations, counts) / (self.total - 1))
+    
+    def stdev(self) -> float:
+        return math.sqrt(self.variance())
+    
+    def percentiles(self, percentiles: Sequence[float]) -> Dict[float, float]:
+        """
+        Values at the given percentiles (0-100)
+        
+        Like HdrHistogram, returns the highest value equivalent to the
+        bucket holding the sample of rank ceil(p/100 * total), clamped to
+        the exact min/max.
+        """
+        if self.total == 0:
+            raise ValueError("Empty dataset")
+        
+        cumulative = np.cumsum(self.counts)
+        result = {}
+        for p in percentiles:
+            if not 0 <= p <= 100:
+                raise ValueError("Percentile must be between 0 and 100")
+            result[p] = self._value_at_rank(cumulative, max(math.ceil(p / 100 * self.total), 1))
+        return result
+    
+    def value_at_rank(self, rank: int) -> float:
+        """Value of the sample of (1-based) rank, as percentiles()"""
+        if not 1 <= rank <= self.total:
+            raise ValueError("Rank out of range")
+        return self._value_at_rank(np.cumsum(self.counts), rank)
+    
+    def _value_at_rank(self, cumulative: np.ndarray, rank: int) -> float:
+        index = int(np.searchsorted(cumulative, rank))
+        low, width = self._bucket_bounds([index])
+        value = float(low[0] + width[0] - 1) * self.lowest
+        return min(max(value, self.min), self.max)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form (counts as base64 of zlib-compressed int64 LE)"""
+        return {
+            "format": HISTOGRAM_FORMAT,
+            "version": HISTOGRAM_VERSION,
+            "significant_digits": self.significant_digits,
+            "lowest": self.lowest,
+            "highest": self.highest,
+            "total": self.total,
+            "clamped": self.clamped,
+            "min": self.min if self.total else None,
+            "max": self.max if self.total else None,
+            "counts": base64.b64encode(zlib.compress(self.counts.astype('<i8').tobytes(), 9)).decode('ascii'),
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        if data.get("format") != HISTOGRAM_FORMAT or data.get("version") != HISTOGRAM_VERSION:
+            raise ValueError(f"Not a {HISTOGRAM_FORMAT} v{HISTOGRAM_VERSION} document")
+        
+        histogram = cls(data["significant_digits"], data["lowest"], data["highest"])
+        counts = np.frombuffer(zlib.decompress(base64.b64decode(data["counts"])), dtype='<i8')
+        if len(counts) != len(histogram.counts):
+            raise ValueError("Histogram counts do not match its configuration")
+        histogram.counts = counts.astype(np.int64)
+        histogram.total = int(data["total"])
+        histogram.clamped = int(data["clamped"])
+        if histogram.total:
+            histogram.min = float(data["min"])
+            histogram.max = float(data["max"])
+        return histogram
+    
+    @staticmethod
+    def is_serialized(data: Any) -> bool:
+        return isinstance(data, dict) and data.get("format") == HISTOGRAM_FORMAT
+
+
+def _histogram_stats(histogram: LatencyHistogram,
+                     percentiles: Sequence[float]) -> Dict[str, float]:
+    """calculate_stats() for a LatencyHistogram"""
+    selected = histogram.percentiles(sorted(set(percentiles) | {50}))
+    mean = histogram.mean()
+    variance = histogram.variance()
+    stdev = math.sqrt(variance)
+    
+    stats = {
+        "count": histogram.total,
+        "min": histogram.min,
+        "max": histogram.max,
+        "mean": mean,
+        "median": selected[50],
+        "stdev": stdev,
+        "variance": variance,
+    }
+    for p in percentiles:
+        stats[percentile_key(p)] = selected[p]
+    stats["range"] = histogram.max - histogram.min
+    stats["cv"] = (stdev / mean * 100) if mean != 0 else 0.0
+    return stats
+
+
+def coordinated_omission_stats(data: Union[List[float], LatencyHistogram],
+                               expected_interval: float,
+                               percentiles: Optional[Sequence[float]] = None) -> Dict[str, Any]:
+    """
+    Statistics of a latency series after coordinated-omission correction
+    
+    Returns:
+        calculate_stats() of the corrected series, plus "expected_interval"
+        and "added_samples"
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("numpy is required for coordinated-omission correction")
+    
+    if isinstance(data, LatencyHistogram):
+        corrected = data.corrected(expected_interval)
+        added = corrected.total - data.total
+    else:
+        data = np.asarray(data, dtype=np.float64)
+        extra, _ = backfill_coordinated_omission(data, expected_interval)
+        corrected = np.concatenate([data, extra])
+        added = len(extra)
+    
+    return {"expected_interval": expected_interval, "added_samples": added,
+            **calculate_stats(corrected, percentiles)}
+
+
+def calculate_stats(data: Union[List[float], LatencyHistogram],
+                    percentiles: Optional[Sequence[float]] = None,
+                    expected_interval: Optional[float] = None) -> Dict[str, Any]:
     """
     Calculate comprehensive statistics for a dataset
     
+    Moments are computed once without sorting and percentiles by
+    selection (see select_percentiles), so the cost is linear in the
+    sample count.
+    
     Args:
-        data: List of numeric values (e.g., latencies in ms)
+        data: List (or NumPy array) of numeric values (e.g., latencies in ms),
+            or a LatencyHistogram (statistics carry its error bound)
+        percentiles: Percentiles to report (default: 50, 90, 95, 99)
+        expected_interval: Expected time between requests of the tool that
+            recorded the data (closed-loop tools such as ab). If set, the
+            result also holds "coordinated_omission": the same statistics
+            after back-filling the samples stalls suppressed
     
     Returns:
         Dictionary with statistical measures
     """
-    if not data:
+    if len(data) == 0:
         raise ValueError("Empty dataset")
     
-    sorted_data = sorted(data)
-    n = len(sorted_data)
+    if percentiles is None:
+        percentiles = DEFAULT_PERCENTILES
     
-    return {
+    if expected_interval is not None:
+        stats = calculate_stats(data, percentiles)
+        stats["coordinated_omission"] = coordinated_omission_stats(data, expected_interval, percentiles)
+        return stats
+    
+    if isinstance(data, LatencyHistogram):
+        return _histogram_stats(data, percentiles)
+    
+    if NUMPY_AVAILABLE:
+        data = np.asarray(data, dtype=np.float64)
+    
+    moments = _moments(data)
+    n = moments["count"]
+    stdev = math.sqrt(moments["variance"]) if n > 1 else 0.0
+    
+    selected = select_percentiles(data, sorted(set(percentiles) | {50}))
+    
+    stats = {
         # Basic statistics
         "count": n,
-        "min": min(sorted_data),
-        "max": max(sorted_data),
-        "mean": statistics.mean(sorted_data),
-        "median": statistics.median(sorted_data),
+        "min": moments["min"],
+        "max": moments["max"],
+        "mean": moments["mean"],
+        "median": selected[50],
         
         # Dispersion measures
-        "stdev": statistics.stdev(sorted_data) if n > 1 else 0.0,
-        "variance": statistics.variance(sorted_data) if n > 1 else 0.0,
-        
-        # Percentiles
-        "p50": percentile(sorted_data, 50),
-        "p90": percentile(sorted_data, 90),
-        "p95": percentile(sorted_data, 95),
-        "p99": percentile(sorted_data, 99),
-        
-        # Range
-        "range": max(sorted_data) - min(sorted_data),
-        
-        # Coefficient of variation (normalized std dev)
-        "cv": (statistics.stdev(sorted_data) / statistics.mean(sorted_data) * 100) if statistics.mean(sorted_data) != 0 else 0.0
+        "stdev": stdev,
+        "variance": moments["variance"],
     }
+    
+    # Percentiles
+    for p in percentiles:
+        stats[percentile_key(p)] = selected[p]
+    
+    # Range
+    stats["range"] = moments["max"] - moments["min"]
+    
+    # Coefficient of variation (normalized std dev)
+    stats["cv"] = (stdev / moments["mean"] * 100) if moments["mean"] != 0 else 0.0
+    
+    return stats
 
 
 def percentile(sorted_data: List[float], p: float) -> float:
@@ -85,26 +576,222 @@ def percentile(sorted_data: List[float], p: float) -> float:
     return sorted_data[lower] * (1 - weight) + sorted_data[upper] * weight
 
 
-def compare_datasets(baseline: List[float], treatment: List[float]) -> Dict[str, Any]:
+# Statistics whose treatment - baseline differences get bootstrap intervals
+BOOTSTRAP_STATISTICS = ("mean", "median", "p95", "p99")
+# Upper bound on index/count matrix elements per resample block (~32 MB)
+BOOTSTRAP_BLOCK_ELEMENTS = 1 << 22
+# Larger samples resample the mean from at most this many distinct values...
+BOOTSTRAP_MEAN_SUPPORT = 1024
+# Samples up to this size are resampled with full index matrices. Both
+# methods cost O(resamples) times n or the support size respectively, so
+# the index path is only cheaper while n stays within the support
+BOOTSTRAP_INDEX_LIMIT = BOOTSTRAP_MEAN_SUPPORT
+# ...binning them at this relative width when there are more
+BOOTSTRAP_MEAN_BIN_PRECISION = 1e-2
+
+_bootstrap_supports = None
+
+
+def _bootstrap_support(data) -> tuple:
+    """
+    Prepare one sample for resampling
+    
+    Returns ("index", data, None, None) for samples up to
+    BOOTSTRAP_INDEX_LIMIT: each resample is a row of an index matrix.
+    
+    Larger samples and LatencyHistograms return ("order-statistics",
+    (distinct values, cumulative counts), mean values, mean counts). A
+    resample's k-th order statistic is the value of sorted rank floor(n*U)
+    with U the k-th order statistic of n uniforms, which is Beta
+    distributed, so percentiles are resampled exactly in O(1) each. The
+    mean is a multinomial draw of counts over the distinct values; past
+    BOOTSTRAP_MEAN_SUPPORT of them, values are pooled into bins of 1%
+    relative width represented by their mean, which keeps the mean exact
+    and changes its resampling variance by well under 0.1%.
+    """
+    if isinstance(data, LatencyHistogram):
+        values, counts = data.buckets()
+    else:
+        data = np.asarray(data, dtype=np.float64)
+        if len(data) <= BOOTSTRAP_INDEX_LIMIT:
+            return "index", data, None, None
+        values, counts = np.unique(data, return_counts=True)
+    
+    ordered = (values, np.cumsum(counts))
+    if len(values) > BOOTSTRAP_MEAN_SUPPORT:
+        if values[0] > 0:
+            keys = np.floor(np.log(values / values[0]) / math.log1p(BOOTSTRAP_MEAN_BIN_PRECISION))
+        else:
+            keys = np.floor((values - values[0]) / (values[-1] - values[0]) * BOOTSTRAP_MEAN_SUPPORT)
+        _, bins = np.unique(keys.astype(np.int64), return_inverse=True)
+        bin_counts = np.bincount(bins, weights=counts)
+        values = np.bincount(bins, weights=values * counts) / bin_counts
+        counts = bin_counts.astype(np.int64)
+    return "order-statistics", ordered, values, counts
+
+
+def _resample_statistics(support: tuple, size: int, rng) -> "np.ndarray":
+    """
+    Draw `size` bootstrap resamples of one support
+    
+    Returns:
+        Array of shape (len(BOOTSTRAP_STATISTICS), size)
+    """
+    method, data, values, counts = support
+    if method == "index":
+        n = len(data)
+        sample = data[rng.integers(0, n, size=(size, n))]
+        return np.vstack([sample.mean(axis=1), np.percentile(sample, [50, 95, 99], axis=1)])
+    
+    distinct, cumulative = data
+    n = int(cumulative[-1])
+    
+    def order_statistic(u):
+        # Value at 0-based sorted rank floor(n * u)
+        ranks = np.minimum((u * n).astype(np.int64), n - 1)
+        return distinct[np.searchsorted(cumulative, ranks, side='right')]
+    
+    rows = [rng.multinomial(n, counts / n, size=size) @ values / n]
+    for p in (50, 95, 99):
+        # Linear interpolation between 1-based order statistics k and k + 1
+        rank = (p / 100) * (n - 1)
+        k = int(rank) + 1
+        low_u = rng.beta(k, n - k + 1, size=size)
+        if k < n:
+            high_u = low_u + (1 - low_u) * rng.beta(1, n - k, size=size)
+        else:
+            high_u = low_u
+        low = order_statistic(low_u)
+        high = order_statistic(high_u)
+        rows.append(low + (high - low) * (rank - (k - 1)))
+    return np.vstack(rows)
+
+
+def _init_bootstrap_worker(supports):
+    global _bootstrap_supports
+    _bootstrap_supports = supports
+
+
+def _bootstrap_block(task) -> tuple:
+    """Resample both sides for one block (seeded independently of the worker)"""
+    seed_sequence, size = task
+    baseline_seed, treatment_seed = seed_sequence.spawn(2)
+    baseline_support, treatment_support = _bootstrap_supports
+    return (_resample_statistics(baseline_support, size, np.random.default_rng(baseline_seed)),
+            _resample_statistics(treatment_support, size, np.random.default_rng(treatment_seed)))
+
+
+def bootstrap_differences(baseline, treatment, resamples: int = 1000,
+                          confidence: float = 0.95, seed: Optional[int] = None,
+                          workers: int = 1) -> Dict[str, Any]:
+    """
+    Percentile bootstrap confidence intervals for treatment - baseline differences
+    
+    Both samples are resampled independently in blocks; each block draws a
+    whole matrix of resamples at once (index rows or multinomial counts,
+    see _bootstrap_support) and reduces it to mean/median/p95/p99 per row.
+    Blocks get their own seeds spawned from `seed`, so results are the same
+    for any number of workers.
+    
+    Args:
+        baseline: Baseline measurements
+        treatment: Treatment measurements
+        resamples: Number of bootstrap resamples
+        confidence: Confidence level of the intervals (e.g. 0.95)
+        seed: RNG seed (None for a fresh one)
+        workers: Processes to spread the blocks over
+    
+    Returns:
+        Dictionary with settings, per-side method and "intervals"
+        ({"mean_diff": [low, high], "mean_diff_pct": [low, high], ...})
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("numpy is required for bootstrap confidence intervals")
+    if resamples < 1:
+        raise ValueError("resamples must be positive")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    if len(baseline) == 0 or len(treatment) == 0:
+        raise ValueError("Empty dataset")
+    
+    supports = (_bootstrap_support(baseline), _bootstrap_support(treatment))
+    width = max(len(data) if method == "index" else len(values)
+                for method, data, values, _ in supports)
+    block_size = max(1, min(resamples, BOOTSTRAP_BLOCK_ELEMENTS // width))
+    
+    sizes = [block_size] * (resamples // block_size)
+    if resamples % block_size:
+        sizes.append(resamples % block_size)
+    seed_sequence = np.random.SeedSequence(seed)
+    tasks = list(zip(seed_sequence.spawn(len(sizes)), sizes))
+    
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks)),
+                                 initializer=_init_bootstrap_worker,
+                                 initargs=(supports,)) as executor:
+            blocks = list(executor.map(_bootstrap_block, tasks))
+    else:
+        _init_bootstrap_worker(supports)
+        blocks = [_bootstrap_block(task) for task in tasks]
+    
+    baseline_stats = np.hstack([b for b, _ in blocks])
+    treatment_stats = np.hstack([t for _, t in blocks])
+    differences = treatment_stats - baseline_stats
+    with np.errstate(divide='ignore', invalid='ignore'):
+        relative = differences / baseline_stats * 100
+    relative[~np.isfinite(relative)] = np.nan
+    
+    tail = (1 - confidence) / 2 * 100
+    bounds = [tail, 100 - tail]
+    intervals = {}
+    for row, name in enumerate(BOOTSTRAP_STATISTICS):
+        intervals[f"{name}_diff"] = [float(v) for v in np.percentile(differences[row], bounds)]
+        if np.isnan(relative[row]).all():
+            intervals[f"{name}_diff_pct"] = [float('nan'), float('nan')]
+        else:
+            intervals[f"{name}_diff_pct"] = [float(v) for v in np.nanpercentile(relative[row], bounds)]
+    
+    return {
+        "resamples": resamples,
+        "confidence": confidence,
+        "seed": seed_sequence.entropy if seed is None else seed,
+        "method": {"baseline": supports[0][0], "treatment": supports[1][0]},
+        "intervals": intervals,
+    }
+
+
+def compare_datasets(baseline: List[float], treatment: List[float],
+                     percentiles: Optional[Sequence[float]] = None,
+                     bootstrap: int = 0, confidence: float = 0.95,
+                     seed: Optional[int] = None, workers: int = 1) -> Dict[str, Any]:
     """
     Compare two datasets and calculate differences
     
     Args:
         baseline: Baseline measurements (e.g., classical TLS)
         treatment: Treatment measurements (e.g., PQC hybrid)
+        percentiles: Extra percentiles to report (p95/p99 are always included)
+        bootstrap: Number of bootstrap resamples for confidence intervals
+            of the differences (0 = none)
+        confidence: Confidence level of the bootstrap intervals
+        seed: Bootstrap RNG seed
+        workers: Processes for the bootstrap
     
     Returns:
-        Dictionary with comparison metrics
+        Dictionary with comparison metrics; with bootstrap, "comparison"
+        also holds <stat>_diff_ci / <stat>_diff_pct_ci intervals and
+        "bootstrap" describes how they were computed
     """
-    baseline_stats = calculate_stats(baseline)
-    treatment_stats = calculate_stats(treatment)
+    percentiles = sorted(set(DEFAULT_PERCENTILES) | set(percentiles or []))
+    baseline_stats = calculate_stats(baseline, percentiles)
+    treatment_stats = calculate_stats(treatment, percentiles)
     
     def percent_change(old, new):
         if old == 0:
             return float('inf') if new != 0 else 0.0
         return ((new - old) / old) * 100
     
-    return {
+    comparison = {
         "baseline": baseline_stats,
         "treatment": treatment_stats,
         "comparison": {
@@ -121,6 +808,389 @@ def compare_datasets(baseline: List[float], treatment: List[float]) -> Dict[str,
             "p99_diff_pct": percent_change(baseline_stats["p99"], treatment_stats["p99"]),
         }
     }
+    
+    if bootstrap:
+        result = bootstrap_differences(baseline, treatment, bootstrap,
+                                       confidence, seed, workers)
+        for name, interval in result.pop("intervals").items():
+            comparison["comparison"][f"{name}_ci"] = interval
+        comparison["bootstrap"] = result
+    
+    return comparison
+
+
+CORRECTION_METHODS = ("holm", "fdr_bh", "bonferroni", "none")
+
+
+def adjust_pvalues(pvalues, method: str = "holm") -> "np.ndarray":
+    """
+    Multiple-comparison adjusted p-values
+    
+    Args:
+        pvalues: Raw p-values (NaN entries are left out of the family)
+        method: "holm" (step-down, controls FWER), "fdr_bh"
+            (Benjamini-Hochberg, controls FDR), "bonferroni" or "none"
+    
+    Returns:
+        Adjusted p-values in the input order
+    """
+    if method not in CORRECTION_METHODS:
+        raise ValueError(f"Unknown correction method: {method}")
+    
+    pvalues = np.asarray(pvalues, dtype=np.float64)
+    adjusted = np.full_like(pvalues, np.nan)
+    valid = ~np.isnan(pvalues)
+    p = pvalues[valid]
+    m = len(p)
+    if m == 0 or method == "none":
+        adjusted[valid] = p
+        return adjusted
+    
+    if method == "bonferroni":
+        adjusted[valid] = np.minimum(p * m, 1.0)
+        return adjusted
+    
+    order = np.argsort(p, kind="stable")
+    ranked = p[order]
+    if method == "holm":
+        steps = np.maximum.accumulate(ranked * (m - np.arange(m)))
+    else:
+        steps = np.minimum.accumulate((ranked * m / np.arange(1, m + 1))[::-1])[::-1]
+    result = np.empty(m)
+    result[order] = np.minimum(steps, 1.0)
+    adjusted[valid] = result
+    return adjusted
+
+
+def group_metric_values(records: List[Dict[str, Any]], metrics: Optional[Sequence[str]],
+                        group_by: Sequence[str]) -> Dict[tuple, Dict[str, List[float]]]:
+    """
+    Collect numeric metric values per group in one pass over the records
+    
+    Args:
+        records: Result records (e.g. one dict per test run)
+        metrics: Fields to collect (None = every numeric field not in group_by)
+        group_by: Fields forming the group key (e.g. ["test_name"])
+    
+    Returns:
+        {group key tuple: {metric: [values]}}
+    """
+    groups = {}
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        key = tuple(record.get(field) for field in group_by)
+        series = groups.setdefault(key, {})
+        fields = metrics if metrics is not None else [f for f in record if f not in group_by]
+        for metric in fields:
+            value = record.get(metric)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                series.setdefault(metric, []).append(value)
+    return groups
+
+
+def _mann_whitney_batch(samples: List[tuple]) -> tuple:
+    """
+    Two-sided Mann-Whitney U tests of treatment vs baseline for many pairs
+    
+    Pairs with the same sample sizes are stacked and tested in one call
+    along axis 1. scipy picks the exact method for small samples without
+    ties, so small pairs are also grouped by whether they have ties, which
+    keeps every p-value identical to a separate call per pair.
+    
+    Args:
+        samples: [(baseline array, treatment array)]
+    
+    Returns:
+        (U statistics, p-values) as arrays in pair order
+    """
+    shapes: Dict[tuple, List[int]] = {}
+    for i, (b, t) in enumerate(samples):
+        key = (len(b), len(t))
+        if min(key) <= 8:
+            key += (len(np.unique(np.concatenate([b, t]))) < len(b) + len(t),)
+        shapes.setdefault(key, []).append(i)
+    
+    u = np.empty(len(samples))
+    p = np.empty(len(samples))
+    for members in shapes.values():
+        result = scipy_stats.mannwhitneyu(np.stack([samples[i][1] for i in members]),
+                                          np.stack([samples[i][0] for i in members]),
+                                          alternative='two-sided', axis=1)
+        u[members] = result.statistic
+        p[members] = result.pvalue
+    return u, p
+
+
+# Tests batch_compare() can base "significant" on
+SIGNIFICANCE_TESTS = ("welch", "mannwhitney")
+
+
+def batch_compare(baseline_records: List[Dict[str, Any]],
+                  treatment_records: List[Dict[str, Any]],
+                  metrics: Optional[Sequence[str]] = None,
+                  group_by: Sequence[str] = ("test_name",),
+                  correction: str = "holm", alpha: float = 0.05,
+                  percentiles: Optional[Sequence[float]] = None,
+                  test: str = "welch") -> Dict[str, Any]:
+    """
+    Compare every (group, metric) pair of two record sets at once
+    
+    Each pair gets the compare_datasets() result plus a Welch t-test and a
+    Mann-Whitney U test. The Welch tests for all pairs are evaluated in one
+    vectorised call from the per-pair moments, the Mann-Whitney tests in
+    one call per distinct pair of sample sizes; p-values of each test are
+    then corrected across the whole family of pairs.
+    
+    "significant" comes from the chosen test alone, so the correction's
+    familywise error / FDR guarantee holds at alpha; the other test is
+    reported for information only.
+    
+    Args:
+        baseline_records: Baseline result records
+        treatment_records: Treatment result records
+        metrics: Metric fields to compare (None = all numeric fields)
+        group_by: Fields identifying a test group
+        correction: Multiple-comparison correction (see adjust_pvalues)
+        alpha: Significance level applied to the adjusted p-values
+        percentiles: Extra percentiles for the per-pair statistics
+        test: Test deciding significance: "welch" or "mannwhitney"
+    
+    Returns:
+        Dictionary with settings and one "results" entry per pair
+    """
+    if not SCIPY_AVAILABLE or not NUMPY_AVAILABLE:
+        raise RuntimeError("scipy and numpy are required for batch comparisons")
+    if test not in SIGNIFICANCE_TESTS:
+        raise ValueError(f"Unknown significance test: {test}")
+    
+    baseline_groups = group_metric_values(baseline_records, metrics, group_by)
+    treatment_groups = group_metric_values(treatment_records, metrics, group_by)
+    
+    pairs = []
+    for key in sorted(baseline_groups.keys() & treatment_groups.keys(), key=str):
+        common = baseline_groups[key].keys() & treatment_groups[key].keys()
+        ordered = [m for m in metrics if m in common] if metrics is not None else sorted(common)
+        for metric in ordered:
+            pairs.append((key, metric,
+                          np.asarray(baseline_groups[key][metric], dtype=np.float64),
+                          np.asarray(treatment_groups[key][metric], dtype=np.float64)))
+    
+    if not pairs:
+        raise ValueError("No (group, metric) pairs present in both datasets")
+    
+    comparisons = [compare_datasets(b, t, percentiles) for _, _, b, t in pairs]
+    
+    def column(side, field):
+        return np.array([c[side][field] for c in comparisons], dtype=np.float64)
+    
+    # Welch t-test for all pairs in one call; undefined with fewer than 2 samples
+    with np.errstate(divide='ignore', invalid='ignore'):
+        welch = scipy_stats.ttest_ind_from_stats(
+            column("treatment", "mean"), column("treatment", "stdev"), column("treatment", "count"),
+            column("baseline", "mean"), column("baseline", "stdev"), column("baseline", "count"),
+            equal_var=False)
+    welch_t = np.asarray(welch.statistic, dtype=np.float64)
+    welch_p = np.asarray(welch.pvalue, dtype=np.float64)
+    too_small = (column("baseline", "count") < 2) | (column("treatment", "count") < 2)
+    welch_t[too_small] = np.nan
+    welch_p[too_small] = np.nan
+    
+    mw_u, mw_p = _mann_whitney_batch([(b, t) for _, _, b, t in pairs])
+    
+    welch_adjusted = adjust_pvalues(welch_p, correction)
+    mw_adjusted = adjust_pvalues(mw_p, correction)
+    decisive = welch_adjusted if test == "welch" else mw_adjusted
+    
+    def number(x):
+        return None if np.isnan(x) else float(x)
+    
+    results = []
+    for i, (key, metric, _, _) in enumerate(pairs):
+        results.append({
+            "group": dict(zip(group_by, key)),
+            "metric": metric,
+            **comparisons[i],
+            "welch": {"t": number(welch_t[i]), "p": number(welch_p[i]),
+                      "p_adjusted": number(welch_adjusted[i])},
+            "mann_whitney": {"u": float(mw_u[i]), "p": float(mw_p[i]),
+                             "p_adjusted": number(mw_adjusted[i])},
+            "significant": bool(decisive[i] < alpha),
+        })
+    
+    return {
+        "group_by": list(group_by),
+        "correction": correction,
+        "alpha": alpha,
+        "test": test,
+        "pairs": len(results),
+        "results": results,
+    }
+
+
+class StreamingStats:
+    """
+    Bounded-memory statistics for a stream of values fed in chunks
+    
+    count, min, max, mean and variance are exact (each chunk's moments are
+    merged with Chan et al.'s parallel formula); percentiles come from a
+    LatencyHistogram and carry its error bound. Negative values (which a
+    latency histogram cannot hold) go to a mirrored histogram of their
+    magnitudes, so any input plain calculate_stats() accepts works here.
+    """
+    
+    def __init__(self, significant_digits: int = 3, lowest: float = 0.001,
+                 highest: float = 3_600_000.0):
+        self.histogram = LatencyHistogram(significant_digits, lowest, highest)
+        self.negative = LatencyHistogram(significant_digits, lowest, highest)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+    
+    def update(self, values):
+        """Fold a chunk of values (NumPy array)"""
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        if n == 0:
+            return
+        
+        chunk_mean = float(values.mean())
+        deviations = values - chunk_mean
+        chunk_m2 = float(np.dot(deviations, deviations))
+        
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta * delta * self.count * n / total
+        self.count = total
+        
+        negative = values < 0
+        if negative.any():
+            self.negative.record_values(-values[negative])
+            values = values[~negative]
+        self.histogram.record_values(values)
+    
+    def stats(self, percentiles: Optional[Sequence[float]] = None) -> Dict[str, float]:
+        """Statistics in the calculate_stats() layout"""
+        if self.count == 0:
+            raise ValueError("Empty dataset")
+        
+        if percentiles is None:
+            percentiles = DEFAULT_PERCENTILES
+        
+        # Exact moments replace the histogram's bucket-midpoint estimates
+        if self.negative.total:
+            stats = self._signed_stats(percentiles)
+        else:
+            stats = _histogram_stats(self.histogram, percentiles)
+        variance = self.m2 / (self.count - 1) if self.count > 1 else 0.0
+        stdev = math.sqrt(variance)
+        
+        stats.update({
+            "mean": self.mean,
+            "stdev": stdev,
+            "variance": variance,
+            "cv": (stdev / self.mean * 100) if self.mean != 0 else 0.0,
+        })
+        return stats
+    
+    def _signed_stats(self, percentiles: Sequence[float]) -> Dict[str, float]:
+        """Order statistics over the negative and non-negative histograms"""
+        negative, positive = self.negative, self.histogram
+        
+        def value(rank: int) -> float:
+            if rank <= negative.total:
+                return -negative.value_at_rank(negative.total - rank + 1)
+            return positive.value_at_rank(rank - negative.total)
+        
+        low = -negative.max
+        high = positive.max if positive.total else -negative.min
+        stats = {
+            "count": self.count,
+            "min": low,
+            "max": high,
+            "median": value(max(math.ceil(0.5 * self.count), 1)),
+        }
+        for p in percentiles:
+            if not 0 <= p <= 100:
+                raise ValueError("Percentile must be between 0 and 100")
+            stats[percentile_key(p)] = value(max(math.ceil(p / 100 * self.count), 1))
+        stats["range"] = high - low
+        return stats
+
+
+def parse_values(text: bytes):
+    """
+    Numbers in whitespace-separated text (as read from stdin)
+    
+    Shared by --stdin and --stdin --stream, so both accept the same input.
+    """
+    if not NUMPY_AVAILABLE:
+        return [float(token) for token in text.split()]
+    return np.array(text.split(), dtype=np.float64)
+
+
+def iter_value_chunks(stream, block_size: int = 1 << 20):
+    """
+    Yield NumPy arrays of the numbers read from a binary stream
+    
+    Reads whatever input is available (up to block_size bytes) instead of
+    waiting for a full block, so it keeps up with a live pipe; a partial
+    last line is carried over to the next block.
+    """
+    read = getattr(stream, 'read1', stream.read)
+    pending = b""
+    while True:
+        block = read(block_size)
+        if not block:
+            break
+        block = pending + block
+        cut = block.rfind(b"\n") + 1
+        pending = block[cut:]
+        if cut:
+            values = parse_values(block[:cut])
+            if len(values):
+                yield values
+    
+    if pending.strip():
+        yield parse_values(pending)
+
+
+def stream_stats(stream, percentiles: Optional[Sequence[float]] = None,
+                 report_every: int = 0, report_interval: float = 0.0,
+                 on_report=None, streaming: Optional[StreamingStats] = None,
+                 **histogram_options) -> Dict[str, float]:
+    """
+    Compute statistics over a stream of newline-separated values
+    
+    Memory stays bounded by the histogram and one input block. When
+    report_every (samples) or report_interval (seconds) is set, on_report
+    is called with the current statistics after the chunk that crosses
+    each threshold. Pass `streaming` to fold into an existing
+    StreamingStats (e.g. to keep its histogram afterwards).
+    
+    Returns:
+        Final statistics (calculate_stats() layout)
+    """
+    if streaming is None:
+        streaming = StreamingStats(**histogram_options)
+    next_count = report_every
+    next_time = time.monotonic() + report_interval
+    
+    for values in iter_value_chunks(stream):
+        streaming.update(values)
+        
+        due = False
+        if report_every and streaming.count >= next_count:
+            next_count = (streaming.count // report_every + 1) * report_every
+            due = True
+        if report_interval and time.monotonic() >= next_time:
+            next_time = time.monotonic() + report_interval
+            due = True
+        if due and on_report is not None:
+            on_report(streaming.stats(percentiles))
+    
+    return streaming.stats(percentiles)
 
 
 def parse_apache_bench_output(output: str) -> List[float]:
@@ -140,6 +1210,162 @@ def parse_apache_bench_output(output: str) -> List[float]:
     return times
 
 
+# "Label:   value" lines of an ab report: (pattern, key, type)
+_AB_FIELDS = [
+    (r"Server Software:\s*(.*)", "server_software", str),
+    (r"Server Hostname:\s*(.*)", "server_hostname", str),
+    (r"Server Port:\s*(\d+)", "server_port", int),
+    (r"SSL/TLS Protocol:\s*(.*)", "tls_protocol", str),
+    (r"Server Temp Key:\s*(.*)", "tls_temp_key", str),
+    (r"TLS Server Name:\s*(.*)", "tls_server_name", str),
+    (r"Document Path:\s*(.*)", "document_path", str),
+    (r"Document Length:\s*(\d+) bytes", "document_length_bytes", int),
+    (r"Concurrency Level:\s*(\d+)", "concurrency", int),
+    (r"Time taken for tests:\s*([\d.]+) seconds", "time_taken_s", float),
+    (r"Complete requests:\s*(\d+)", "complete_requests", int),
+    (r"Failed requests:\s*(\d+)", "failed_requests", int),
+    (r"Write errors:\s*(\d+)", "write_errors", int),
+    (r"Non-2xx responses:\s*(\d+)", "non_2xx_responses", int),
+    (r"Keep-Alive requests:\s*(\d+)", "keep_alive_requests", int),
+    (r"Total transferred:\s*(\d+) bytes", "total_transferred_bytes", int),
+    (r"HTML transferred:\s*(\d+) bytes", "html_transferred_bytes", int),
+    (r"Requests per second:\s*([\d.]+)", "requests_per_second", float),
+    (r"Time per request:\s*([\d.]+) \[ms\] \(mean\)", "time_per_request_ms", float),
+    (r"Time per request:\s*([\d.]+) \[ms\] \(mean, across", "time_per_request_all_ms", float),
+    (r"Transfer rate:\s*([\d.]+) \[Kbytes/sec\] received", "transfer_rate_kbps", float),
+]
+_AB_FAILED_BREAKDOWN = re.compile(
+    r"\(Connect: (\d+), Receive: (\d+), Length: (\d+), Exceptions: (\d+)\)")
+_AB_CONNECTION_TIMES = re.compile(
+    r"^(Connect|Processing|Waiting|Total):\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)",
+    re.MULTILINE)
+_AB_PERCENTILE = re.compile(r"^\s*(\d+)%\s+([\d.]+)", re.MULTILINE)
+
+
+def parse_apache_bench_report(output: str) -> Dict[str, Any]:
+    """
+    Parse a complete Apache Bench report into structured results
+    
+    Args:
+        output: ab's stdout
+    
+    Returns:
+        Dictionary with the header fields present in the report (see
+        _AB_FIELDS; e.g. "requests_per_second", "failed_requests"),
+        "failed_breakdown" ({connect, receive, length, exceptions}),
+        "connection_times" ({connect|processing|waiting|total:
+        {min, mean, sd, median, max}} in ms) and "percentiles"
+        ({50: ms, ..., 100: ms}, "served within" table)
+    """
+    report = {}
+    for pattern, key, kind in _AB_FIELDS:
+        match = re.search(pattern, output)
+        if match:
+            report[key] = kind(match.group(1).strip())
+    
+    match = _AB_FAILED_BREAKDOWN.search(output)
+    if match:
+        report["failed_breakdown"] = dict(zip(
+            ("connect", "receive", "length", "exceptions"), map(int, match.groups())))
+    
+    report["connection_times"] = {
+        name.lower(): dict(zip(("min", "mean", "sd", "median", "max"), map(float, values)))
+        for name, *values in _AB_CONNECTION_TIMES.findall(output)
+    }
+    
+    report["percentiles"] = {int(p): float(ms) for p, ms in _AB_PERCENTILE.findall(output)}
+    return report
+
+
+AB_GNUPLOT_COLUMNS = ("seconds", "ctime", "dtime", "ttime", "wait")
+
+
+def iter_ab_gnuplot(path: str, columns: Sequence[str] = AB_GNUPLOT_COLUMNS,
+                    block_size: int = 16 << 20) -> Iterator[Dict[str, "np.ndarray"]]:
+    """
+    Stream an `ab -g` per-request file as chunks of NumPy columns
+    
+    The file is tab separated with a header line:
+    starttime  seconds  ctime  dtime  ttime  wait
+    where starttime is a ctime()-style date, seconds the request start
+    epoch and the rest per-request times in ms (connect, processing,
+    total, waiting). Each block is split on tabs/newlines in one call and
+    the columns are sliced out of the token list, so multi-GB files are
+    processed in fixed memory without per-line Python work. Only the
+    requested columns are converted.
+    
+    Args:
+        path: ab -g output file
+        columns: Columns to return (subset of AB_GNUPLOT_COLUMNS)
+        block_size: Bytes read per chunk
+    
+    Yields:
+        {column: float64 array}
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("numpy is required to read ab -g files")
+    
+    unknown = set(columns) - set(AB_GNUPLOT_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown ab -g columns: {sorted(unknown)}")
+    
+    width = 1 + len(AB_GNUPLOT_COLUMNS)
+    positions = {name: AB_GNUPLOT_COLUMNS.index(name) + 1 for name in columns}
+    
+    def parse(lines: bytes):
+        tokens = lines.replace(b"\r", b"").replace(b"\n", b"\t").split(b"\t")[:-1]
+        if tokens[:1] == [b"starttime"]:
+            tokens = tokens[width:]
+        if len(tokens) % width:
+            raise ValueError(f"{path}: malformed ab -g data (expected {width} tab-separated fields)")
+        if not tokens:
+            return None
+        return {name: np.array(tokens[i::width], dtype=np.float64)
+                for name, i in positions.items()}
+    
+    pending = b""
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            block = pending + block
+            cut = block.rfind(b"\n") + 1
+            pending = block[cut:]
+            if cut:
+                chunk = parse(block[:cut])
+                if chunk is not None:
+                    yield chunk
+    
+    if pending.strip():
+        chunk = parse(pending + b"\n")
+        if chunk is not None:
+            yield chunk
+
+
+def read_ab_percentile_csv(path: str) -> Dict[float, float]:
+    """
+    Read an `ab -e` CSV file
+    
+    ab -e does not record individual requests; it writes the response
+    time (ms) at which each percentage 0..100 of requests was served.
+    
+    Returns:
+        {percentage: time_ms}
+    """
+    table = {}
+    with open(path, 'r') as f:
+        for line in f:
+            fields = line.strip().split(',')
+            if len(fields) != 2:
+                continue
+            try:
+                table[float(fields[0])] = float(fields[1])
+            except ValueError:
+                continue  # header line
+    return table
+
+
 def parse_curl_timing(output: str) -> List[float]:
     """
     Parse curl timing output (-w format)
@@ -157,10 +1383,189 @@ def parse_curl_timing(output: str) -> List[float]:
     return times
 
 
-def format_report(stats: Dict[str, float], title: str = "Statistics Report") -> str:
+# curl -w timing variables: seconds from the start of the transfer
+CURL_TIMING_VARIABLES = ("time_namelookup", "time_connect", "time_appconnect",
+                         "time_pretransfer", "time_redirect", "time_starttransfer",
+                         "time_total")
+# Column order assumed for header-less CSV
+CURL_CSV_FIELDS = ("time_namelookup", "time_connect", "time_appconnect",
+                   "time_pretransfer", "time_starttransfer", "time_total")
+# Per-phase durations: name -> (end variable, start variable or None)
+CURL_PHASES = {
+    "dns_ms": ("time_namelookup", None),
+    "tcp_ms": ("time_connect", "time_namelookup"),
+    "tls_ms": ("time_appconnect", "time_connect"),
+    "server_ms": ("time_starttransfer", "time_pretransfer"),
+    "ttfb_ms": ("time_starttransfer", None),
+    "transfer_ms": ("time_total", "time_starttransfer"),
+}
+_CURL_KEY_VALUE = re.compile(r"\b(time_[a-z]+)(_ms)?\s*[:=]\s*([-+0-9.eE]+)")
+
+
+def _curl_key_value_columns(output: str) -> Dict[str, "np.ndarray"]:
+    """Columns (ms) from `time_x: value` lines; one record per set of keys"""
+    # Fast path: nothing but "key: value" pairs in a repeating per-request layout
+    tokens = output.replace(":", " ").replace("=", " ").split()
+    if tokens and len(tokens) % 2 == 0:
+        keys = np.array(tokens[0::2])
+        width = len(dict.fromkeys(tokens[0::2]))
+        if (len(keys) % width == 0 and len(set(tokens[0:2 * width:2])) == width
+                and all(_CURL_KEY_VALUE.fullmatch(f"{k}: 0") for k in tokens[0:2 * width:2])):
+            rows = keys.reshape(-1, width)
+            if (rows == rows[0]).all():
+                try:
+                    values = np.array(tokens[1::2], dtype=np.float64).reshape(-1, width)
+                except ValueError:
+                    values = None
+                if values is not None:
+                    columns = {}
+                    for i, key in enumerate(rows[0].tolist()):
+                        name = key[:-3] if key.endswith("_ms") else key
+                        columns[name] = values[:, i] if key.endswith("_ms") else values[:, i] * 1000
+                    return columns
+    
+    # General path: regex over mixed output; a repeated key starts a new record
+    records = []
+    current = {}
+    for name, suffix, number in _CURL_KEY_VALUE.findall(output):
+        if name in current:
+            records.append(current)
+            current = {}
+        current[name] = float(number) if suffix else float(number) * 1000
+    if current:
+        records.append(current)
+    
+    variables = list(dict.fromkeys(name for record in records for name in record))
+    return {name: np.array([r.get(name, np.nan) for r in records]) for name in variables}
+
+
+def _curl_csv_columns(output: str, fields: Sequence[str]) -> Dict[str, "np.ndarray"]:
+    """Columns (ms) from comma-separated rows, with or without a header line"""
+    body = output.strip().replace("\r", "")
+    first_line, _, rest = body.partition("\n")
+    header = [h.strip() for h in first_line.split(",")]
+    if any(h.startswith("time_") for h in header):
+        body = rest
+    else:
+        header = list(fields)
+    
+    width = len(header)
+    tokens = body.replace("\n", ",").split(",")
+    if len(tokens) % width:
+        # Blank lines in between
+        tokens = ",".join(line for line in body.split("\n") if line.strip()).split(",")
+        if len(tokens) % width:
+            raise ValueError(f"curl CSV rows do not all have {width} fields")
+    
+    columns = {}
+    for i, column in enumerate(header):
+        match = re.fullmatch(r"(time_[a-z]+)(_ms)?", column)
+        if match:
+            values = np.array(tokens[i::width], dtype=np.float64)
+            columns[match.group(1)] = values if match.group(2) else values * 1000
+    return columns
+
+
+def parse_curl_timings(output: str, fields: Sequence[str] = CURL_CSV_FIELDS) -> Dict[str, "np.ndarray"]:
+    """
+    Parse curl -w timing output into per-variable and per-phase columns
+    
+    Accepts either key:value lines, one block per request, e.g. from
+        -w "time_namelookup: %{time_namelookup}\ntime_connect: %{time_connect}\n..."
+    or CSV rows, e.g. from
+        -w "%{time_namelookup},%{time_connect},%{time_appconnect},%{time_pretransfer},%{time_starttransfer},%{time_total}\n"
+    optionally with a header of variable names (a `_ms` suffix marks columns
+    already in milliseconds, as in aggregate-data.py CSV exports; header-less
+    rows follow `fields`). Lines are matched with one regex/split over the
+    whole text and converted to NumPy arrays in bulk.
+    
+    Returns:
+        Dictionary of float64 arrays in ms, one element per request:
+        "<variable>_ms" for each curl variable present (cumulative from
+        the start of the request) and the derived durations in CURL_PHASES
+        that its variables allow: dns_ms, tcp_ms, tls_ms (TLS handshake,
+        appconnect - connect; NaN for plain HTTP where appconnect is 0),
+        server_ms (pretransfer -> first byte), ttfb_ms, transfer_ms
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("numpy is required for parse_curl_timings")
+    
+    first_line = output.lstrip().split("\n", 1)[0]
+    if "," in first_line and not _CURL_KEY_VALUE.search(first_line):
+        columns = _curl_csv_columns(output, fields)
+    else:
+        columns = _curl_key_value_columns(output)
+    if not columns:
+        raise ValueError("No curl timing variables found")
+    
+    result = {f"{name}_ms": values for name, values in columns.items()}
+    
+    for phase, (end, start) in CURL_PHASES.items():
+        if end not in columns or (start is not None and start not in columns):
+            continue
+        duration = columns[end] - (columns[start] if start else 0.0)
+        if phase == "tls_ms":
+            duration = np.where(columns[end] > 0, duration, np.nan)
+        result[phase] = duration
+    return result
+
+
+def extract_dataset(data_json: Any, metric: str) -> Union[List[float], LatencyHistogram]:
+    """
+    Pick the measurements for `metric` out of a loaded JSON document
+    
+    Accepts a list of records ({metric: value, ...}), a dict holding a list
+    of values under `metric`, or a serialized LatencyHistogram (at the top
+    level or under `metric`).
+    """
+    if LatencyHistogram.is_serialized(data_json):
+        return LatencyHistogram.from_dict(data_json)
+    if isinstance(data_json, list):
+        return [item[metric] for item in data_json if metric in item]
+    if isinstance(data_json, dict) and metric in data_json:
+        if LatencyHistogram.is_serialized(data_json[metric]):
+            return LatencyHistogram.from_dict(data_json[metric])
+        return data_json[metric]
+    raise ValueError(f"Cannot find metric '{metric}' in JSON")
+
+
+def _percentile_keys(stats: Dict[str, Any]) -> List[str]:
+    """Percentile keys ("p50", "p99.9", ...) present in a stats dict, in order"""
+    keys = []
+    for key in stats:
+        try:
+            if key.startswith("p") and 0 <= float(key[1:]) <= 100:
+                keys.append(key)
+        except ValueError:
+            continue
+    return keys
+
+
+def format_report(stats: Dict[str, Any], title: str = "Statistics Report") -> str:
     """
     Format statistics as readable text report
+    
+    With coordinated-omission results, percentiles are shown raw and
+    corrected side by side.
     """
+    corrected = stats.get("coordinated_omission")
+    percentile_lines = [
+        (f"  P{key[1:]} (median):" if key == "p50" else f"  P{key[1:]}:").ljust(20)
+        + f"{stats[key]:>10.3f} ms"
+        + (f"{corrected[key]:>14.3f} ms" if corrected else "")
+        for key in _percentile_keys(stats)
+    ]
+    if corrected:
+        percentile_lines = [
+            f"{'':20}{'raw':>13}{'corrected':>17}",
+            *percentile_lines,
+            "",
+            f"Coordinated omission: expected interval {corrected['expected_interval']:g} ms, "
+            f"{corrected['added_samples']} samples back-filled",
+            f"Corrected mean:     {corrected['mean']:>10.3f} ms",
+            f"Corrected max:      {corrected['max']:>10.3f} ms",
+        ]
+    
     lines = [
         "=" * 60,
         title.center(60),
@@ -177,10 +1582,7 @@ def format_report(stats: Dict[str, float], title: str = "Statistics Report") ->
         f"CV (Coef. Var):     {stats['cv']:>10.2f} %",
         "",
         "Percentiles:",
-        f"  P50 (median):     {stats['p50']:>10.3f} ms",
-        f"  P90:              {stats['p90']:>10.3f} ms",
-        f"  P95:              {stats['p95']:>10.3f} ms",
-        f"  P99:              {stats['p99']:>10.3f} ms",
+        *percentile_lines,
         "=" * 60,
     ]
     return "\n".join(lines)
@@ -218,6 +1620,102 @@ def format_comparison(comparison: Dict[str, Any]) -> str:
         "",
         "=" * 70,
     ]
+    
+    if 'bootstrap' in comparison:
+        boot = comparison['bootstrap']
+        lines += [
+            f"{boot['confidence'] * 100:g}% CONFIDENCE INTERVALS ({boot['resamples']} bootstrap resamples):".center(70),
+            "=" * 70,
+            "",
+        ]
+        for name in BOOTSTRAP_STATISTICS:
+            low, high = comp[f'{name}_diff_ci']
+            low_pct, high_pct = comp[f'{name}_diff_pct_ci']
+            label = f"{'P' + name[1:] if name.startswith('p') else name.capitalize()} difference:"
+            lines.append(f"{label.ljust(23)}[{low:>+9.3f}, {high:>+9.3f}] ms  "
+                         f"([{low_pct:>+6.2f}%, {high_pct:>+6.2f}%])")
+        lines += ["", "=" * 70]
+    
+    return "\n".join(lines)
+
+
+def format_ab_report(report: Dict[str, Any]) -> str:
+    """
+    Format a parsed Apache Bench report
+    """
+    lines = [
+        "=" * 60,
+        "APACHE BENCH REPORT".center(60),
+        "=" * 60,
+        "",
+    ]
+    for key, value in report.items():
+        if not isinstance(value, dict):
+            lines.append(f"{key + ':':<28}{value}")
+    
+    if report.get("failed_breakdown"):
+        lines.append("failed_breakdown:".ljust(28) + ", ".join(
+            f"{k}={v}" for k, v in report["failed_breakdown"].items()))
+    
+    if report["connection_times"]:
+        lines += ["", "Connection Times (ms)",
+                  " " * 14 + "".join(f"{h:>9}" for h in ("min", "mean", "sd", "median", "max"))]
+        for name, row in report["connection_times"].items():
+            lines.append(f"  {name.capitalize() + ':':<12}" + "".join(f"{v:>9g}" for v in row.values()))
+    
+    if report["percentiles"]:
+        lines += ["", "Served within (ms):"]
+        lines += [f"  {p:>3}%{ms:>12g}" for p, ms in report["percentiles"].items()]
+    
+    lines.append("=" * 60)
+    return "\n".join(lines)
+
+
+def format_phase_report(phase_stats: Dict[str, Dict[str, float]],
+                        title: str = "curl Timing Phases") -> str:
+    """
+    Format per-phase statistics as one table
+    """
+    header = f"{'Phase':<24}{'Count':>8}{'Mean':>10}{'Median':>10}{'P95':>10}{'P99':>10}{'Stdev':>10}"
+    lines = ["=" * len(header), f"{title} (ms)".center(len(header)), "=" * len(header),
+             header, "-" * len(header)]
+    for phase, stats in phase_stats.items():
+        lines.append(f"{phase:<24}{stats['count']:>8}{stats['mean']:>10.3f}{stats['median']:>10.3f}"
+                     f"{stats['p95']:>10.3f}{stats['p99']:>10.3f}{stats['stdev']:>10.3f}")
+    lines.append("=" * len(header))
+    return "\n".join(lines)
+
+
+def format_batch_comparison(batch: Dict[str, Any]) -> str:
+    """
+    Format batch comparison results as one table
+    """
+    def p_value(x):
+        return "     n/a" if x is None else f"{x:>8.4f}"
+    
+    header = (f"{'Group':<24} {'Metric':<20} {'N base':>7} {'N treat':>7} "
+              f"{'Mean %':>8} {'P95 %':>8} {'Welch p':>8} {'MWU p':>8}  Sig")
+    lines = [
+        "=" * len(header),
+        "BATCH PERFORMANCE COMPARISON".center(len(header)),
+        f"({batch['pairs']} pairs, {batch['correction']} correction, "
+        f"alpha={batch['alpha']:g}; p-values adjusted; "
+        f"Sig from {'Welch' if batch['test'] == 'welch' else 'MWU'} p)".center(len(header)),
+        "=" * len(header),
+        header,
+        "-" * len(header),
+    ]
+    for r in batch['results']:
+        group = "/".join(str(v) for v in r['group'].values())
+        comp = r['comparison']
+        lines.append(
+            f"{group[:24]:<24} {r['metric'][:20]:<20} "
+            f"{r['baseline']['count']:>7} {r['treatment']['count']:>7} "
+            f"{comp['mean_diff_pct']:>+8.2f} {comp['p95_diff_pct']:>+8.2f} "
+            f"{p_value(r['welch']['p_adjusted'])} {p_value(r['mann_whitney']['p_adjusted'])}  "
+            f"{'*' if r['significant'] else ''}"
+        )
+    lines.append("=" * len(header))
     return "\n".join(lines)
 
 
@@ -229,11 +1727,38 @@ def main():
         # Calculate stats from JSON file
         python3 calculate-stats.py --input data.json --metric handshake_time
         
+        # Custom percentiles (tail latency)
+        python3 calculate-stats.py --input data.json --percentiles 50,90,99,99.9,99.99
+        
         # Compare two datasets
         python3 calculate-stats.py --compare baseline.json hybrid.json --metric latency
         
+        # ... with 95% bootstrap confidence intervals on the differences
+        python3 calculate-stats.py --compare baseline.json hybrid.json --bootstrap 10000 --seed 1
+        
+        # Batch: every test_name x metric pair, Welch + Mann-Whitney, Holm-corrected
+        python3 calculate-stats.py --compare baseline.json hybrid.json --batch \\
+            --metrics handshake_time_ms,request_time_ms --correction holm
+        
         # Read from stdin (pipe)
         cat measurements.txt | python3 calculate-stats.py --stdin
+        
+        # Bounded-memory streaming from a live pipe, report every 10s
+        tail -f latency.log | python3 calculate-stats.py --stdin --stream --report-interval 10
+        
+        # Structured summary of an ab run, stats over its per-request -g file
+        python3 calculate-stats.py --ab-report ab-test1.txt
+        python3 calculate-stats.py --ab-gnuplot ab-test1.tsv --column ttime
+        
+        # Per-phase curl timings (DNS/TCP/TLS/TTFB/total) from curl -w output
+        python3 calculate-stats.py --curl phases.csv
+        
+        # ab -c 10 at ~1000 req/s: back-fill samples hidden by stalls
+        python3 calculate-stats.py --input data.json --expected-interval 10
+        
+        # Keep a compact histogram of a long run, compare histograms later
+        cat run1.txt | python3 calculate-stats.py --stdin --stream --save-histogram run1.hist.json
+        python3 calculate-stats.py --compare run1.hist.json run2.hist.json
     """
     import argparse
     
@@ -248,20 +1773,170 @@ def main():
                        help='Output format')
     parser.add_argument('--stdin', action='store_true',
                        help='Read newline-separated values from stdin')
+    parser.add_argument('--ab-report', metavar='FILE',
+                       help='Parse a saved Apache Bench (ab) report into structured results')
+    parser.add_argument('--ab-gnuplot', metavar='FILE',
+                       help='Statistics over an ab -g per-request file (streamed, bounded memory)')
+    parser.add_argument('--column', choices=AB_GNUPLOT_COLUMNS[1:], default='ttime',
+                       help='With --ab-gnuplot: per-request time column (default: ttime)')
+    parser.add_argument('--curl', metavar='FILE',
+                       help="Per-phase statistics from curl -w timing output "
+                            "(key:value or CSV; '-' reads stdin)")
+    parser.add_argument('--percentiles', '-p', default=None,
+                       help='Comma-separated percentiles to report '
+                            '(default: 50,90,95,99; e.g. 50,90,99,99.9,99.99)')
+    parser.add_argument('--batch', action='store_true',
+                       help='With --compare: compare every group x metric pair in one run')
+    parser.add_argument('--metrics', default=None,
+                       help='With --batch: comma-separated metrics (default: all numeric fields)')
+    parser.add_argument('--group-by', '-g', default='test_name',
+                       help='With --batch: comma-separated fields identifying a test group '
+                            '(default: test_name)')
+    parser.add_argument('--correction', choices=CORRECTION_METHODS, default='holm',
+                       help='With --batch: multiple-comparison correction (default: holm)')
+    parser.add_argument('--alpha', type=float, default=0.05,
+                       help='With --batch: significance level (default: 0.05)')
+    parser.add_argument('--test', choices=SIGNIFICANCE_TESTS, default='welch',
+                       help='With --batch: test deciding significance; the other is '
+                            'reported for information (default: welch)')
+    parser.add_argument('--expected-interval', type=float, default=None, metavar='MS',
+                       help='Expected time between requests of a closed-loop recorder; '
+                            'also report percentiles corrected for coordinated omission')
+    parser.add_argument('--bootstrap', type=int, default=0, metavar='N',
+                       help='With --compare: bootstrap confidence intervals from N resamples')
+    parser.add_argument('--confidence', type=float, default=0.95,
+                       help='Confidence level of bootstrap intervals (default: 0.95)')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='Bootstrap RNG seed (for reproducible intervals)')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                       help='Worker processes for the bootstrap (default: 1)')
+    parser.add_argument('--stream', action='store_true',
+                       help='With --stdin: process input in chunks with bounded memory '
+                            '(exact moments, histogram percentiles)')
+    parser.add_argument('--report-every', type=int, default=0, metavar='N',
+                       help='With --stream: print an updated report every N samples')
+    parser.add_argument('--report-interval', type=float, default=0.0, metavar='SECONDS',
+                       help='With --stream: print an updated report every T seconds')
+    parser.add_argument('--significant-digits', type=int, default=3,
+                       help='With --stream: histogram precision; percentiles are within '
+                            '10^-digits relative error (default: 3 = 0.1%%)')
+    parser.add_argument('--lowest', type=float, default=0.001,
+                       help='With --stream: smallest distinguishable value (default: 0.001)')
+    parser.add_argument('--highest', type=float, default=3_600_000.0,
+                       help='With --stream: largest trackable value (default: 3600000)')
+    parser.add_argument('--save-histogram', metavar='FILE',
+                       help='With --stream: also write the latency histogram (a few KB of JSON, '
+                            'usable as --input/--compare data)')
     
     args = parser.parse_args()
     
+    percentiles = None
+    if args.percentiles:
+        try:
+            percentiles = [float(p) for p in args.percentiles.split(',') if p.strip()]
+        except ValueError:
+            parser.error(f"invalid --percentiles: {args.percentiles}")
+    
+    if args.stream and not args.stdin:
+        parser.error("--stream requires --stdin")
+    
+    def render(stats, title="Statistics Report"):
+        if args.format == 'json':
+            return json.dumps(stats, indent=2)
+        return format_report(stats, title)
+    
     try:
-        if args.stdin:
+        if args.stdin and args.stream:
+            # Bounded memory: chunks are folded into exact moments + histogram
+            def on_report(stats):
+                if args.format == 'json':
+                    print(json.dumps(stats), flush=True)
+                else:
+                    print(format_report(stats, f"Streaming Report ({stats['count']} samples)"),
+                          flush=True)
+            
+            streaming = StreamingStats(args.significant_digits, args.lowest, args.highest)
+            stats = stream_stats(sys.stdin.buffer, percentiles,
+                                 report_every=args.report_every,
+                                 report_interval=args.report_interval,
+                                 on_report=on_report, streaming=streaming)
+            if streaming.negative.total and (args.expected_interval or args.save_histogram):
+                raise ValueError("--expected-interval and --save-histogram need non-negative values")
+            if args.expected_interval:
+                stats["coordinated_omission"] = coordinated_omission_stats(
+                    streaming.histogram, args.expected_interval, percentiles)
+            output = render(stats)
+            
+            if args.save_histogram:
+                with open(args.save_histogram, 'w') as f:
+                    json.dump(streaming.histogram.to_dict(), f)
+                print(f"✓ Histogram written to {args.save_histogram}", file=sys.stderr)
+        
+        elif args.ab_report:
+            with open(args.ab_report, 'r') as f:
+                report = parse_apache_bench_report(f.read())
+            
+            if args.format == 'json':
+                output = json.dumps(report, indent=2)
+            else:
+                output = format_ab_report(report)
+        
+        elif args.curl:
+            if args.curl == '-':
+                text = sys.stdin.read()
+            else:
+                with open(args.curl, 'r') as f:
+                    text = f.read()
+            
+            # p95/p99 are always reported in the phase table
+            phase_percentiles = sorted(set(DEFAULT_PERCENTILES) | set(percentiles or []))
+            phase_stats = {}
+            for name, values in parse_curl_timings(text).items():
+                values = values[~np.isnan(values)]
+                if len(values):
+                    phase_stats[name] = calculate_stats(values, phase_percentiles)
+            
+            if args.format == 'json':
+                output = json.dumps(phase_stats, indent=2)
+            else:
+                output = format_phase_report(phase_stats)
+        
+        elif args.ab_gnuplot:
+            # Per-request times folded chunk by chunk, like --stdin --stream
+            streaming = StreamingStats(args.significant_digits, args.lowest, args.highest)
+            for chunk in iter_ab_gnuplot(args.ab_gnuplot, [args.column]):
+                streaming.update(chunk[args.column])
+            output = render(streaming.stats(percentiles), f"ab {args.column} (ms)")
+        
+        elif args.stdin:
             # Read values from stdin
-            data = [float(line.strip()) for line in sys.stdin if line.strip()]
-            stats = calculate_stats(data)
+            data = parse_values(sys.stdin.buffer.read())
+            stats = calculate_stats(data, percentiles, expected_interval=args.expected_interval)
             
             if args.format == 'json':
                 output = json.dumps(stats, indent=2)
             else:
                 output = format_report(stats)
         
+        elif args.compare and args.batch:
+            # Every (group, metric) pair from a single load of both files
+            with open(args.compare[0], 'r') as f:
+                baseline_json = json.load(f)
+            
+            with open(args.compare[1], 'r') as f:
+                treatment_json = json.load(f)
+            
+            metrics = [m.strip() for m in args.metrics.split(',') if m.strip()] if args.metrics else None
+            group_by = [g.strip() for g in args.group_by.split(',') if g.strip()]
+            batch = batch_compare(baseline_json, treatment_json, metrics, group_by,
+                                  correction=args.correction, alpha=args.alpha,
+                                  percentiles=percentiles, test=args.test)
+            
+            if args.format == 'json':
+                output = json.dumps(batch, indent=2)
+            else:
+                output = format_batch_comparison(batch)
+        
         elif args.compare:
             # Compare two datasets
             with open(args.compare[0], 'r') as f:
@@ -270,11 +1945,13 @@ def main():
             with open(args.compare[1], 'r') as f:
                 treatment_json = json.load(f)
             
-            # Extract metric
-            baseline_data = [item[args.metric] for item in baseline_json if args.metric in item]
-            treatment_data = [item[args.metric] for item in treatment_json if args.metric in item]
+            baseline_data = extract_dataset(baseline_json, args.metric)
+            treatment_data = extract_dataset(treatment_json, args.metric)
             
-            comparison = compare_datasets(baseline_data, treatment_data)
+            comparison = compare_datasets(baseline_data, treatment_data, percentiles,
+                                          bootstrap=args.bootstrap,
+                                          confidence=args.confidence,
+                                          seed=args.seed, workers=args.workers)
             
             if args.format == 'json':
                 output = json.dumps(comparison, indent=2)
@@ -286,15 +1963,9 @@ def main():
             with open(args.input, 'r') as f:
                 data_json = json.load(f)
             
-            # Extract metric
-            if isinstance(data_json, list):
-                data = [item[args.metric] for item in data_json if args.metric in item]
-            elif isinstance(data_json, dict) and args.metric in data_json:
-                data = data_json[args.metric]
-            else:
-                raise ValueError(f"Cannot find metric '{args.metric}' in JSON")
+            data = extract_dataset(data_json, args.metric)
             
-            stats = calculate_stats(data)
+            stats = calculate_stats(data, percentiles, expected_interval=args.expected_interval)
             
             if args.format == 'json':
                 output = json.dumps(stats, indent=2)
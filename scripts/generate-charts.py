@@ -7,8 +7,15 @@ Creates visualizations from aggregated test data
 
 import json
 import argparse
+import hashlib
+import os
+import shutil
+import struct
 import sys
-from typing import Dict, List, Any
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Dict, List, Any, Optional, Tuple, Union
 
 try:
     import matplotlib
@@ -28,71 +35,352 @@ COLORS = {
     'degradation': '#D62828'  # Red
 }
 
+COLUMNAR_MAGIC = b"PQCCOL01"
+
+
 def load_aggregated_data(filepath: str) -> Dict[str, Any]:
-    """Load aggregated JSON data"""
+    """Load aggregated data (JSON, or aggregate-data.py --format columnar)"""
+    with open(filepath, 'rb') as f:
+        if f.read(len(COLUMNAR_MAGIC)) == COLUMNAR_MAGIC:
+            return load_columnar_data(filepath)
+    
     with open(filepath, 'r') as f:
         return json.load(f)
 
 
-def extract_metric_comparison(data: Dict, metric: str) -> Dict[str, List[float]]:
+def load_columnar_data(filepath: str) -> Dict[str, Any]:
     """
-    Extract baseline vs hybrid values for a specific metric
+    Map a columnar results file into the summary format
     
-    Returns:
-        {"baseline": [values], "hybrid": [values]}
-    """
-    result = {"baseline": [], "hybrid": []}
-    
-    # Handle summary format
-    if "metrics" in data:
-        for test_name in data["metrics"]:
-            if metric in data["metrics"][test_name]:
-                metric_data = data["metrics"][test_name][metric]
-                
-                if "baseline" in metric_data and isinstance(metric_data["baseline"], dict):
-                    result["baseline"] = metric_data["baseline"].get("raw_values", [])
-                
-                if "hybrid" in metric_data and isinstance(metric_data["hybrid"], dict):
-                    result["hybrid"] = metric_data["hybrid"].get("raw_values", [])
-    
-    # Handle raw format
-    elif "baseline" in data and "hybrid" in data:
-        for entry in data["baseline"]:
-            if metric in entry:
-                result["baseline"].append(entry[metric])
+    raw_values are numpy.memmap views into the file, so only the series
+    that are actually plotted are read from disk.
+    """
+    with open(filepath, 'rb') as f:
+        f.read(len(COLUMNAR_MAGIC))
+        (header_length,) = struct.unpack('<Q', f.read(8))
+        header = json.loads(f.read(header_length).decode('utf-8'))
+    
+    data_offset = -(-(len(COLUMNAR_MAGIC) + 8 + header_length) // 64) * 64
+    total = sum(entry["count"] for entry in header["series"])
+    column = (np.memmap(filepath, dtype='<f8', mode='r', offset=data_offset, shape=(total,))
+              if total else np.empty(0))
+    
+    summary = {"metadata": header.get("metadata", {}), "metrics": {}}
+    for entry in header["series"]:
+        stats = {k: v for k, v in entry.items()
+                 if k not in ("test_name", "metric", "side", "offset")}
+        stats["raw_values"] = column[entry["offset"]:entry["offset"] + entry["count"]]
         
-        for entry in data["hybrid"]:
-            if metric in entry:
-                result["hybrid"].append(entry[metric])
+        metric_data = summary["metrics"].setdefault(entry["test_name"], {}).setdefault(
+            entry["metric"], {"baseline": [], "hybrid": []})
+        metric_data[entry["side"]] = stats
+    
+    return summary
+
+
+# Points used to reconstruct a distribution from a quantile sketch
+SKETCH_SAMPLE_POINTS = 2000
+
+
+def sketch_quantiles(sketch: Dict[str, Any], quantiles) -> np.ndarray:
+    """
+    Evaluate quantiles (0-1) of a serialized quantile sketch
+    (aggregate-data.py --sketch / --stream)
+    
+    Each result is within the sketch's relative_accuracy of the true
+    value at that rank (e.g. within 1% for the default accuracy).
+    """
+    accuracy = sketch["relative_accuracy"]
+    gamma = (1 + accuracy) / (1 - accuracy)
+    
+    negative = sorted(((int(k), v) for k, v in sketch.get("negative", {}).items()), reverse=True)
+    positive = sorted((int(k), v) for k, v in sketch.get("positive", {}).items())
+    
+    neg_index = np.array([k for k, _ in negative], dtype=float)
+    pos_index = np.array([k for k, _ in positive], dtype=float)
+    points = np.concatenate([
+        -2 * gamma ** neg_index / (gamma + 1),
+        [0.0] if sketch.get("zero_count") else [],
+        2 * gamma ** pos_index / (gamma + 1),
+    ])
+    counts = np.array([v for _, v in negative]
+                      + ([sketch["zero_count"]] if sketch.get("zero_count") else [])
+                      + [v for _, v in positive])
+    
+    ranks = np.asarray(quantiles, dtype=float) * (sketch["count"] - 1)
+    position = np.searchsorted(np.cumsum(counts), ranks, side='right')
+    return points[np.minimum(position, len(points) - 1)]
+
+
+def sketch_sample(stats: Dict[str, Any], points: int = SKETCH_SAMPLE_POINTS) -> np.ndarray:
+    """
+    Rebuild a representative sample from a summary entry's sketch
     
-    return result
+    Values are taken at evenly spaced quantiles, so the sample has the
+    sketched distribution (for percentiles and violin plots) with at most
+    `points` values regardless of the original sample count.
+    """
+    sketch = stats["sketch"]
+    n = min(sketch["count"], points)
+    sample = sketch_quantiles(sketch, (np.arange(n) + 0.5) / n)
+    if "min" in stats and "max" in stats:
+        sample = np.clip(sample, stats["min"], stats["max"])
+    return sample
 
 
-def create_comparison_bar_chart(data: Dict, metric: str, output: str, 
+def _summary_values(stats: Dict[str, Any]):
+    """Values of a summary entry: raw_values, or a sample rebuilt from its sketch"""
+    if "raw_values" in stats:
+        return stats["raw_values"]
+    if "sketch" in stats:
+        return sketch_sample(stats)
+    return []
+
+
+SIDES = ("baseline", "hybrid")
+
+# Exact moments stored in summary entries (see MetricIndex.moments)
+SUMMARY_MOMENTS = ("count", "mean", "stdev", "min", "max")
+
+# Quantiles precomputed for every indexed series
+INDEX_QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+class MetricIndex:
+    """
+    Aggregated data parsed once into (test_name, metric, side) -> array
+    
+    Chart functions read series and their statistics from the index, so
+    each series is extracted and summarised once however many charts
+    use it. Asking for a metric without a test name pools it across all
+    test names: for raw records the pooled values keep record order
+    (`positions` holds each value's record number within its side);
+    summaries carry no order across test names, so their pooled values
+    follow test-name order.
+    
+    Summaries written with quantile sketches instead of raw_values yield
+    a representative sample reconstructed from the sketch (keys listed in
+    `sampled`: such series have no per-request order), whose exact
+    count/mean/stdev/min/max are kept in `moments` and take precedence
+    over the sample's; columnar raw_values stay memory-mapped.
+    """
+    
+    def __init__(self, series: Optional[Dict[Tuple[str, str, str], np.ndarray]] = None,
+                 stats: Optional[Dict[Tuple[Optional[str], str, str], Dict[str, Any]]] = None,
+                 moments: Optional[Dict[Tuple[str, str, str], Dict[str, float]]] = None,
+                 positions: Optional[Dict[Tuple[str, str, str], np.ndarray]] = None,
+                 sampled: Optional[set] = None):
+        self.series = series if series is not None else {}
+        self.sampled = sampled if sampled is not None else set()
+        self.moments = moments if moments is not None else {}
+        self.positions = positions if positions is not None else {}
+        self._stats = stats if stats is not None else {}
+        self._pooled: Dict[Tuple[str, str], np.ndarray] = {}
+        self._digests: Dict[str, str] = {}
+    
+    @classmethod
+    def from_data(cls, data: Dict[str, Any]) -> 'MetricIndex':
+        """Build the index from aggregated data (summary or raw format)"""
+        series = {}
+        moments = {}
+        sampled = set()
+        
+        # Handle summary format
+        if "metrics" in data:
+            for test_name, metrics in data["metrics"].items():
+                for metric, metric_data in metrics.items():
+                    for side in SIDES:
+                        if isinstance(metric_data.get(side), dict):
+                            stats = metric_data[side]
+                            series[(test_name, metric, side)] = np.asarray(
+                                _summary_values(stats), dtype=np.float64)
+                            if "raw_values" not in stats:
+                                sampled.add((test_name, metric, side))
+                            if ("raw_values" not in stats and "sketch" in stats
+                                    and all(k in stats for k in SUMMARY_MOMENTS)):
+                                moments[(test_name, metric, side)] = {
+                                    k: stats[k] for k in SUMMARY_MOMENTS}
+        
+        # Handle raw format
+        elif "baseline" in data and "hybrid" in data:
+            columns: Dict[Tuple[str, str, str], List[float]] = {}
+            records: Dict[Tuple[str, str, str], List[int]] = {}
+            for side in SIDES:
+                for position, entry in enumerate(data[side]):
+                    test_name = entry.get("test_name", "unknown")
+                    for key, value in entry.items():
+                        if isinstance(value, (int, float)) and not isinstance(value, bool):
+                            columns.setdefault((test_name, key, side), []).append(value)
+                            records.setdefault((test_name, key, side), []).append(position)
+            series = {key: np.asarray(values, dtype=np.float64) for key, values in columns.items()}
+            positions = {key: np.asarray(values, dtype=np.int64) for key, values in records.items()}
+            return cls(series, positions=positions)
+        
+        return cls(series, moments=moments, sampled=sampled)
+    
+    def metrics(self) -> List[str]:
+        return list(dict.fromkeys(metric for _, metric, _ in self.series))
+    
+    def _keys(self, metric: str, side: str, test_name: Optional[str] = None) -> List[Tuple[str, str, str]]:
+        """Series keys making up one side of a metric (all test names unless one is given)"""
+        if test_name is not None:
+            key = (test_name, metric, side)
+            return [key] if key in self.series else []
+        return [key for key in self.series if key[1] == metric and key[2] == side]
+    
+    def values(self, metric: str, side: str, test_name: Optional[str] = None) -> np.ndarray:
+        """Series of one side of a metric, pooled over test names unless one is given"""
+        if test_name is not None:
+            return self.series.get((test_name, metric, side), np.empty(0))
+        
+        if (metric, side) not in self._pooled:
+            keys = self._keys(metric, side)
+            if len(keys) == 1:
+                pooled = self.series[keys[0]]
+            elif not keys:
+                pooled = np.empty(0)
+            else:
+                pooled = np.concatenate([self.series[key] for key in keys])
+                if all(key in self.positions for key in keys):
+                    order = np.argsort(np.concatenate([self.positions[key] for key in keys]),
+                                       kind='stable')
+                    pooled = pooled[order]
+            self._pooled[(metric, side)] = pooled
+        return self._pooled[(metric, side)]
+    
+    def has_requests(self, metric: str) -> bool:
+        """Whether the metric's values are real per-request samples (not rebuilt from sketches)"""
+        return not any(key in self.sampled for side in SIDES for key in self._keys(metric, side))
+    
+    def comparison(self, metric: str, test_name: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """{"baseline": values, "hybrid": values} for a metric"""
+        return {side: self.values(metric, side, test_name) for side in SIDES}
+    
+    def has(self, metric: str, test_name: Optional[str] = None) -> bool:
+        """Whether both sides of a metric have data"""
+        return all(len(self.values(metric, side, test_name)) for side in SIDES)
+    
+    def stats(self, metric: str, side: str, test_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Statistics of a series, computed on first use
+        
+        Returns:
+            count, mean, std (population), min, max and {q: value} for
+            INDEX_QUANTILES
+        """
+        key = (test_name, metric, side)
+        if key not in self._stats:
+            values = self.values(metric, side, test_name)
+            if len(values) == 0:
+                raise ValueError(f"No data for {side} '{metric}'")
+            quantiles = np.quantile(values, INDEX_QUANTILES)
+            self._stats[key] = {
+                "count": len(values),
+                "mean": float(np.mean(values)),
+                "std": float(np.std(values)),
+                "min": float(np.min(values)),
+                "max": float(np.max(values)),
+                "quantiles": dict(zip(INDEX_QUANTILES, quantiles.tolist())),
+            }
+            
+            keys = self._keys(metric, side, test_name)
+            if any(k in self.moments for k in keys):
+                self._stats[key].update(self._pooled_moments(keys))
+        return self._stats[key]
+    
+    def _pooled_moments(self, keys: List[Tuple[str, str, str]]) -> Dict[str, float]:
+        """
+        Exact count/mean/std (population)/min/max over several series,
+        from stored summary moments where available (Chan et al. combination)
+        """
+        parts = []
+        for key in keys:
+            stored = self.moments.get(key)
+            if stored is not None:
+                n = stored["count"]
+                parts.append((n, stored["mean"], stored["stdev"] ** 2 * max(n - 1, 0),
+                              stored["min"], stored["max"]))
+            else:
+                values = self.series[key]
+                parts.append((len(values), float(np.mean(values)), float(np.var(values)) * len(values),
+                              float(np.min(values)), float(np.max(values))))
+        
+        count = sum(n for n, _, _, _, _ in parts)
+        mean = sum(n * m for n, m, _, _, _ in parts) / count
+        m2 = sum(s + n * (m - mean) ** 2 for n, m, s, _, _ in parts)
+        return {
+            "count": count,
+            "mean": mean,
+            "std": float(np.sqrt(m2 / count)),
+            "min": min(lo for _, _, _, lo, _ in parts),
+            "max": max(hi for _, _, _, _, hi in parts),
+        }
+    
+    def digest(self, metric: str) -> str:
+        """SHA-256 of every series of a metric (names, sides and values)"""
+        if metric not in self._digests:
+            h = hashlib.sha256(metric.encode('utf-8'))
+            for (test_name, m, side), values in self.series.items():
+                if m == metric:
+                    h.update(f"\0{test_name}\0{side}\0{len(values)}\0".encode('utf-8'))
+                    h.update(memoryview(np.ascontiguousarray(values, dtype=np.float64)).cast('B'))
+                    if (test_name, m, side) in self.positions:
+                        h.update(memoryview(np.ascontiguousarray(
+                            self.positions[(test_name, m, side)], dtype=np.int64)).cast('B'))
+                    if (test_name, m, side) in self.moments:
+                        h.update(json.dumps(self.moments[(test_name, m, side)],
+                                            sort_keys=True).encode('utf-8'))
+            self._digests[metric] = h.hexdigest()
+        return self._digests[metric]
+    
+    def precompute(self, metrics: List[str]):
+        """Compute pooled statistics for metrics up front (e.g. before forking workers)"""
+        for metric in metrics:
+            for side in SIDES:
+                if len(self.values(metric, side)):
+                    self.stats(metric, side)
+
+
+def _as_index(data) -> MetricIndex:
+    return data if isinstance(data, MetricIndex) else MetricIndex.from_data(data)
+
+
+def extract_metric_comparison(data: Dict, metric: str) -> Dict[str, np.ndarray]:
+    """
+    Extract baseline vs hybrid values for a specific metric
+    
+    Values are pooled over all test names. Build a MetricIndex once
+    instead when extracting several metrics.
+    
+    Returns:
+        {"baseline": values, "hybrid": values}
+    """
+    return _as_index(data).comparison(metric)
+
+
+def create_comparison_bar_chart(data: Union[Dict, MetricIndex], metric: str, output: str, 
                                  title: str = None, ylabel: str = None):
     """
     Create bar chart comparing baseline vs hybrid
     
     Args:
-        data: Aggregated data
+        data: Aggregated data or a MetricIndex built from it
         metric: Metric key to plot
         output: Output filename
         title: Chart title (optional)
         ylabel: Y-axis label (optional)
     """
-    values = extract_metric_comparison(data, metric)
+    index = _as_index(data)
     
-    if not values["baseline"] or not values["hybrid"]:
+    if not index.has(metric):
         print(f"WARNING: No data for metric '{metric}'", file=sys.stderr)
         return
     
-    # Calculate means
-    baseline_mean = np.mean(values["baseline"])
-    hybrid_mean = np.mean(values["hybrid"])
+    baseline, hybrid = index.stats(metric, "baseline"), index.stats(metric, "hybrid")
     
-    # Calculate std dev
-    baseline_std = np.std(values["baseline"])
-    hybrid_std = np.std(values["hybrid"])
+    # Means and std devs
+    baseline_mean, hybrid_mean = baseline["mean"], hybrid["mean"]
+    baseline_std, hybrid_std = baseline["std"], hybrid["std"]
     
     # Create figure
     fig, ax = plt.subplots(figsize=(10, 6))
@@ -136,25 +424,97 @@ def create_comparison_bar_chart(data: Dict, metric: str, output: str,
     print(f"✓ Created: {output}", file=sys.stderr)
 
 
-def create_distribution_plot(data: Dict, metric: str, output: str,
-                              title: str = None, xlabel: str = None):
+# Series longer than this get a binned KDE instead of matplotlib's exact one
+VIOLIN_EXACT_LIMIT = 50_000
+# Grid nodes the values are binned onto for the binned KDE
+VIOLIN_BINS = 4096
+# Points the violin outline is evaluated at (as ax.violinplot)
+VIOLIN_POINTS = 100
+
+
+def binned_violin_stats(values, stats: Optional[Dict[str, Any]] = None,
+                        points: int = VIOLIN_POINTS, bins: int = VIOLIN_BINS) -> Dict[str, Any]:
+    """
+    Violin statistics (for ax.violin) from a binned Gaussian KDE
+    
+    Same bandwidth (Scott's rule) and output grid as ax.violinplot, but
+    the values are first linearly binned onto `bins` nodes, so the
+    density costs points x bins kernel evaluations however many values
+    there are instead of points x n.
+    
+    Args:
+        values: Series values
+        stats: MetricIndex statistics of the series (optional, saves
+            recomputing mean/median/min/max)
+    
+    Returns:
+        vpstats entry with coords, vals, mean, median, min and max
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if stats is None:
+        stats = {"mean": float(np.mean(values)), "std": float(np.std(values)),
+                 "min": float(np.min(values)), "max": float(np.max(values)),
+                 "quantiles": {0.5: float(np.median(values))}}
+    
+    lo, hi = stats["min"], stats["max"]
+    coords = np.linspace(lo, hi, points)
+    vpstats = {"coords": coords, "mean": stats["mean"], "median": stats["quantiles"][0.5],
+               "min": lo, "max": hi}
+    
+    # Scott's rule on the sample standard deviation, as GaussianKDE
+    bandwidth = stats["std"] * np.sqrt(n / max(n - 1, 1)) * n ** -0.2
+    if hi == lo or bandwidth == 0:
+        vpstats["vals"] = np.ones(points)
+        return vpstats
+    
+    # Linear binning: each value's weight is split between its two nearest nodes
+    grid = np.linspace(lo, hi, bins)
+    position = (values - lo) / (grid[1] - grid[0])
+    left = np.clip(position.astype(np.int64), 0, bins - 2)
+    right_weight = position - left
+    weights = (np.bincount(left, weights=1 - right_weight, minlength=bins)
+               + np.bincount(left + 1, weights=right_weight, minlength=bins))
+    
+    kernel = np.exp(-0.5 * ((coords[:, None] - grid[None, :]) / bandwidth) ** 2)
+    vpstats["vals"] = kernel @ weights / (n * bandwidth * np.sqrt(2 * np.pi))
+    return vpstats
+
+
+def create_distribution_plot(data: Union[Dict, MetricIndex], metric: str, output: str,
+                              title: str = None, xlabel: str = None,
+                              violin_threshold: int = VIOLIN_EXACT_LIMIT):
     """
     Create violin/box plot showing distribution
+    
+    Series with more than violin_threshold values use a binned KDE (see
+    binned_violin_stats), so large series render in near-constant time.
     """
-    values = extract_metric_comparison(data, metric)
+    index = _as_index(data)
     
-    if not values["baseline"] or not values["hybrid"]:
+    if not index.has(metric):
         print(f"WARNING: No data for metric '{metric}'", file=sys.stderr)
         return
     
+    values = index.comparison(metric)
+    baseline, hybrid = index.stats(metric, "baseline"), index.stats(metric, "hybrid")
+    
     fig, ax = plt.subplots(figsize=(10, 6))
     
     # Create violin plot
-    parts = ax.violinplot([values["baseline"], values["hybrid"]],
-                           positions=[1, 2],
-                           showmeans=True,
-                           showmedians=True,
-                           widths=0.7)
+    if max(baseline["count"], hybrid["count"]) > violin_threshold:
+        parts = ax.violin([binned_violin_stats(values["baseline"], baseline),
+                           binned_violin_stats(values["hybrid"], hybrid)],
+                          positions=[1, 2],
+                          showmeans=True,
+                          showmedians=True,
+                          widths=0.7)
+    else:
+        parts = ax.violinplot([values["baseline"], values["hybrid"]],
+                               positions=[1, 2],
+                               showmeans=True,
+                               showmedians=True,
+                               widths=0.7)
     
     # Color the violins
     colors = [COLORS['baseline'], COLORS['hybrid']]
@@ -170,14 +530,14 @@ def create_distribution_plot(data: Dict, metric: str, output: str,
     ax.grid(axis='y', alpha=0.3)
     
     # Add statistics text
-    baseline_stats = f"μ={np.mean(values['baseline']):.2f}, σ={np.std(values['baseline']):.2f}"
-    hybrid_stats = f"μ={np.mean(values['hybrid']):.2f}, σ={np.std(values['hybrid']):.2f}"
+    baseline_stats = f"μ={baseline['mean']:.2f}, σ={baseline['std']:.2f}"
+    hybrid_stats = f"μ={hybrid['mean']:.2f}, σ={hybrid['std']:.2f}"
     
-    ax.text(1, max(values['baseline']) * 0.95, baseline_stats,
+    ax.text(1, baseline['max'] * 0.95, baseline_stats,
             ha='center', fontsize=9,
             bbox=dict(boxstyle='round', facecolor='white', alpha=0.7))
     
-    ax.text(2, max(values['hybrid']) * 0.95, hybrid_stats,
+    ax.text(2, hybrid['max'] * 0.95, hybrid_stats,
             ha='center', fontsize=9,
             bbox=dict(boxstyle='round', facecolor='white', alpha=0.7))
     
@@ -188,10 +548,167 @@ def create_distribution_plot(data: Dict, metric: str, output: str,
     print(f"✓ Created: {output}", file=sys.stderr)
 
 
-def create_multi_metric_comparison(data: Dict, metrics: List[str], output: str):
+# Points kept per series in time-series charts (about one per pixel column)
+TIMESERIES_POINTS = 2000
+# Windows the rolling percentiles are computed over
+TIMESERIES_WINDOWS = 200
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling
+    
+    Keeps the first and last point and, from each of threshold - 2
+    buckets, the point forming the largest triangle with the previously
+    kept point and the mean of the next bucket. Bucket means are computed
+    up front, so the loop does one vectorised step per bucket.
+    
+    Returns:
+        Indexes of the kept points (ascending)
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    sizes = np.diff(edges)
+    mean_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / sizes
+    mean_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / sizes
+    # The last bucket looks ahead to the final point
+    mean_x = np.append(mean_x[1:], x[-1])
+    mean_y = np.append(mean_y[1:], y[-1])
+    
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        area = np.abs((x[a] - mean_x[i]) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (mean_y[i] - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    
+    return selected
+
+
+def minmax_indices(y: np.ndarray, buckets: int) -> np.ndarray:
+    """
+    Min/max-per-bucket downsampling (keeps each bucket's extremes)
+    
+    Returns:
+        Indexes of the kept points (ascending, at most 2 x buckets)
+    """
+    n = len(y)
+    if 2 * buckets >= n:
+        return np.arange(n)
+    
+    size = -(-n // buckets)
+    padded = np.full(-(-n // size) * size, np.nan)
+    padded[:n] = y
+    rows = padded.reshape(-1, size)
+    offsets = np.arange(len(rows)) * size
+    return np.unique(np.concatenate([offsets + np.nanargmin(rows, axis=1),
+                                     offsets + np.nanargmax(rows, axis=1)]))
+
+
+def windowed_percentiles(x: np.ndarray, y: np.ndarray, percentiles: List[float],
+                         windows: int = TIMESERIES_WINDOWS):
+    """
+    Percentiles of y over consecutive, equally sized windows
+    
+    Returns:
+        (window centres on x, array of shape (len(percentiles), windows))
+    """
+    size = max(len(y) // windows, 1)
+    count = len(y) // size
+    rows = y[:count * size].reshape(count, size)
+    centres = x[:count * size].reshape(count, size)[:, size // 2]
+    return centres, np.percentile(rows, percentiles, axis=1)
+
+
+def create_timeseries_chart(data: Union[Dict, MetricIndex], metric: str, output: str,
+                            title: str = None, ylabel: str = None,
+                            time_metric: Optional[str] = None,
+                            max_points: int = TIMESERIES_POINTS,
+                            downsample: str = "lttb"):
+    """
+    Plot per-request values against time, baseline above hybrid
+    
+    Series are downsampled (LTTB, or min/max per bucket) to about
+    max_points before plotting, so the cost and file size do not grow
+    with the series; rolling p50/p99 are computed from the full series.
+    Needs per-request values (raw records or raw_values): summaries from
+    quantile sketches (--sketch, --stream, --cache, reduce, --follow)
+    are skipped with a warning.
+    
+    Args:
+        time_metric: Metric holding each request's time in seconds (e.g.
+            "seconds" from ab -g); default: request number
+        downsample: "lttb" or "minmax"
+    """
+    index = _as_index(data)
+    
+    if not index.has(metric):
+        print(f"WARNING: No data for metric '{metric}'", file=sys.stderr)
+        return
+    
+    for name in [metric] + ([time_metric] if time_metric else []):
+        if not index.has_requests(name):
+            print(f"WARNING: '{name}' has no per-request values (summary from quantile "
+                  f"sketches), skipping time series", file=sys.stderr)
+            return
+    
+    fig, axes = plt.subplots(2, 1, figsize=(12, 7), sharey=True)
+    
+    for ax, side, label in zip(axes, SIDES, ['Classical TLS', 'PQC Hybrid']):
+        y = np.asarray(index.values(metric, side), dtype=np.float64)
+        
+        x = None
+        if time_metric:
+            x = np.asarray(index.values(time_metric, side), dtype=np.float64)
+            if len(x) != len(y):
+                print(f"WARNING: '{time_metric}' does not match '{metric}' for {side}, "
+                      f"plotting against request number", file=sys.stderr)
+                x = None
+        if x is None:
+            x = np.arange(len(y), dtype=np.float64)
+            xlabel = 'Request #'
+        else:
+            if np.any(np.diff(x) < 0):
+                order = np.argsort(x, kind='stable')
+                x, y = x[order], y[order]
+            x = x - x[0]
+            xlabel = 'Elapsed (s)'
+        
+        keep = (lttb_indices(x, y, max_points) if downsample == "lttb"
+                else minmax_indices(y, max_points // 2))
+        ax.plot(x[keep], y[keep], color=COLORS[side], linewidth=0.6, alpha=0.5,
+                label=f'{label} ({len(y):,} requests)')
+        
+        centres, (p50, p99) = windowed_percentiles(x, y, [50, 99])
+        ax.plot(centres, p50, color=COLORS[side], linewidth=2, label='rolling p50')
+        ax.plot(centres, p99, color=COLORS['degradation'], linewidth=1.5,
+                linestyle='--', label='rolling p99')
+        
+        ax.set_ylabel(ylabel or metric, fontsize=11, fontweight='bold')
+        ax.set_xlabel(xlabel, fontsize=10)
+        ax.legend(loc='upper right', fontsize=9)
+        ax.grid(alpha=0.3)
+    
+    fig.suptitle(title or f'{metric} Over Time', fontsize=14, fontweight='bold')
+    plt.tight_layout()
+    plt.savefig(output, dpi=300, bbox_inches='tight')
+    plt.close()
+    
+    print(f"✓ Created: {output}", file=sys.stderr)
+
+
+def create_multi_metric_comparison(data: Union[Dict, MetricIndex], metrics: List[str], output: str):
     """
     Create multi-panel comparison for several metrics
     """
+    index = _as_index(data)
     n_metrics = len(metrics)
     fig, axes = plt.subplots(1, n_metrics, figsize=(5*n_metrics, 5))
     
@@ -199,17 +716,14 @@ def create_multi_metric_comparison(data: Dict, metrics: List[str], output: str):
         axes = [axes]
     
     for i, metric in enumerate(metrics):
-        values = extract_metric_comparison(data, metric)
-        
-        if not values["baseline"] or not values["hybrid"]:
+        if not index.has(metric):
             continue
         
         ax = axes[i]
         
-        baseline_mean = np.mean(values["baseline"])
-        hybrid_mean = np.mean(values["hybrid"])
-        baseline_std = np.std(values["baseline"])
-        hybrid_std = np.std(values["hybrid"])
+        baseline, hybrid = index.stats(metric, "baseline"), index.stats(metric, "hybrid")
+        baseline_mean, hybrid_mean = baseline["mean"], hybrid["mean"]
+        baseline_std, hybrid_std = baseline["std"], hybrid["std"]
         
         x = np.arange(2)
         bars = ax.bar(x, [baseline_mean, hybrid_mean], 0.6,
@@ -238,6 +752,269 @@ def create_multi_metric_comparison(data: Dict, metrics: List[str], output: str):
     print(f"✓ Created: {output}", file=sys.stderr)
 
 
+def chart_jobs(metrics: List[str], output_dir: str, fmt: str,
+               violin_threshold: int = VIOLIN_EXACT_LIMIT,
+               timeseries: bool = False, time_metric: Optional[str] = None,
+               downsample: str = "lttb") -> List[Dict[str, Any]]:
+    """
+    Charts to render for a set of metrics, in output order
+    
+    Each job is independent of the others, so they can be rendered in
+    any order or in parallel (see render_charts). Time-series charts are
+    only added when requested.
+    """
+    jobs = []
+    for metric in metrics:
+        label = metric.replace("_", " ").title()
+        jobs.append({"chart": "bar", "metrics": [metric],
+                     "output": os.path.join(output_dir, f'{metric}_comparison.{fmt}'),
+                     "title": f'{label} Comparison'})
+        jobs.append({"chart": "distribution", "metrics": [metric],
+                     "output": os.path.join(output_dir, f'{metric}_distribution.{fmt}'),
+                     "title": f'{label} Distribution', "violin_threshold": violin_threshold})
+        if timeseries:
+            jobs.append({"chart": "timeseries",
+                         "metrics": [metric] + ([time_metric] if time_metric else []),
+                         "output": os.path.join(output_dir, f'{metric}_timeseries.{fmt}'),
+                         "title": f'{label} Over Time', "time_metric": time_metric,
+                         "downsample": downsample})
+    
+    jobs.append({"chart": "multi", "metrics": list(metrics),
+                 "output": os.path.join(output_dir, f'multi_metric_comparison.{fmt}')})
+    return jobs
+
+
+def render_chart(job: Dict[str, Any], index: MetricIndex) -> float:
+    """
+    Render one chart job
+    
+    Args:
+        job: Entry from chart_jobs()
+        index: MetricIndex of the input data
+    
+    Returns:
+        Render time in seconds
+    """
+    start = time.perf_counter()
+    
+    if job["chart"] == "bar":
+        create_comparison_bar_chart(index, job["metrics"][0], job["output"], title=job["title"])
+    elif job["chart"] == "distribution":
+        create_distribution_plot(index, job["metrics"][0], job["output"], title=job["title"],
+                                 violin_threshold=job["violin_threshold"])
+    elif job["chart"] == "timeseries":
+        create_timeseries_chart(index, job["metrics"][0], job["output"], title=job["title"],
+                                time_metric=job["time_metric"], downsample=job["downsample"])
+    elif job["chart"] == "multi":
+        create_multi_metric_comparison(index, job["metrics"], job["output"])
+    else:
+        raise ValueError(f"Unknown chart type: {job['chart']}")
+    
+    return time.perf_counter() - start
+
+
+def share_series(index: MetricIndex, metrics: List[str]) -> Tuple[shared_memory.SharedMemory, Dict]:
+    """
+    Copy the indexed series of some metrics into one shared memory block
+    
+    Workers map the block instead of receiving pickled copies of every
+    series with every job.
+    
+    Returns:
+        (shared memory block, {(test_name, metric, side): (offset, length,
+        offset of the record positions or None)})
+    """
+    wanted = set(metrics)
+    layout = {}
+    total = 0
+    for key, values in index.series.items():
+        if key[1] in wanted:
+            positions = None
+            if key in index.positions:
+                positions = total + len(values)
+            layout[key] = (total, len(values), positions)
+            total += len(values) * (2 if positions is not None else 1)
+    
+    block = shared_memory.SharedMemory(create=True, size=max(total, 1) * 8)
+    column = np.ndarray((total,), dtype=np.float64, buffer=block.buf)
+    for key, (offset, length, positions) in layout.items():
+        column[offset:offset + length] = index.series[key]
+        if positions is not None:
+            column[positions:positions + length] = index.positions[key]
+    
+    return block, layout
+
+
+_worker_block: Optional[shared_memory.SharedMemory] = None
+_worker_index: Optional[MetricIndex] = None
+
+
+def _init_chart_worker(block_name: str, layout: Dict, stats: Dict, moments: Dict,
+                       sampled: set):
+    """Attach a render worker to the shared series (own Agg backend per process)"""
+    global _worker_block, _worker_index
+    matplotlib.use('Agg')
+    
+    _worker_block = shared_memory.SharedMemory(name=block_name)
+    column = np.ndarray((_worker_block.size // 8,), dtype=np.float64, buffer=_worker_block.buf)
+    
+    _worker_index = MetricIndex(
+        {key: column[offset:offset + length] for key, (offset, length, _) in layout.items()},
+        stats, moments,
+        {key: column[positions:positions + length].astype(np.int64)
+         for key, (_, length, positions) in layout.items() if positions is not None},
+        sampled)
+
+
+def _render_chart_job(job: Dict[str, Any]) -> float:
+    return render_chart(job, _worker_index)
+
+
+def _render_jobs(jobs: List[Dict[str, Any]], index: MetricIndex,
+                 workers: int = 1) -> List[Tuple[str, float]]:
+    """
+    Render chart jobs, in a process pool when workers > 1
+    
+    Returns:
+        [(output, render seconds)] in job order
+    """
+    if workers <= 1 or len(jobs) <= 1:
+        return [(job["output"], render_chart(job, index)) for job in jobs]
+    
+    # Statistics are computed once here rather than once per worker
+    metrics = list(dict.fromkeys(metric for job in jobs for metric in job["metrics"]))
+    index.precompute(metrics)
+    
+    block, layout = share_series(index, metrics)
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs)),
+                                 initializer=_init_chart_worker,
+                                 initargs=(block.name, layout, index._stats, index.moments,
+                                           index.sampled)) as pool:
+            futures = {pool.submit(_render_chart_job, job): i for i, job in enumerate(jobs)}
+            timings = [None] * len(jobs)
+            for future in as_completed(futures):
+                i = futures[future]
+                timings[i] = (jobs[i]["output"], future.result())
+    finally:
+        block.close()
+        block.unlink()
+    
+    return timings
+
+
+# Chart cache defaults (see evict_chart_cache)
+CACHE_MAX_MB = 500
+CACHE_MAX_AGE_DAYS = 30
+
+_renderer_digest: Optional[str] = None
+
+
+def _renderer_version() -> str:
+    """Digest of this script and matplotlib's version: changes to either invalidate cached charts"""
+    global _renderer_digest
+    if _renderer_digest is None:
+        with open(os.path.abspath(__file__), 'rb') as f:
+            h = hashlib.sha256(f.read())
+        h.update(matplotlib.__version__.encode('utf-8'))
+        _renderer_digest = h.hexdigest()
+    return _renderer_digest
+
+
+def chart_cache_key(job: Dict[str, Any], index: MetricIndex) -> str:
+    """
+    Content address of a chart: the series it plots, its options and the renderer
+    
+    The output path is left out (only its format counts), so identical
+    charts are shared between output directories.
+    """
+    options = {k: v for k, v in job.items() if k != "output"}
+    options["format"] = os.path.splitext(job["output"])[1]
+    h = hashlib.sha256(_renderer_version().encode('utf-8'))
+    h.update(json.dumps(options, sort_keys=True).encode('utf-8'))
+    for metric in job["metrics"]:
+        h.update(index.digest(metric).encode('utf-8'))
+    return h.hexdigest()
+
+
+def evict_chart_cache(cache_dir: str, max_bytes: int, max_age_days: float) -> int:
+    """
+    Drop cached charts older than max_age_days, then the least recently
+    used ones until the cache fits in max_bytes
+    
+    Returns:
+        Number of files removed
+    """
+    entries = []
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if os.path.isfile(path):
+            st = os.stat(path)
+            entries.append((st.st_mtime, st.st_size, path))
+    
+    entries.sort()
+    cutoff = time.time() - max_age_days * 86400
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for mtime, size, path in entries:
+        if mtime >= cutoff and total <= max_bytes:
+            break
+        os.remove(path)
+        total -= size
+        removed += 1
+    
+    return removed
+
+
+def render_charts(jobs: List[Dict[str, Any]], index: MetricIndex, workers: int = 1,
+                  cache_dir: Optional[str] = None) -> List[Tuple[str, float, bool]]:
+    """
+    Render chart jobs, reusing identical charts from cache_dir
+    
+    A cache hit copies the stored file to the job's output (and marks it
+    recently used); misses are rendered, in a process pool when
+    workers > 1, and stored. A miss replaces any existing file at its
+    output, so a chart skipped for lack of data leaves none.
+    
+    Returns:
+        [(output, seconds, cache hit)] in job order
+    """
+    if not cache_dir:
+        return [(output, seconds, False) for output, seconds in _render_jobs(jobs, index, workers)]
+    
+    os.makedirs(cache_dir, exist_ok=True)
+    results: List[Optional[Tuple[str, float, bool]]] = [None] * len(jobs)
+    misses = []
+    for i, job in enumerate(jobs):
+        start = time.perf_counter()
+        entry = os.path.join(cache_dir, chart_cache_key(job, index)
+                             + os.path.splitext(job["output"])[1])
+        if os.path.exists(entry):
+            shutil.copyfile(entry, job["output"])
+            os.utime(entry)
+            results[i] = (job["output"], time.perf_counter() - start, True)
+            print(f"✓ Cached: {job['output']}", file=sys.stderr)
+        else:
+            misses.append((i, entry))
+    
+    # A chart skipped for lack of data must not leave an earlier run's file
+    # behind to be cached under this content key
+    for i, _ in misses:
+        if os.path.exists(jobs[i]["output"]):
+            os.remove(jobs[i]["output"])
+    
+    rendered = _render_jobs([jobs[i] for i, _ in misses], index, workers)
+    for (i, entry), (output, seconds) in zip(misses, rendered):
+        results[i] = (output, seconds, False)
+        # Charts skipped for lack of data write no file to cache
+        if os.path.exists(output):
+            tmp_path = f"{entry}.tmp.{os.getpid()}"
+            shutil.copyfile(output, tmp_path)
+            os.replace(tmp_path, entry)
+    
+    return results
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Generate performance comparison charts'
@@ -269,6 +1046,65 @@ def main():
         help='Output format (default: png)'
     )
     
+    parser.add_argument(
+        '--violin-threshold',
+        type=int,
+        default=VIOLIN_EXACT_LIMIT,
+        help='Use a binned KDE for distribution plots of series longer than this '
+             f'(default: {VIOLIN_EXACT_LIMIT})'
+    )
+    
+    parser.add_argument(
+        '--timeseries',
+        action='store_true',
+        help='Also plot each metric per request over time (with rolling p50/p99)'
+    )
+    
+    parser.add_argument(
+        '--time-metric',
+        help='Metric holding request times in seconds for --timeseries '
+             '(default: plot against request number)'
+    )
+    
+    parser.add_argument(
+        '--downsample',
+        choices=DOWNSAMPLE_METHODS,
+        default='lttb',
+        help='Downsampling for --timeseries: lttb or minmax per bucket (default: lttb)'
+    )
+    
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='Render charts in N worker processes (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--cache-dir',
+        help='Render cache directory (default: OUTPUT_DIR/.chart-cache)'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Render every chart, ignoring and not updating the cache'
+    )
+    
+    parser.add_argument(
+        '--cache-max-mb',
+        type=float,
+        default=CACHE_MAX_MB,
+        help=f'Evict least recently used charts beyond this size (default: {CACHE_MAX_MB})'
+    )
+    
+    parser.add_argument(
+        '--cache-max-age-days',
+        type=float,
+        default=CACHE_MAX_AGE_DAYS,
+        help=f'Evict charts unused for this many days (default: {CACHE_MAX_AGE_DAYS})'
+    )
+    
     args = parser.parse_args()
     
     try:
@@ -276,30 +1112,43 @@ def main():
         data = load_aggregated_data(args.input)
         
         # Create output directory
-        import os
         os.makedirs(args.output_dir, exist_ok=True)
         
-        # Generate charts for each metric
-        for metric in args.metrics:
-            # Bar chart
-            bar_output = os.path.join(args.output_dir, f'{metric}_comparison.{args.format}')
-            create_comparison_bar_chart(data, metric, bar_output,
-                                         title=f'{metric.replace("_", " ").title()} Comparison')
-            
-            # Distribution plot
-            dist_output = os.path.join(args.output_dir, f'{metric}_distribution.{args.format}')
-            create_distribution_plot(data, metric, dist_output,
-                                      title=f'{metric.replace("_", " ").title()} Distribution')
+        # Bar chart and distribution plot per metric, plus the multi-metric panel
+        index = MetricIndex.from_data(data)
+        jobs = chart_jobs(args.metrics, args.output_dir, args.format,
+                          violin_threshold=args.violin_threshold,
+                          timeseries=args.timeseries, time_metric=args.time_metric,
+                          downsample=args.downsample)
+        
+        cache_dir = None
+        if not args.no_cache:
+            cache_dir = args.cache_dir or os.path.join(args.output_dir, '.chart-cache')
         
-        # Multi-metric comparison
-        multi_output = os.path.join(args.output_dir, f'multi_metric_comparison.{args.format}')
-        create_multi_metric_comparison(data, args.metrics, multi_output)
+        start = time.perf_counter()
+        timings = render_charts(jobs, index, workers=args.jobs, cache_dir=cache_dir)
+        elapsed = time.perf_counter() - start
+        
+        if cache_dir:
+            evicted = evict_chart_cache(cache_dir, int(args.cache_max_mb * 1024 * 1024),
+                                        args.cache_max_age_days)
+            hits = sum(1 for _, _, cached in timings if cached)
+            print(f"✓ Cache: {hits} reused, {len(timings) - hits} rendered, {evicted} evicted",
+                  file=sys.stderr)
+        
+        print("", file=sys.stderr)
+        print("Render times:", file=sys.stderr)
+        for output, seconds, cached in timings:
+            print(f"  {seconds:7.2f}s  {os.path.basename(output)}{' (cached)' if cached else ''}",
+                  file=sys.stderr)
+        print(f"  {elapsed:7.2f}s  total ({args.jobs} job{'s' if args.jobs != 1 else ''})",
+              file=sys.stderr)
         
         print("", file=sys.stderr)
         print("=" * 50, file=sys.stderr)
         print("CHART GENERATION COMPLETE", file=sys.stderr)
         print("=" * 50, file=sys.stderr)
-        print(f"Charts generated: {len(args.metrics) * 2 + 1}", file=sys.stderr)
+        print(f"Charts generated: {len(jobs)}", file=sys.stderr)
         print(f"Output directory: {args.output_dir}", file=sys.stderr)
         print("=" * 50, file=sys.stderr)
         
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Open-Loop HTTP(S) Load Generator
+Sends requests at a fixed target rate from one process per core and
+measures latency from each request's intended send time
+สร้างโหลดแบบ open-loop ตามอัตราที่กำหนด (แก้ coordinated omission)
+"""
+
+import os
+import ssl
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional
+from urllib.parse import urlsplit
+
+
+def load_calculate_stats():
+    """Import calculate-stats.py from this directory (hyphenated file name)"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'calculate-stats.py')
+    spec = importlib.util.spec_from_file_location('calculate_stats', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+calculate_stats = load_calculate_stats()
+
+
+class Target:
+    """Parsed request target plus the bytes of the request to send"""
+    
+    def __init__(self, url: str, keep_alive: bool, insecure: bool):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported URL scheme: {url}")
+        
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.keep_alive = keep_alive
+        self.context = None
+        if parts.scheme == 'https':
+            self.context = ssl.create_default_context()
+            if insecure:
+                self.context.check_hostname = False
+                self.context.verify_mode = ssl.CERT_NONE
+        
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        self.request = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {parts.netloc}\r\n"
+            f"User-Agent: pqc-load-generator\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode('ascii')
+
+
+async def _read_body(reader: asyncio.StreamReader, status: int, headers: Dict[str, str]) -> bool:
+    """
+    Read a response body; returns whether its end was delimited, so the
+    connection can be reused
+    
+    Handles bodiless statuses, chunked transfer coding and Content-Length;
+    anything else is delimited by the server closing the connection.
+    """
+    if 100 <= status < 200 or status in (204, 304):
+        return True
+    if 'chunked' in headers.get('transfer-encoding', ''):
+        while True:
+            size_line = await reader.readline()
+            if not size_line:
+                raise asyncio.IncompleteReadError(b"", None)
+            size = int(size_line.split(b";")[0], 16)
+            if size == 0:
+                break
+            await reader.readexactly(size + 2)
+        # Trailer fields, up to the empty line
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        return True
+    if 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+        return True
+    await reader.read()
+    return False
+
+
+async def send_request(target: Target, pool: List, timeout: float) -> int:
+    """
+    Send one GET and read the whole response; returns the status code
+    
+    Without keep-alive every request opens (and handshakes) a new
+    connection, like `ab` without -k. With keep-alive, idle connections
+    are taken from and returned to `pool`.
+    """
+    if pool:
+        reader, writer = pool.pop()
+    else:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(
+            target.host, target.port, ssl=target.context,
+            server_hostname=target.host if target.context else None), timeout)
+    
+    reusable = False
+    try:
+        writer.write(target.request)
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        if not status_line:
+            raise ConnectionError("Connection closed before response")
+        status = int(status_line.split()[1])
+        
+        headers = {}
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip().lower()
+        
+        if await asyncio.wait_for(_read_body(reader, status, headers), timeout):
+            reusable = target.keep_alive and headers.get('connection') != 'close'
+        return status
+    finally:
+        if reusable:
+            pool.append((reader, writer))
+        else:
+            writer.close()
+
+
+def _pin_to_cpu(worker_id: int) -> Optional[int]:
+    """Pin this process to one CPU of the allowed set (Linux only)"""
+    if not hasattr(os, 'sched_setaffinity'):
+        return None
+    cpus = sorted(os.sched_getaffinity(0))
+    cpu = cpus[worker_id % len(cpus)]
+    os.sched_setaffinity(0, {cpu})
+    return cpu
+
+
+async def _run_schedule(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Issue this worker's share of the schedule and record latencies"""
+    target = Target(task["url"], task["keep_alive"], task["insecure"])
+    histogram_options = task["histogram"]
+    latency = calculate_stats.LatencyHistogram(**histogram_options)
+    service_time = calculate_stats.LatencyHistogram(**histogram_options)
+    
+    rng = random.Random(task["seed"])
+    interval = task["workers"] / task["rate"]
+    in_flight = asyncio.Semaphore(task["max_in_flight"])
+    pool: List = []
+    pending = set()
+    counts = {"sent": 0, "completed": 0, "errors": 0, "non_2xx": 0, "censored": 0}
+    errors: Dict[str, int] = {}
+    max_lag = 0.0
+    
+    def failed(kind: str):
+        counts["errors"] += 1
+        errors[kind] = errors.get(kind, 0) + 1
+    
+    def censored(intended: float, started: Optional[float]):
+        # Timed out or abandoned: the request took at least this long, and
+        # leaving it out would drop exactly the slowest requests
+        now = time.perf_counter()
+        counts["censored"] += 1
+        latency.record((now - intended) * 1000)
+        if started is not None:
+            service_time.record((now - started) * 1000)
+    
+    async def issue(intended: float):
+        nonlocal max_lag
+        started = None
+        try:
+            async with in_flight:
+                started = time.perf_counter()
+                max_lag = max(max_lag, started - intended)
+                status = await send_request(target, pool, task["timeout"])
+                done = time.perf_counter()
+        except asyncio.TimeoutError:
+            failed("TimeoutError")
+            censored(intended, started)
+            return
+        except asyncio.CancelledError:
+            # Still outstanding when the run ended
+            failed("Cancelled")
+            censored(intended, started)
+            raise
+        except (OSError, ssl.SSLError, ValueError,
+                asyncio.IncompleteReadError, IndexError) as e:
+            failed(type(e).__name__)
+            return
+        
+        counts["completed"] += 1
+        if not 200 <= status < 300:
+            counts["non_2xx"] += 1
+        # Latency counts from when the request *should* have been sent
+        latency.record((done - intended) * 1000)
+        service_time.record((done - started) * 1000)
+    
+    # All workers start together; worker i is offset by i / rate so the
+    # merged schedule is evenly spaced
+    await asyncio.sleep(max(0.0, task["start_at"] - time.time()))
+    start = time.perf_counter()
+    end = start + task["duration"]
+    intended = start + task["worker_id"] / task["rate"]
+    
+    while intended < end:
+        now = time.perf_counter()
+        if intended > now:
+            await asyncio.sleep(intended - now)
+        
+        request = asyncio.ensure_future(issue(intended))
+        pending.add(request)
+        request.add_done_callback(pending.discard)
+        counts["sent"] += 1
+        
+        if task["arrival"] == "poisson":
+            intended += rng.expovariate(1 / interval)
+        else:
+            intended += interval
+    
+    if pending:
+        _, leftover = await asyncio.wait(pending, timeout=task["timeout"] * 2)
+        for request in leftover:
+            request.cancel()
+        await asyncio.gather(*leftover, return_exceptions=True)
+    for reader, writer in pool:
+        writer.close()
+    
+    return {
+        "worker_id": task["worker_id"],
+        "counts": counts,
+        "errors": errors,
+        "max_schedule_lag_ms": max_lag * 1000,
+        "elapsed_s": time.perf_counter() - start,
+        "latency_ms": latency.to_dict(),
+        "service_time_ms": service_time.to_dict(),
+    }
+
+
+def run_worker(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Process entry point: optional CPU pinning, then the asyncio schedule"""
+    cpu = _pin_to_cpu(task["worker_id"]) if task["pin"] else None
+    result = asyncio.run(_run_schedule(task))
+    result["cpu"] = cpu
+    return result
+
+
+def merge_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge per-worker counts and histograms"""
+    HistogramType = calculate_stats.LatencyHistogram
+    merged = {"counts": {}, "errors": {}, "max_schedule_lag_ms": 0.0, "elapsed_s": 0.0}
+    latency = service_time = None
+    
+    for result in results:
+        for key, value in result["counts"].items():
+            merged["counts"][key] = merged["counts"].get(key, 0) + value
+        for key, value in result["errors"].items():
+            merged["errors"][key] = merged["errors"].get(key, 0) + value
+        merged["max_schedule_lag_ms"] = max(merged["max_schedule_lag_ms"], result["max_schedule_lag_ms"])
+        merged["elapsed_s"] = max(merged["elapsed_s"], result["elapsed_s"])
+        
+        worker_latency = HistogramType.from_dict(result["latency_ms"])
+        worker_service = HistogramType.from_dict(result["service_time_ms"])
+        latency = worker_latency if latency is None else latency.merge(worker_latency)
+        service_time = worker_service if service_time is None else service_time.merge(worker_service)
+    
+    merged["latency_ms"] = latency
+    merged["service_time_ms"] = service_time
+    return merged
+
+
+def main():
+    """
+    CLI interface for the load generator
+    
+    Usage examples:
+        # 2000 req/s for 30s against the hybrid server, one process per core
+        python3 load-generator.py https://localhost:8443/ --rate 2000 --duration 30 -k
+        
+        # Keep-alive connections, Poisson arrivals, pinned workers, JSON result
+        python3 load-generator.py https://localhost:8443/ --rate 5000 --keep-alive \\
+            --arrival poisson --pin --output results/load-hybrid.json
+        
+        # Summarise a saved result (histograms are calculate-stats inputs)
+        python3 calculate-stats.py --input results/load-hybrid.json --metric latency_ms
+    
+    "latency" is measured from the scheduled send time, so it includes
+    time spent waiting behind a slow server (no coordinated omission);
+    "service time" is measured from the actual send and is what a
+    closed-loop tool like ab reports. Requests that time out or are still
+    outstanding at the end count as errors and are recorded at the time
+    they were given up on ("censored": their true latency is higher).
+    """
+    parser = argparse.ArgumentParser(
+        description='Open-loop (fixed-rate) HTTP(S) load generator'
+    )
+    parser.add_argument('url', help='Target URL (http:// or https://)')
+    parser.add_argument('--rate', '-r', type=float, required=True,
+                        help='Target request rate across all workers (req/s)')
+    parser.add_argument('--duration', '-d', type=float, default=10.0,
+                        help='Test duration in seconds (default: 10)')
+    parser.add_argument('--workers', '-w', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (default: one per core)')
+    parser.add_argument('--pin', action='store_true',
+                        help='Pin each worker to its own CPU (Linux)')
+    parser.add_argument('--arrival', choices=['uniform', 'poisson'], default='uniform',
+                        help='Inter-arrival schedule (default: uniform)')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Seed for Poisson arrivals')
+    parser.add_argument('--keep-alive', action='store_true',
+                        help='Reuse connections (default: new TLS connection per request, like ab)')
+    parser.add_argument('--max-in-flight', type=int, default=1000,
+                        help='Concurrent requests per worker; later requests wait, and their '
+                             'waiting time is counted in the latency (default: 1000)')
+    parser.add_argument('--timeout', type=float, default=10.0,
+                        help='Per-request timeout in seconds (default: 10)')
+    parser.add_argument('--insecure', '-k', action='store_true',
+                        help='Do not verify the server certificate (self-signed lab certs)')
+    parser.add_argument('--significant-digits', type=int, default=3,
+                        help='Histogram precision (default: 3 = 0.1%%)')
+    parser.add_argument('--percentiles', '-p', default='50,90,99,99.9',
+                        help='Percentiles to report (default: 50,90,99,99.9)')
+    parser.add_argument('--output', '-o', help='Write results (with histograms) as JSON')
+    parser.add_argument('--format', choices=['text', 'json'], default='text',
+                        help='Report format')
+    args = parser.parse_args()
+    
+    if args.rate <= 0 or args.duration <= 0 or args.workers < 1 or args.max_in_flight < 1:
+        parser.error("--rate, --duration, --workers and --max-in-flight must be positive")
+    try:
+        percentiles = [float(p) for p in args.percentiles.split(',') if p.strip()]
+    except ValueError:
+        parser.error(f"invalid --percentiles: {args.percentiles}")
+    
+    try:
+        Target(args.url, args.keep_alive, args.insecure)
+        
+        # Latency counts from the scheduled send time, so a request queued
+        # from the start and abandoned after the end-of-run wait (2x timeout)
+        # takes up to duration + 2x timeout; keep headroom above that
+        highest_ms = (args.duration + args.timeout * 3) * 1000
+        workers = min(args.workers, max(1, int(args.rate * args.duration)))
+        seeds = random.Random(args.seed).sample(range(2 ** 31), workers)
+        start_at = time.time() + 0.5 + 0.05 * workers
+        tasks = [{
+            "worker_id": i, "workers": workers, "url": args.url,
+            "rate": args.rate, "duration": args.duration, "start_at": start_at,
+            "arrival": args.arrival, "seed": seeds[i], "pin": args.pin,
+            "keep_alive": args.keep_alive, "insecure": args.insecure,
+            "max_in_flight": args.max_in_flight, "timeout": args.timeout,
+            "histogram": {"significant_digits": args.significant_digits,
+                          "lowest": 0.001, "highest": highest_ms},
+        } for i in range(workers)]
+        
+        print(f"Sending {args.rate:g} req/s for {args.duration:g}s to {args.url} "
+              f"with {workers} worker(s)...", file=sys.stderr)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run_worker, tasks))
+        
+        merged = merge_results(results)
+        counts = merged["counts"]
+        if counts.get("completed", 0) == 0:
+            raise RuntimeError(f"No request completed (errors: {merged['errors']})")
+        
+        report = {
+            "config": {"url": args.url, "rate": args.rate, "duration_s": args.duration,
+                       "workers": workers, "arrival": args.arrival, "keep_alive": args.keep_alive,
+                       "pinned_cpus": [r["cpu"] for r in results] if args.pin else None},
+            "requests": {**counts, "errors_by_type": merged["errors"],
+                         "clamped_latencies": merged["latency_ms"].clamped,
+                         "achieved_rate": counts["completed"] / merged["elapsed_s"]},
+            "max_schedule_lag_ms": merged["max_schedule_lag_ms"],
+            "latency": calculate_stats.calculate_stats(merged["latency_ms"], percentiles),
+            "service_time": calculate_stats.calculate_stats(merged["service_time_ms"], percentiles),
+            "latency_ms": merged["latency_ms"].to_dict(),
+            "service_time_ms": merged["service_time_ms"].to_dict(),
+        }
+        
+        if merged["latency_ms"].clamped:
+            print(f"WARNING: {merged['latency_ms'].clamped} latencies above {highest_ms:g} ms "
+                  f"were clamped; tail percentiles are understated", file=sys.stderr)
+        
+        if args.output:
+            output_dir = os.path.dirname(args.output)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            with open(args.output, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"✓ Results written to {args.output}", file=sys.stderr)
+        
+        if args.format == 'json':
+            print(json.dumps({k: v for k, v in report.items()
+                              if k not in ("latency_ms", "service_time_ms")}, indent=2))
+        else:
+            print(f"Requests: {counts['sent']} sent, {counts['completed']} completed, "
+                  f"{counts['errors']} errors, {counts['non_2xx']} non-2xx; "
+                  f"{counts['censored']} censored (timed out/abandoned, recorded as lower bounds); "
+                  f"achieved {report['requests']['achieved_rate']:.1f} req/s "
+                  f"(max schedule lag {report['max_schedule_lag_ms']:.1f} ms)")
+            print(calculate_stats.format_report(report["latency"], "Latency (from intended send time)"))
+            print(calculate_stats.format_report(report["service_time"], "Service Time (from actual send)"))
+    
+    except Exception as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""
+Shared helpers for the script tests
+
+The scripts have hyphenated file names, so they are loaded from their
+paths rather than imported.
+"""
+
+import importlib.util
+import os
+
+import pytest
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+
+
+def load_script(name: str):
+    """Load scripts/<name>.py as a module"""
+    path = os.path.join(SCRIPTS_DIR, f"{name}.py")
+    spec = importlib.util.spec_from_file_location(name.replace("-", "_"), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def aggregate_data():
+    return load_script("aggregate-data")
+
+
+@pytest.fixture(scope="session")
+def calculate_stats():
+    return load_script("calculate-stats")
+
+
+@pytest.fixture(scope="session")
+def generate_charts():
+    return load_script("generate-charts")
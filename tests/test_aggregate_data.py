@@ -0,0 +1,108 @@
+"""Tests for scripts/aggregate-data.py"""
+
+import json
+import os
+import random
+import statistics
+import time
+
+import pytest
+
+
+@pytest.mark.parametrize("n", [2, 4, 6, 10, 50])
+def test_streaming_median_matches_statistics_median_for_even_counts(aggregate_data, n):
+    rng = random.Random(n)
+    for _ in range(20):
+        values = [rng.lognormvariate(2, 1) for _ in range(n)]
+        running = aggregate_data.RunningStats(relative_accuracy=0.01)
+        for value in values:
+            running.add(value)
+        
+        median = running.to_summary()["median"]
+        assert median == pytest.approx(statistics.median(values), rel=0.01)
+
+
+def test_sketch_quantile_interpolates_between_ranks(aggregate_data):
+    sketch = aggregate_data.QuantileSketch.from_values([10.0, 20.0], relative_accuracy=0.001)
+    assert sketch.quantile(0.5) == pytest.approx(15.0, rel=0.001)
+    assert sketch.quantile(0.0) == pytest.approx(10.0, rel=0.001)
+    assert sketch.quantile(1.0) == pytest.approx(20.0, rel=0.001)
+
+
+def test_cached_summary_skips_files_deleted_after_glob(aggregate_data, tmp_path, monkeypatch):
+    for side in ("baseline", "hybrid"):
+        (tmp_path / side).mkdir()
+        (tmp_path / side / "run.json").write_text(
+            '{"test_name": "t", "handshake_time_ms": 10.0}')
+    
+    glob_files = aggregate_data._glob_files
+    monkeypatch.setattr(aggregate_data, "_glob_files",
+                        lambda pattern: glob_files(pattern) + [str(tmp_path / "gone.json")])
+    
+    summary = aggregate_data.cached_summary(str(tmp_path / "baseline"), str(tmp_path / "hybrid"),
+                                            str(tmp_path / "cache.json"))
+    
+    stats = summary["metrics"]["t"]["handshake_time_ms"]
+    assert stats["baseline"]["count"] == 1
+    assert stats["hybrid"]["count"] == 1
+
+
+def test_group_series_accepts_list_and_object_group_values(aggregate_data):
+    data = [
+        {"test_name": "t", "groups": ["x25519", "mlkem768"], "opts": {"b": 1, "a": 2}, "ms": 1.0},
+        {"test_name": "t", "groups": ["x25519", "mlkem768"], "opts": {"a": 2, "b": 1}, "ms": 2.0},
+        {"test_name": "t", "groups": ["x25519"], "opts": {}, "ms": 3.0},
+    ]
+    
+    grouped = aggregate_data.group_series(data, ["ms"], ["groups", "opts"], numeric_only=True)
+    
+    assert grouped == {
+        ('["x25519", "mlkem768"]', '{"a": 2, "b": 1}'): {"ms": [1.0, 2.0]},
+        ('["x25519"]', '{}'): {"ms": [3.0]},
+    }
+
+
+def _write_jsonl(path, values):
+    with open(path, "w") as f:
+        for value in values:
+            f.write(json.dumps({"test_name": "t", "latency_ms": value}) + "\n")
+
+
+def test_follower_rereads_file_rewritten_in_place(aggregate_data, tmp_path):
+    for side in ("baseline", "hybrid"):
+        (tmp_path / side).mkdir()
+    path = tmp_path / "baseline" / "run.jsonl"
+    follower = aggregate_data.ResultFollower(
+        {"baseline": str(tmp_path / "baseline"), "hybrid": str(tmp_path / "hybrid")})
+    
+    _write_jsonl(path, [1.0, 2.0])
+    follower.poll()
+    # Truncate and rewrite the same file, larger than before
+    _write_jsonl(path, [5.0, 6.0, 7.0])
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+    follower.poll()
+    
+    summary = follower.summary()
+    stats = summary["metrics"]["t"]["latency_ms"]["baseline"]
+    assert summary["metadata"]["baseline_tests"] == 3
+    assert stats["count"] == 3
+    assert stats["mean"] == pytest.approx(6.0)
+
+
+def test_follower_reads_only_appended_lines(aggregate_data, tmp_path):
+    for side in ("baseline", "hybrid"):
+        (tmp_path / side).mkdir()
+    path = tmp_path / "baseline" / "run.jsonl"
+    follower = aggregate_data.ResultFollower(
+        {"baseline": str(tmp_path / "baseline"), "hybrid": str(tmp_path / "hybrid")})
+    
+    _write_jsonl(path, [1.0, 2.0])
+    follower.poll()
+    with open(path, "a") as f:
+        f.write(json.dumps({"test_name": "t", "latency_ms": 3.0}) + "\n")
+    follower.poll()
+    
+    assert follower.files[str(path)]["offset"] == path.stat().st_size
+    stats = follower.summary()["metrics"]["t"]["latency_ms"]["baseline"]
+    assert stats["count"] == 3
+    assert stats["mean"] == pytest.approx(2.0)
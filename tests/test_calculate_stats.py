@@ -0,0 +1,106 @@
+"""Tests for scripts/calculate-stats.py"""
+
+import io
+import os
+import random
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from conftest import SCRIPTS_DIR
+
+SCRIPT = os.path.join(SCRIPTS_DIR, "calculate-stats.py")
+
+
+def run_script(*args, stdin=b""):
+    return subprocess.run([sys.executable, SCRIPT, *args], input=stdin,
+                          capture_output=True)
+
+
+def test_stream_without_stdin_is_an_error():
+    result = run_script("--stream", "--input", "missing.json")
+    assert result.returncode == 2
+    assert b"--stream requires --stdin" in result.stderr
+
+
+@pytest.mark.parametrize("text", [b"3\n-2 5\n\n1.5\n-7\n4\n", b"1 2 3", b"  0.5\n\n2.5  \n"])
+def test_stdin_and_stream_accept_the_same_input(calculate_stats, text):
+    values = calculate_stats.parse_values(text)
+    exact = calculate_stats.calculate_stats(values)
+    streamed = calculate_stats.stream_stats(io.BytesIO(text))
+    
+    for key in ("count", "min", "max", "mean", "stdev"):
+        assert streamed[key] == pytest.approx(exact[key], rel=1e-3)
+
+
+def test_stdin_and_stream_reject_the_same_input():
+    for args in (("--stdin",), ("--stdin", "--stream")):
+        result = run_script(*args, stdin=b"1\nabc\n")
+        assert result.returncode == 1
+        assert b"could not convert" in result.stderr
+
+
+def batch_records(test_name, values):
+    return [{"test_name": test_name, "latency_ms": v} for v in values]
+
+
+@pytest.mark.parametrize("test", ["welch", "mannwhitney"])
+def test_batch_significance_follows_the_chosen_test_only(calculate_stats, test):
+    pytest.importorskip("scipy")
+    # Same mean, very different shape: Welch sees nothing, Mann-Whitney does
+    rng = random.Random(3)
+    baseline = [rng.gauss(11, 1) for _ in range(200)]
+    treatment = [rng.gauss(10, 0.3) for _ in range(180)] + [rng.gauss(20, 1) for _ in range(20)]
+    
+    batch = calculate_stats.batch_compare(batch_records("t", baseline),
+                                          batch_records("t", treatment),
+                                          metrics=["latency_ms"], test=test)
+    result = batch["results"][0]
+    
+    assert batch["test"] == test
+    assert result["welch"]["p_adjusted"] > 0.05
+    assert result["mann_whitney"]["p_adjusted"] < 0.05
+    assert result["significant"] is (test == "mannwhitney")
+
+
+def test_batch_rejects_unknown_test(calculate_stats):
+    pytest.importorskip("scipy")
+    with pytest.raises(ValueError):
+        calculate_stats.batch_compare(batch_records("t", [1, 2]), batch_records("t", [1, 2]),
+                                      test="both")
+
+
+@pytest.mark.parametrize("n, method", [
+    (10, "index"),
+    (1024, "index"),
+    (1025, "order-statistics"),
+    (100_000, "order-statistics"),
+    (100_001, "order-statistics"),
+])
+def test_bootstrap_method_follows_sample_size(calculate_stats, n, method):
+    data = [float(i % 5000) for i in range(n)]
+    
+    assert calculate_stats._bootstrap_support(data)[0] == method
+    result = calculate_stats.bootstrap_differences(data, data, resamples=10, seed=1)
+    assert result["method"] == {"baseline": method, "treatment": method}
+
+
+def test_batch_mann_whitney_matches_separate_tests(calculate_stats):
+    from scipy import stats as scipy_stats
+    
+    rng = random.Random(5)
+    samples = [
+        ([rng.gauss(10, 1) for _ in range(n)], [rng.gauss(10.5, 1) for _ in range(m)])
+        for n, m in [(30, 30), (30, 30), (30, 25), (5, 6), (5, 6)]
+    ]
+    samples.append(([1.0, 2.0, 2.0, 3.0, 4.0], [2.0, 3.0, 5.0, 6.0, 7.0, 8.0]))
+    samples = [(np.asarray(b), np.asarray(t)) for b, t in samples]
+    
+    u, p = calculate_stats._mann_whitney_batch(samples)
+    
+    for i, (b, t) in enumerate(samples):
+        expected = scipy_stats.mannwhitneyu(t, b, alternative='two-sided')
+        assert u[i] == pytest.approx(expected.statistic)
+        assert p[i] == pytest.approx(expected.pvalue)
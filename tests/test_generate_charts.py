@@ -0,0 +1,116 @@
+"""Tests for scripts/generate-charts.py"""
+
+import math
+import os
+import random
+
+import pytest
+
+
+def sketch_summary(aggregate_data, series):
+    """Summary in the --sketch/--stream format: {test_name: {side: values}} for one metric"""
+    summary = {"metadata": {}, "metrics": {}}
+    for test_name, sides in series.items():
+        entry = summary["metrics"].setdefault(test_name, {})["latency_ms"] = {}
+        for side, values in sides.items():
+            running = aggregate_data.RunningStats()
+            for value in values:
+                running.add(value)
+            entry[side] = running.to_summary()
+    return summary
+
+
+def test_sketch_summary_uses_stored_moments(aggregate_data, generate_charts):
+    rng = random.Random(1)
+    baseline = [rng.lognormvariate(2, 0.8) for _ in range(5000)]
+    hybrid = [rng.lognormvariate(2.3, 0.8) for _ in range(3000)]
+    summary = sketch_summary(aggregate_data, {"t": {"baseline": baseline, "hybrid": hybrid}})
+    
+    index = generate_charts.MetricIndex.from_data(summary)
+    for side, values in (("baseline", baseline), ("hybrid", hybrid)):
+        stats = index.stats("latency_ms", side)
+        mean = sum(values) / len(values)
+        assert stats["count"] == len(values)
+        assert stats["mean"] == pytest.approx(mean, rel=1e-12)
+        assert stats["std"] == pytest.approx(
+            math.sqrt(sum((v - mean) ** 2 for v in values) / len(values)), rel=1e-9)
+        assert stats["max"] == max(values)
+
+
+def test_pooled_sketch_moments_across_test_names(aggregate_data, generate_charts):
+    rng = random.Random(2)
+    a = [rng.uniform(1, 5) for _ in range(400)]
+    b = [rng.uniform(10, 20) for _ in range(600)]
+    summary = sketch_summary(aggregate_data, {"a": {"baseline": a, "hybrid": a},
+                                              "b": {"baseline": b, "hybrid": b}})
+    
+    stats = generate_charts.MetricIndex.from_data(summary).stats("latency_ms", "baseline")
+    pooled = a + b
+    mean = sum(pooled) / len(pooled)
+    assert stats["count"] == len(pooled)
+    assert stats["mean"] == pytest.approx(mean, rel=1e-12)
+    assert stats["std"] == pytest.approx(
+        math.sqrt(sum((v - mean) ** 2 for v in pooled) / len(pooled)), rel=1e-9)
+    assert (stats["min"], stats["max"]) == (min(pooled), max(pooled))
+
+
+def test_pooled_raw_values_keep_record_order(generate_charts):
+    records = [{"test_name": "ab"[i % 2], "latency_ms": float(i)} for i in range(10)]
+    data = {"baseline": records, "hybrid": records[:3]}
+    
+    index = generate_charts.MetricIndex.from_data(data)
+    assert index.values("latency_ms", "baseline").tolist() == [float(i) for i in range(10)]
+    assert index.values("latency_ms", "baseline", "a").tolist() == [0.0, 2.0, 4.0, 6.0, 8.0]
+    assert index.values("latency_ms", "hybrid").tolist() == [0.0, 1.0, 2.0]
+
+
+def test_sketch_summary_produces_no_timeseries_chart(aggregate_data, generate_charts,
+                                                     tmp_path, capsys):
+    rng = random.Random(4)
+    values = [rng.lognormvariate(2, 0.5) for _ in range(1000)]
+    summary = sketch_summary(aggregate_data, {"t": {"baseline": values, "hybrid": values}})
+    output = tmp_path / "latency_ms_timeseries.png"
+    
+    generate_charts.create_timeseries_chart(summary, "latency_ms", str(output))
+    
+    assert not output.exists()
+    assert "no per-request values" in capsys.readouterr().err
+
+
+def test_raw_values_summary_produces_timeseries_chart(generate_charts, tmp_path):
+    summary = {"metrics": {"t": {"latency_ms": {
+        "baseline": {"raw_values": [1.0, 2.0, 3.0, 4.0]},
+        "hybrid": {"raw_values": [2.0, 3.0, 4.0, 5.0]},
+    }}}}
+    output = tmp_path / "latency_ms_timeseries.png"
+    
+    generate_charts.create_timeseries_chart(summary, "latency_ms", str(output))
+    
+    assert output.exists()
+
+
+def test_cache_does_not_store_stale_output_of_skipped_chart(generate_charts, tmp_path):
+    index = generate_charts.MetricIndex.from_data({"metrics": {"t": {"latency_ms": {
+        "baseline": {"raw_values": [1.0, 2.0, 3.0]},
+        "hybrid": {"raw_values": [2.0, 3.0, 4.0]},
+    }}}})
+    cache_dir = tmp_path / "cache"
+    stale_dir = tmp_path / "stale"
+    stale_dir.mkdir()
+    (stale_dir / "cpu_percent_comparison.png").write_bytes(b"stale")
+    jobs = [job for job in generate_charts.chart_jobs(["cpu_percent"], str(stale_dir), "png")
+            if job["chart"] == "bar"]
+    
+    generate_charts.render_charts(jobs, index, cache_dir=str(cache_dir))
+    
+    assert not (stale_dir / "cpu_percent_comparison.png").exists()
+    assert os.listdir(cache_dir) == []
+    
+    fresh_dir = tmp_path / "fresh"
+    fresh_dir.mkdir()
+    jobs = [job for job in generate_charts.chart_jobs(["cpu_percent"], str(fresh_dir), "png")
+            if job["chart"] == "bar"]
+    [(_, _, cached)] = generate_charts.render_charts(jobs, index, cache_dir=str(cache_dir))
+    
+    assert not cached
+    assert not (fresh_dir / "cpu_percent_comparison.png").exists()